@@ -0,0 +1,163 @@
+"""
+Measures the throughput of the HTTP API against a local fake LLM.
+
+Starts the API server (with `--workers` processes) serving an offline fake
+provider, then sends `--requests` Basic ChatBot requests at several concurrency
+levels, each on a new conversation. Streamed requests record the time to the
+first token event. The fake model sleeps `--first-token` seconds, then
+`--per-token` seconds per word of a `--words`-word reply.
+
+The server imports this module as its application (`benchmarks.bench_api:app`),
+which registers the fake provider in every worker.
+
+Usage:
+    python -m benchmarks.bench_api [--workers N] [--requests N] [--concurrency 1,16,64]
+"""
+# --- Standard Library Imports ---
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# --- Third-Party Imports ---
+import httpx
+
+# --- Local Application Imports ---
+from benchmarks.fakes import FakeChatModel, set_dummy_api_keys
+from benchmarks.stats import percentile
+
+set_dummy_api_keys()
+
+from src.langgraph.api.server import app  # noqa: E402,F401
+from src.langgraph.main import LLM_PROVIDERS  # noqa: E402
+
+
+class FakeProvider:
+    """An LLM provider handler returning the offline fake model configured through the environment."""
+
+    def __init__(self, user_control_input: Dict[str, Any]):
+        self.user_control_input = user_control_input
+
+    def get_llm_model(self):
+        words = int(os.getenv("BENCH_API_WORDS", "40"))
+        return FakeChatModel(
+            reply=" ".join(["token"] * words),
+            first_token_latency=float(os.getenv("BENCH_API_FIRST_TOKEN", "0.2")),
+            per_token_latency=float(os.getenv("BENCH_API_PER_TOKEN", "0.005")),
+        )
+
+
+LLM_PROVIDERS["Fake"] = FakeProvider
+
+
+def _free_port() -> int:
+    """Returns a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _request(client: httpx.AsyncClient, number: int, stream: bool) -> Dict[str, float]:
+    """Sends one Basic ChatBot request and returns its latencies in seconds."""
+    body = {"message": f"Question number {number}", "provider": "Fake", "model": "fake-model"}
+    start = time.perf_counter()
+    if not stream:
+        response = await client.post("/v1/basic-chatbot/invoke", json=body)
+        response.raise_for_status()
+        return {"total": time.perf_counter() - start}
+
+    first_token = None
+    async with client.stream("POST", "/v1/basic-chatbot/stream", json=body) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if first_token is None and line.startswith("event: token"):
+                first_token = time.perf_counter() - start
+            if line.startswith("event: error"):
+                raise RuntimeError("The server streamed an error event.")
+    return {"total": time.perf_counter() - start, "first_token": first_token or 0.0}
+
+
+async def _load(base_url: str, requests: int, concurrency: int, stream: bool) -> Dict[str, Any]:
+    """Sends `requests` requests with at most `concurrency` in flight; returns throughput and latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+
+        async def one(number: int):
+            async with semaphore:
+                return await _request(client, number, stream)
+
+        start = time.perf_counter()
+        results: List[Dict[str, float]] = await asyncio.gather(*(one(i) for i in range(requests)))
+        wall = time.perf_counter() - start
+
+    totals = sorted(r["total"] for r in results)
+    return {
+        "rps": requests / wall,
+        "p50": statistics.median(totals) * 1000,
+        "p95": percentile(totals, 0.95) * 1000,
+        "ttft": statistics.median(r["first_token"] for r in results) * 1000 if stream else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes.")
+    parser.add_argument("--requests", type=int, default=256, help="Requests per concurrency level.")
+    parser.add_argument("--concurrency", default="1,16,64,128", help="Comma-separated concurrency levels.")
+    parser.add_argument("--first-token", type=float, default=0.2, help="Fake model seconds before the first token.")
+    parser.add_argument("--per-token", type=float, default=0.005, help="Fake model seconds per token.")
+    parser.add_argument("--words", type=int, default=40, help="Words in the fake reply.")
+    args = parser.parse_args()
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "BENCH_API_FIRST_TOKEN": str(args.first_token),
+            "BENCH_API_PER_TOKEN": str(args.per_token),
+            "BENCH_API_WORDS": str(args.words),
+            "CHECKPOINT_DB_PATH": os.path.join(tmp, "checkpoints.sqlite3"),
+            "LLM_FALLBACK_MODEL": "",
+            "SEMANTIC_CACHE_ENABLED": "false",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.langgraph.api.server", "--app", "benchmarks.bench_api:app",
+             "--port", str(port), "--workers", str(args.workers)],
+            env=env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("The API server did not start.")
+                time.sleep(0.2)
+
+            model_time = args.first_token + args.per_token * args.words
+            print(f"workers: {args.workers}, fake model: {model_time * 1000:.0f} ms per reply")
+            print(f"\n{'mode':<8}{'concurrency':>12}{'req/s':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'TTFT (ms)':>11}")
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                for stream in (False, True):
+                    result = asyncio.run(_load(base_url, args.requests, concurrency, stream))
+                    ttft = f"{result['ttft']:>11.0f}" if result["ttft"] is not None else f"{'-':>11}"
+                    print(f"{'stream' if stream else 'invoke':<8}{concurrency:>12}{result['rps']:>9.1f}"
+                          f"{result['p50']:>10.0f}{result['p95']:>10.0f}{ttft}")
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
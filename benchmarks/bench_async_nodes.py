@@ -0,0 +1,150 @@
+"""
+Compares many concurrent conversations served with sync nodes on threads and with async nodes.
+
+Each conversation is one turn of the Basic ChatBot or ChatBot with Tools graph
+against an offline fake model that waits `--latency` seconds per call (the tools
+graph makes two model calls and three tool calls per turn). "sync" runs
+`graph.invoke` on a pool of `--threads` threads, the way the graphs were served
+before the nodes had async variants; "async" runs `graph.ainvoke` for every
+conversation at once on one event loop. Reports the wall time, throughput,
+latency percentiles and the peak number of threads.
+
+Checkpoints are kept in memory and the per-tool concurrency limits are lifted,
+so the measurement is the nodes' cost alone rather than the tools' quotas.
+
+Usage:
+    python -m benchmarks.bench_async_nodes [--conversations 100,500] [--latency S] [--threads N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import asyncio
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from benchmarks.fakes import FakeChatModel, FakeToolCallingChatModel, make_fake_tools, set_dummy_api_keys
+from benchmarks.stats import percentile
+
+set_dummy_api_keys()
+os.environ.setdefault("TOOL_EXECUTOR_DEFAULT_TOOL_LIMIT", "10000")
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+
+# --- Local Application Imports ---
+from src.langgraph.graph.graph_builder import GraphBuilder  # noqa: E402
+
+TOOL_NAMES = ["duckduckgo_search", "wikipedia", "arxiv"]
+
+
+class ThreadSampler:
+    """Records the peak number of live threads while it runs."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self) -> "ThreadSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _build(usecase: str, latency: float):
+    """Builds a graph of the use case around offline fakes."""
+    if usecase == "Basic ChatBot":
+        model = FakeChatModel(first_token_latency=latency)
+    else:
+        model = FakeToolCallingChatModel(first_token_latency=latency, tool_names=TOOL_NAMES)
+    tools = make_fake_tools(TOOL_NAMES, latency=latency)
+    return GraphBuilder(model, checkpointer=InMemorySaver(), tools=tools).setup_graph(usecase)
+
+
+def _summary(latencies: List[float], wall: float, peak_threads: int) -> Dict[str, float]:
+    """Returns the throughput, latency percentiles (ms) and peak thread count of a run."""
+    ordered = sorted(latencies)
+    return {
+        "rate": len(ordered) / wall,
+        "wall": wall,
+        "p50": statistics.median(ordered) * 1000,
+        "p95": percentile(ordered, 0.95) * 1000,
+        "threads": peak_threads,
+    }
+
+
+def _inputs(run: int, number: int):
+    """Returns the input and config of one conversation turn."""
+    return (
+        {"messages": [HumanMessage(content=f"Question {number}")]},
+        {"configurable": {"thread_id": f"run-{run}-conversation-{number}"}},
+    )
+
+
+def run_sync(graph, conversations: int, threads: int, run: int) -> Dict[str, float]:
+    """Runs the conversations with `graph.invoke` on a thread pool."""
+    def one(number: int) -> float:
+        start = time.perf_counter()
+        graph.invoke(*_inputs(run, number))
+        return time.perf_counter() - start
+
+    with ThreadSampler() as sampler, ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        latencies = list(pool.map(one, range(conversations)))
+        wall = time.perf_counter() - start
+    return _summary(latencies, wall, sampler.peak)
+
+
+def run_async(graph, conversations: int, threads: int, run: int) -> Dict[str, float]:
+    """Runs every conversation at once with `graph.ainvoke` on one event loop."""
+    async def one(number: int) -> float:
+        start = time.perf_counter()
+        await graph.ainvoke(*_inputs(run, number))
+        return time.perf_counter() - start
+
+    async def main() -> List[float]:
+        return await asyncio.gather(*(one(i) for i in range(conversations)))
+
+    with ThreadSampler() as sampler:
+        start = time.perf_counter()
+        latencies = asyncio.run(main())
+        wall = time.perf_counter() - start
+    return _summary(latencies, wall, sampler.peak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--conversations", default="100,500", help="Comma-separated concurrent conversation counts.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds the fake model and tools wait per call.")
+    parser.add_argument("--threads", type=int, default=64, help="Thread pool size of the sync runs.")
+    args = parser.parse_args()
+
+    runners: Dict[str, Callable] = {"sync": run_sync, "async": run_async}
+    print(f"fake latency: {args.latency * 1000:.0f} ms per call, sync threads: {args.threads}")
+    print(f"\n{'graph':<20}{'mode':<7}{'convs':>7}{'wall (s)':>10}{'conv/s':>9}"
+          f"{'p50 (ms)':>10}{'p95 (ms)':>10}{'threads':>9}")
+    run = 0
+    for usecase in ("Basic ChatBot", "ChatBot with Tools"):
+        graph = _build(usecase, args.latency)
+        for conversations in (int(c) for c in args.conversations.split(",")):
+            for mode, runner in runners.items():
+                run += 1
+                r = runner(graph, conversations, args.threads, run)
+                print(f"{usecase:<20}{mode:<7}{conversations:>7}{r['wall']:>10.2f}{r['rate']:>9.1f}"
+                      f"{r['p50']:>10.0f}{r['p95']:>10.0f}{r['threads']:>9}")
+
+
+if __name__ == "__main__":
+    main()
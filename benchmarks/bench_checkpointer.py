@@ -0,0 +1,101 @@
+"""
+Measures how the cost of a checkpointed chat turn grows with the conversation length.
+
+A Basic ChatBot graph (with an offline fake model) is run for `--turns` turns on
+one thread. At a few checkpoints along the way it reports:
+
+- "turn (ms)": wall time of one full turn (resume + model + save).
+- "resume hot (ms)": `get_tuple` in the process that wrote the thread.
+- "resume cold (ms)": `get_tuple` from a fresh checkpointer on the same database.
+- "written/turn": messages serialized by the last turn.
+
+If `langgraph-checkpoint-sqlite` is installed, the stock `SqliteSaver` (which
+re-serializes the full state every step) is measured alongside for comparison.
+
+Usage:
+    python -m benchmarks.bench_checkpointer [--turns N] [--reply-words N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage
+
+# --- Local Application Imports ---
+from benchmarks.fakes import FakeChatModel, set_dummy_api_keys
+
+set_dummy_api_keys()
+
+from src.langgraph.graph.graph_builder import GraphBuilder  # noqa: E402
+from src.langgraph.state.checkpointer import ConversationCheckpointer  # noqa: E402
+
+REPORT_AT = (1, 10, 50, 100, 200, 500, 1000)
+
+
+def _timed(fn) -> float:
+    """Returns the wall time of `fn()` in milliseconds."""
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def _run(name: str, make_saver, turns: int, reply: str) -> None:
+    """Grows one thread turn by turn and prints the measurements."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "checkpoints.sqlite3")
+        saver = make_saver(db_path)
+        graph = GraphBuilder(FakeChatModel(reply=reply), checkpointer=saver).setup_graph("Basic ChatBot")
+        config = {"configurable": {"thread_id": "bench"}}
+
+        print(f"\n{name}")
+        print(f"{'turn':>6}{'turn (ms)':>12}{'resume hot (ms)':>18}{'resume cold (ms)':>19}{'written/turn':>14}{'db (KB)':>10}")
+        for turn in range(1, turns + 1):
+            written_before = getattr(saver, "messages_written", 0)
+            elapsed = _timed(lambda: graph.invoke(
+                {"messages": [HumanMessage(content=f"Question number {turn}?")]}, config, durability="exit"
+            ))
+            if turn not in REPORT_AT and turn != turns:
+                continue
+
+            hot = _timed(lambda: saver.get_tuple(config))
+            cold_saver = make_saver(db_path)
+            cold = _timed(lambda: cold_saver.get_tuple(config))
+            written = getattr(saver, "messages_written", None)
+            written = "-" if written is None else written - written_before
+            size = sum(
+                os.path.getsize(path) for path in (db_path, db_path + "-wal") if os.path.exists(path)
+            ) / 1024
+            print(f"{turn:>6}{elapsed:>12.2f}{hot:>18.2f}{cold:>19.2f}{written:>14}{size:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200, help="Turns to run on the thread.")
+    parser.add_argument("--reply-words", type=int, default=150, help="Words in each model reply.")
+    args = parser.parse_args()
+    reply = " ".join(["word"] * args.reply_words)
+
+    _run(
+        "ConversationCheckpointer (incremental)",
+        lambda path: ConversationCheckpointer(path, thread_ttl=0),
+        args.turns, reply,
+    )
+
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        print("\nSqliteSaver: langgraph-checkpoint-sqlite is not installed, skipped.")
+        return
+    _run(
+        "SqliteSaver (full state per checkpoint)",
+        lambda path: SqliteSaver(sqlite3.connect(path, check_same_thread=False)),
+        args.turns, reply,
+    )
+
+
+if __name__ == "__main__":
+    main()
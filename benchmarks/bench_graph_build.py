@@ -0,0 +1,57 @@
+"""
+Times the three GraphBuilder workflows, built from scratch versus served by the graph registry.
+
+"Cold" repeats what `process_request` used to do on every message: create the
+model, a new `GraphBuilder` and compile the graph. "Registry" goes through
+`GraphRegistry.get_or_build`, which only builds on the first request.
+
+Usage:
+    python -m benchmarks.bench_graph_build [--repeat N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import statistics
+import time
+
+from benchmarks.fakes import FakeChatModel, set_dummy_api_keys
+
+set_dummy_api_keys()
+
+# --- Local Application Imports ---
+from src.langgraph.graph.graph_builder import GraphBuilder  # noqa: E402
+from src.langgraph.graph.graph_registry import GraphKey, GraphRegistry  # noqa: E402
+
+USE_CASES = ["Basic ChatBot", "ChatBot with Tools", "AI News"]
+
+
+def _median_ms(fn, repeat: int) -> float:
+    """Runs `fn` `repeat` times and returns the median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="Requests to time per use case.")
+    args = parser.parse_args()
+
+    registry = GraphRegistry()
+    print(f"{'use case':<22}{'cold (ms)':>12}{'registry (ms)':>16}{'speed-up':>10}")
+    for usecase in USE_CASES:
+        key = GraphKey("Fake", "fake-model", usecase, GraphBuilder.get_tool_names(usecase))
+
+        def build():
+            return GraphBuilder(FakeChatModel()).setup_graph(usecase)
+
+        cold = _median_ms(build, args.repeat)
+        registry.get_or_build(key, build)
+        warm = _median_ms(lambda: registry.get_or_build(key, build), args.repeat)
+        print(f"{usecase:<22}{cold:>12.3f}{warm:>16.4f}{cold / warm:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
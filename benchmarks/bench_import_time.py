@@ -0,0 +1,150 @@
+"""
+Reports what the app imports on a cold start, using `python -X importtime`.
+
+Each scenario runs in a fresh interpreter with `-X importtime`:
+
+- "first page": `import src.langgraph.main`, what Streamlit runs before it can
+  render the first page.
+- "<Provider> + Basic ChatBot": the first chat request, which also loads the
+  provider's handler and builds the Basic ChatBot graph.
+- "Groq + ChatBot with Tools" and "Groq + AI News": the same for the other graphs.
+
+For each it prints the total import time, the packages that took longest (the
+summed import time of their modules) and whether each heavy dependency was
+loaded. With `--verbose`, the slowest individual modules are listed too.
+Numbers are medians over `--repeat` runs.
+
+Usage:
+    python -m benchmarks.bench_import_time [--repeat N] [--top N] [--verbose]
+"""
+# --- Standard Library Imports ---
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+_BUILD = (
+    "from benchmarks.fakes import FakeChatModel; from src.langgraph.graph.graph_builder import GraphBuilder; "
+    "GraphBuilder(FakeChatModel()).setup_graph({usecase!r})"
+)
+
+SCENARIOS = {
+    "first page": "import src.langgraph.main",
+    **{
+        f"{provider} + Basic ChatBot": (
+            f"import src.langgraph.main as main; main.LLM_PROVIDERS[{provider!r}]; "
+            + _BUILD.format(usecase="Basic ChatBot")
+        )
+        for provider in ("Groq", "Openrouter", "NVIDIA")
+    },
+    "Groq + ChatBot with Tools": (
+        "import src.langgraph.main as main; main.LLM_PROVIDERS['Groq']; " + _BUILD.format(usecase="ChatBot with Tools")
+    ),
+    "Groq + AI News": "import src.langgraph.main as main; main.LLM_PROVIDERS['Groq']; " + _BUILD.format(usecase="AI News"),
+}
+
+# Set to placeholders if missing, as in `benchmarks.fakes.set_dummy_api_keys` (not imported
+# here, since it would load langchain_core into the measured interpreter)
+API_KEYS = ["SERP_API_KEY", "TAVILY_API_KEY", "BRAVE_SEARCH_API_KEY", "GROQ_API_KEY", "OPENROUTER_API_KEY", "NVIDIA_API_KEY"]
+
+# Dependencies that should only load once a session needs them
+HEAVY_PACKAGES = [
+    "langchain_openai",
+    "langchain_groq",
+    "langchain_nvidia_ai_endpoints",
+    "langchain_tavily",
+    "langchain_community",
+    "langgraph",
+    "src.langgraph.tools.tools",
+]
+
+
+class ImportRecord(NamedTuple):
+    """One line of `-X importtime` output."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parses the `import time:` lines of `-X importtime` output."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def _run(code: str) -> List[ImportRecord]:
+    """Runs `code` in a fresh interpreter with `-X importtime` and returns its imports."""
+    env = {**os.environ, **{key: os.environ.get(key, "benchmark-dummy-key") for key in API_KEYS}}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"Scenario failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def _fake_modules(records: List[ImportRecord]) -> set:
+    """The benchmark's own modules, left out of the report (their dependencies the graphs load anyway)."""
+    return {r.module for r in records if r.module.startswith("benchmarks")}
+
+
+def summarize(runs: List[List[ImportRecord]], top: int) -> Dict[str, object]:
+    """Returns the median total time, slowest packages and modules, and the heavy packages loaded."""
+    totals, packages, modules = [], defaultdict(list), defaultdict(list)
+    for records in runs:
+        skip = _fake_modules(records)
+        # Time is attributed to the top-level package of each module's own (self) time
+        per_package: Dict[str, int] = defaultdict(int)
+        for r in records:
+            if r.module in skip:
+                continue
+            package = ".".join(r.module.split(".")[:2]) if r.module.startswith("src.") else r.module.split(".")[0]
+            per_package[package] += r.self_us
+            modules[r.module].append(r.self_us)
+        totals.append(sum(per_package.values()))
+        for package, us in per_package.items():
+            packages[package].append(us)
+    loaded = {r.module for r in runs[0]}
+    return {
+        "total_ms": statistics.median(totals) / 1000,
+        "modules": len(loaded),
+        "packages": sorted(((statistics.median(v) / 1000, k) for k, v in packages.items()), reverse=True)[:top],
+        "slowest": sorted(((statistics.median(v) / 1000, k) for k, v in modules.items()), reverse=True)[:top],
+        "heavy": {name: name in loaded for name in HEAVY_PACKAGES},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per scenario.")
+    parser.add_argument("--top", type=int, default=8, help="Packages (and modules) to list per scenario.")
+    parser.add_argument("--verbose", action="store_true", help="Also list the slowest individual modules.")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<30}{'imports (ms)':>13}{'modules':>9}  heavy dependencies loaded")
+    reports = {}
+    for name, code in SCENARIOS.items():
+        report = reports[name] = summarize([_run(code) for _ in range(args.repeat)], args.top)
+        heavy = ", ".join(p for p, loaded in report["heavy"].items() if loaded) or "none"
+        print(f"{name:<30}{report['total_ms']:>13.0f}{report['modules']:>9}  {heavy}")
+
+    for name, report in reports.items():
+        print(f"\n{name}: slowest packages (self time, ms)")
+        for ms, package in report["packages"]:
+            print(f"  {ms:>8.1f}  {package}")
+        if args.verbose:
+            print(f"{name}: slowest modules (self time, ms)")
+            for ms, module in report["slowest"]:
+                print(f"  {ms:>8.1f}  {module}")
+
+
+if __name__ == "__main__":
+    main()
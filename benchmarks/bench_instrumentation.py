@@ -0,0 +1,67 @@
+"""
+Measures the overhead of the graph metrics callbacks and shows what they record.
+
+Runs `--turns` turns of the Basic ChatBot and ChatBot with Tools graphs against
+instant offline fakes, once plain and once instrumented, and reports the time
+per turn of each and the difference. Then prints the recorded histograms as
+JSON percentiles.
+
+Usage:
+    python -m benchmarks.bench_instrumentation [--turns N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import time
+
+from benchmarks.fakes import FakeChatModel, FakeToolCallingChatModel, make_fake_tools, set_dummy_api_keys
+
+set_dummy_api_keys()
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+
+# --- Local Application Imports ---
+from src.langgraph.graph.graph_builder import GraphBuilder  # noqa: E402
+from src.langgraph.graph.instrumentation import get_graph_metrics, instrument  # noqa: E402
+
+TOOL_NAMES = ["duckduckgo_search", "wikipedia", "arxiv"]
+
+
+def _per_turn(graph, turns: int, label: str) -> float:
+    """Runs `turns` one-turn conversations and returns the mean seconds per turn."""
+    start = time.perf_counter()
+    for number in range(turns):
+        graph.invoke(
+            {"messages": [HumanMessage(content=f"Question {number}")]},
+            {"configurable": {"thread_id": f"{label}-{number}"}},
+        )
+    return (time.perf_counter() - start) / turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=300, help="Conversation turns per graph and mode.")
+    args = parser.parse_args()
+
+    tools = make_fake_tools(TOOL_NAMES)
+    models = {"Basic ChatBot": FakeChatModel(), "ChatBot with Tools": FakeToolCallingChatModel(tool_names=TOOL_NAMES)}
+
+    print(f"{'graph':<20}{'plain (ms)':>12}{'instrumented (ms)':>19}{'overhead (ms)':>15}")
+    for usecase, model in models.items():
+        graph = GraphBuilder(model, checkpointer=InMemorySaver(), tools=tools).setup_graph(usecase)
+        instrumented = instrument(graph, usecase, "Fake", "fake-model")
+        _per_turn(graph, 20, "warmup")
+        plain = _per_turn(graph, args.turns, f"{usecase}-plain")
+        timed = _per_turn(instrumented, args.turns, f"{usecase}-instrumented")
+        print(f"{usecase:<20}{plain * 1000:>12.2f}{timed * 1000:>19.2f}{(timed - plain) * 1000:>15.2f}")
+
+    print(f"\n{'metric':<42}{'labels':<40}{'count':>7}{'p50':>10}{'p95':>10}")
+    for name, metric in get_graph_metrics().registry.to_dict().items():
+        for series in metric["series"]:
+            labels = ",".join(f"{v}" for k, v in series["labels"].items() if k in ("usecase", "node", "tool"))
+            print(f"{name:<42}{labels:<40}{series['count']:>7}{series['p50']:>10.4g}{series['p95']:>10.4g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Measures the AI News archive over years of synthetic daily reports.
+
+Each simulated day produces `--refreshes` versions of the daily report. Each
+version has `--articles` articles, about half of which were already in the
+previous day's report (stories stay in the news for a few days). Article text
+is drawn from a Zipf-distributed vocabulary, so some keywords match a large
+share of the archive and others are rare.
+
+Reports the archiving time per report, the database size compared with the raw
+markdown, and search latency percentiles for common, rare and multi-word
+queries, with and without a 30-day date range, newest first and by relevance.
+
+Usage:
+    python -m benchmarks.bench_news_archive [--years N] [--refreshes N] [--articles N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from benchmarks.stats import percentile
+
+# --- Local Application Imports ---
+from src.langgraph.nodes.news_archive import NewsArchive
+from src.langgraph.nodes.news_reports import NewsReport
+
+VOCABULARY_SIZE = 5000
+START = datetime(2021, 1, 1, 8, tzinfo=timezone.utc)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    """Returns `count` words drawn from a Zipf-like distribution over the vocabulary."""
+    ranks = [min(VOCABULARY_SIZE - 1, int(rng.paretovariate(1.1))) for _ in range(count)]
+    return " ".join(f"w{rank}" for rank in ranks)
+
+
+def _article(rng: random.Random, number: int, day: datetime) -> dict:
+    """Returns a synthetic search result published on `day`."""
+    return {
+        "title": f"Story {number}: {_words(rng, 8)}",
+        "url": f"https://news.example.com/{number}",
+        "published_date": format_datetime(day),
+        "content": _words(rng, 60),
+    }
+
+
+def _percentiles(samples):
+    """Returns the p50 and p95 of latency samples, in milliseconds."""
+    ordered = sorted(samples)
+    return (statistics.median(ordered) * 1000, percentile(ordered, 0.95) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=5, help="Years of daily reports to archive.")
+    parser.add_argument("--refreshes", type=int, default=1, help="Report versions per day.")
+    parser.add_argument("--articles", type=int, default=15, help="Articles per report.")
+    parser.add_argument("--queries", type=int, default=200, help="Searches per query kind.")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    days = args.years * 365
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = NewsArchive(os.path.join(tmp, "archive.sqlite3"))
+        raw_bytes, version, next_story = 0, 0, 0
+        current = []
+        start = time.perf_counter()
+        for day_index in range(days):
+            day = START + timedelta(days=day_index)
+            keep = current[: args.articles // 2]
+            fresh = [_article(rng, next_story + i, day) for i in range(args.articles - len(keep))]
+            next_story += len(fresh)
+            current = fresh + keep
+            for refresh in range(args.refreshes):
+                version += 1
+                summaries = [a["content"][:300] for a in current]
+                body = "\n".join(f"## [{a['title']}]({a['url']})\n#### Summary: {s}\n" for a, s in zip(current, summaries))
+                report = NewsReport("daily", body, "daily_summary.md", version,
+                                    (day + timedelta(hours=refresh)).timestamp(), len(current))
+                raw_bytes += len(report.markdown.encode("utf-8"))
+                archive.add_report(report, current, summaries)
+        add_time = time.perf_counter() - start
+        stats = archive.stats()
+
+        end = START + timedelta(days=days)
+        # name: () -> (query, start of a 30-day range or None, order)
+        kinds = {
+            "common word": lambda: ("w1", None, "recent"),
+            "rare word": lambda: (f"w{rng.randrange(500, 2000)}", None, "recent"),
+            "two words": lambda: (f"w{rng.randrange(1, 20)} w{rng.randrange(20, 200)}", None, "recent"),
+            "word + 30 days": lambda: (f"w{rng.randrange(1, 50)}",
+                                       (end - timedelta(days=rng.randrange(30, days))).timestamp(), "recent"),
+            "common, by rank": lambda: ("w1", None, "relevance"),
+            "rare, by rank": lambda: (f"w{rng.randrange(500, 2000)}", None, "relevance"),
+        }
+
+        print(f"reports archived:   {stats['reports']} ({stats['articles']} distinct articles)")
+        print(f"archiving:          {add_time / stats['reports'] * 1000:.2f} ms per report")
+        print(f"size:               {stats['db_bytes'] / 1e6:.1f} MB (raw markdown {raw_bytes / 1e6:.1f} MB)")
+        print(f"\n{'search':<18}{'p50 (ms)':>10}{'p95 (ms)':>10}{'results':>9}")
+        for name, make in kinds.items():
+            samples, found = [], 0
+            for _ in range(args.queries):
+                query, since, order = make()
+                until = since + 30 * 86400 if since else None
+                t0 = time.perf_counter()
+                results = archive.search(query, since=since, until=until, order=order)
+                samples.append(time.perf_counter() - t0)
+                found += len(results)
+            p50, p95 = _percentiles(samples)
+            print(f"{name:<18}{p50:>10.2f}{p95:>10.2f}{found / args.queries:>9.1f}")
+
+        archive.conn.close()
+
+
+if __name__ == "__main__":
+    main()
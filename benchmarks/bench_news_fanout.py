@@ -0,0 +1,51 @@
+"""
+Measures the AI News fetch step: one query vs. a multi-query fan-out, sequential and concurrent.
+
+Uses an offline Tavily stand-in with a fixed per-search latency whose results
+overlap across queries (same story, URLs with tracking parameters, syndicated
+copies), and reports wall time, raw results and articles kept after merging.
+
+Usage:
+    python -m benchmarks.bench_news_fanout [--latency S] [--queries N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import time
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage
+
+# --- Local Application Imports ---
+from benchmarks.fakes import FakeChatModel, make_fake_news_search, set_dummy_api_keys
+
+set_dummy_api_keys()
+
+from src.langgraph.nodes.ai_news import DEFAULT_NEWS_QUERIES, AINewsNode  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds per search.")
+    parser.add_argument("--queries", type=int, default=len(DEFAULT_NEWS_QUERIES), help="Sub-queries to fan out.")
+    args = parser.parse_args()
+
+    queries = [*DEFAULT_NEWS_QUERIES, *(f"AI news subtopic {i}" for i in range(args.queries))][:args.queries]
+    search = make_fake_news_search(latency=args.latency)
+    scenarios = {
+        "single query": dict(queries=queries[:1], max_concurrency=1),
+        "fan-out, sequential": dict(queries=queries, max_concurrency=1),
+        "fan-out, concurrent": dict(queries=queries, max_concurrency=len(queries)),
+    }
+
+    print(f"{'scenario':<24}{'searches':>10}{'wall (s)':>10}{'raw results':>13}{'kept':>6}")
+    for name, options in scenarios.items():
+        node = AINewsNode(FakeChatModel(), search=search, **options)
+        start = time.perf_counter()
+        state = node.fetch_news({"messages": [HumanMessage(content="daily")]})
+        elapsed = time.perf_counter() - start
+        raw = 10 * len(options["queries"])
+        print(f"{name:<24}{len(options['queries']):>10}{elapsed:>10.2f}{raw:>13}{len(state['news_data']['results']):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compares the two AI News summarization modes with a fake LLM that has per-token latency.
+
+- "single": one prompt with every article; the model writes the whole report,
+  so generation time grows with the total output length.
+- "map_reduce": one call per article, `--concurrency` at a time; the report is
+  assembled and date-sorted in code.
+
+The fake model writes `--summary-words` words per article it is asked about and
+sleeps `--first-token` seconds plus `--per-token` seconds per word.
+
+A second table runs map-reduce with an article store: a daily report, the same
+report again, then a weekly report that contains the daily articles plus older
+ones, and counts the model calls each run makes.
+
+Usage:
+    python -m benchmarks.bench_news_summary [--articles N] [--per-token S] [--concurrency N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, List, Optional
+
+# --- Third-Party Imports ---
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# --- Local Application Imports ---
+from benchmarks.fakes import FakeChatModel, set_dummy_api_keys
+
+set_dummy_api_keys()
+
+from src.langgraph.nodes.ai_news import AINewsNode  # noqa: E402
+from src.langgraph.nodes.article_store import ArticleStore  # noqa: E402
+
+
+class SummaryModel(FakeChatModel):
+    """Writes `summary_words` words per article in the prompt, with per-token latency."""
+
+    summary_words: int = 60
+    calls: int = 0
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self.calls += 1
+        articles = max(1, messages[-1].content.count("Title:"))
+        words = self.summary_words * articles
+        time.sleep(self.first_token_latency + self.per_token_latency * words)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="word " * words))])
+
+
+def _articles(count: int, start: int = 0) -> List[dict]:
+    """Returns fake search results with shuffled publication dates."""
+    return [
+        {
+            "title": f"Story {i}",
+            "url": f"https://news.example.com/{i}",
+            "published_date": f"Mon, {1 + (i * 7) % 28:02d} Jun 2025 10:00:00 GMT",
+            "content": "Snippet text. " * 40,
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=15, help="Articles in the report.")
+    parser.add_argument("--summary-words", type=int, default=60, help="Words generated per article.")
+    parser.add_argument("--first-token", type=float, default=0.3, help="Seconds before the first token.")
+    parser.add_argument("--per-token", type=float, default=0.005, help="Seconds per generated token.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent calls in map-reduce mode.")
+    args = parser.parse_args()
+
+    model = SummaryModel(
+        summary_words=args.summary_words,
+        first_token_latency=args.first_token,
+        per_token_latency=args.per_token,
+    )
+    state = {"news_data": {"results": _articles(args.articles), "images": []}}
+
+    print(f"{'mode':<14}{'concurrency':>12}{'wall (s)':>10}")
+    for mode, concurrency in [("single", 1), ("map_reduce", 1), ("map_reduce", args.concurrency),
+                              ("map_reduce", args.articles)]:
+        node = AINewsNode(model, summary_mode=mode, summary_concurrency=concurrency)
+        start = time.perf_counter()
+        node.summarize_news(dict(state))
+        print(f"{mode:<14}{concurrency:>12}{time.perf_counter() - start:>10.2f}")
+
+    daily = _articles(args.articles)
+    weekly = daily[: args.articles // 2] + _articles(args.articles - args.articles // 2, start=args.articles)
+    print(f"\n{'store run':<14}{'model calls':>12}{'wall (s)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ArticleStore(os.path.join(tmp, "ai_news.sqlite3"))
+        node = AINewsNode(model, summary_concurrency=args.concurrency, article_store=store)
+        for name, results in [("daily", daily), ("daily rerun", daily), ("weekly", weekly)]:
+            calls = model.calls
+            start = time.perf_counter()
+            node.summarize_news({"news_data": {"results": results, "images": []}})
+            print(f"{name:<14}{model.calls - calls:>12}{time.perf_counter() - start:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
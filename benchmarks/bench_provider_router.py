@@ -0,0 +1,242 @@
+"""
+Compares calling a slow, flaky provider directly with routing it through the provider router.
+
+The primary fake model usually answers in `--latency` seconds but takes
+`--slow-latency` seconds on a `--slow-rate` share of calls; the fallback fake
+model always takes `--fallback-latency` seconds. Two scenarios are run with
+`--concurrency` callers sending `--requests` requests each way:
+
+- "tail": the primary never fails; hedging should cut its p99 (and its p95 once
+  the slow share is above 5%).
+- "outage": the primary fails every call; the router's circuit should open after
+  a few failures and send the rest straight to the fallback.
+
+Latency is the full answer for "invoke" and the first token for "stream".
+Direct and routed calls each get their own primary with the same seed, so both
+see the same slow calls.
+
+Then it checks the router's behaviour against fake providers with fixed
+latencies, and exits with 1 if any check fails:
+
+- hedging: a slow primary is hedged after the hedge delay and the fallback's
+  answer (or first token) is used; a fast primary is never hedged;
+- tail: with 10% slow primary calls, routed p95 and p99 are below direct ones,
+  and the primary's hedge delay stays below its slow latency, i.e. the slow
+  calls the fallback answered do not switch hedging off;
+- failover: a failing primary's requests are answered by the fallback;
+- circuit: consecutive failures open the primary's circuit, which skips it;
+  after the cool-down it is half-open, a failed trial reopens it and a
+  successful one closes it.
+
+Usage:
+    python -m benchmarks.bench_provider_router [--requests N] [--concurrency N] [--checks-only]
+"""
+# --- Standard Library Imports ---
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.fakes import FakeChatModel, FakeFlakyChatModel
+from benchmarks.stats import percentile
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage
+
+# --- Local Application Imports ---
+from src.langgraph.llms.provider_router import ProviderRouter
+
+
+def _call(model, mode: str) -> Dict[str, Any]:
+    """Sends one request and returns its latency, outcome and the answering model."""
+    messages = [HumanMessage(content="What happened in AI today?")]
+    start = time.perf_counter()
+    try:
+        if mode == "invoke":
+            message = model.invoke(messages)
+        else:
+            stream = model.stream(messages)
+            message = next(stream)
+            latency = time.perf_counter() - start
+            for chunk in stream:
+                message = message + chunk
+            route = message.response_metadata.get("router") or {}
+            return {"latency": latency, "ok": True, "fallback": route.get("fallback", False)}
+    except Exception:
+        return {"latency": time.perf_counter() - start, "ok": False, "fallback": False}
+    route = message.response_metadata.get("router") or {}
+    return {"latency": time.perf_counter() - start, "ok": True, "fallback": route.get("fallback", False)}
+
+
+def _run(model, mode: str, requests: int, concurrency: int) -> Dict[str, float]:
+    """Sends the requests from `concurrency` threads; returns percentiles (ms), errors and fallback share."""
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results: List[Dict[str, Any]] = list(pool.map(lambda _: _call(model, mode), range(requests)))
+    latencies = sorted(r["latency"] for r in results if r["ok"]) or [0.0]
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "errors": sum(not r["ok"] for r in results) / len(results),
+        "fallback": sum(r["fallback"] for r in results) / len(results),
+    }
+
+
+class CountingChatModel(FakeFlakyChatModel):
+    """A flaky fake model that counts the calls it receives."""
+
+    calls: int = 0
+
+    def _call_delay(self) -> float:
+        self.calls += 1
+        return super()._call_delay()
+
+
+def _routed(primary_latency: float, failure_rate: float = 0.0, **stats_settings: Any):
+    """Returns a routed model (hedge delay 0.2 s) with its counting primary and fallback (0.05 s)."""
+    primary = CountingChatModel(first_token_latency=primary_latency, failure_rate=failure_rate)
+    fallback = CountingChatModel(first_token_latency=0.05)
+    router = ProviderRouter(default_hedge_delay=0.2, min_hedge_delay=0.1, **stats_settings)
+    return router.route(primary, "Fake:primary", fallback, "Fake:fallback"), primary, fallback, router
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def _first_chunk(model):
+    return next(iter(model.stream([HumanMessage(content="Hi")])))
+
+
+def _tail_latencies(router: Optional[ProviderRouter] = None) -> Dict[str, float]:
+    """
+    Runs 200 requests at a primary with 10% 1 s calls (0.05 s otherwise), routed
+    through `router` if given, and returns their percentiles.
+    """
+    primary = FakeFlakyChatModel(first_token_latency=0.05, slow_latency=1.0, slow_rate=0.1, seed=7)
+    model = primary
+    if router is not None:
+        model = router.route(primary, "Fake:primary", FakeChatModel(first_token_latency=0.05), "Fake:fallback")
+    return _run(model, "invoke", requests=200, concurrency=8)
+
+
+def run_checks() -> List[Tuple[str, bool, str]]:
+    """Runs the behaviour checks; returns (name, passed, detail) for each."""
+    messages = [HumanMessage(content="Hi")]
+    checks = []
+
+    # Hedging: a 1 s primary is hedged at 0.2 s and the 0.05 s fallback answers at ~0.25 s
+    routed, primary, fallback, _ = _routed(primary_latency=1.0)
+    message, seconds = _timed(lambda: routed.invoke(messages))
+    route = message.response_metadata["router"]
+    checks.append(("slow primary is hedged (invoke)", route["hedged"] and route["fallback"] and 0.2 <= seconds < 0.6,
+                   f"answered by {route['model']} in {seconds:.2f} s"))
+    routed, primary, fallback, _ = _routed(primary_latency=1.0)
+    _, seconds = _timed(lambda: _first_chunk(routed))
+    checks.append(("slow primary is hedged (stream)", 0.2 <= seconds < 0.6 and fallback.calls == 1,
+                   f"first token after {seconds:.2f} s"))
+
+    # Tail: hedging keeps cutting the slow calls instead of learning their latency
+    router = ProviderRouter(default_hedge_delay=0.2, min_hedge_delay=0.1, max_workers=32)
+    direct, routed_tail = _tail_latencies(), _tail_latencies(router)
+    hedge_delay = router.hedge_delay("Fake:primary", "invoke")
+    checks.append(("routed tail is below direct (p95, p99)",
+                   routed_tail["p95"] < direct["p95"] and routed_tail["p99"] < direct["p99"] and hedge_delay < 0.5,
+                   f"p95 {routed_tail['p95']:.0f} vs {direct['p95']:.0f} ms, "
+                   f"p99 {routed_tail['p99']:.0f} vs {direct['p99']:.0f} ms, hedge delay {hedge_delay:.2f} s"))
+
+    # No hedging: a 0.05 s primary answers before the hedge delay; the fallback is never asked
+    routed, primary, fallback, _ = _routed(primary_latency=0.05)
+    for _ in range(5):
+        message = routed.invoke(messages)
+    route = message.response_metadata["router"]
+    checks.append(("fast primary is not hedged", not route["hedged"] and fallback.calls == 0,
+                   f"fallback calls: {fallback.calls}"))
+
+    # Failover: every request to a failing primary is answered by the fallback
+    routed, primary, fallback, router = _routed(primary_latency=0.0, failure_rate=1.0, consecutive_failures=100,
+                                                min_samples=100)
+    answered = [routed.invoke(messages).response_metadata["router"]["model"] for _ in range(5)]
+    checks.append(("failing primary fails over", answered == ["Fake:fallback"] * 5 and primary.calls == 5,
+                   f"answered by {sorted(set(answered))}, primary calls {primary.calls}"))
+
+    # Circuit: 3 failures open it; while open the primary is skipped
+    routed, primary, fallback, router = _routed(primary_latency=0.0, failure_rate=1.0, consecutive_failures=3,
+                                                open_seconds=0.3)
+    for _ in range(3):
+        routed.invoke(messages)
+    stats = router.stats("Fake:primary")
+    opened = stats.state
+    calls_when_opened = primary.calls
+    for _ in range(3):
+        routed.invoke(messages)
+    checks.append(("failures open the circuit", opened == "open" and primary.calls == calls_when_opened,
+                   f"state {opened}, primary calls while open: {primary.calls - calls_when_opened}"))
+
+    # After the cool-down: half-open; a failed trial reopens, a successful one closes
+    time.sleep(0.35)
+    half_open = stats.state
+    routed.invoke(messages)
+    reopened = stats.state
+    time.sleep(0.35)
+    primary.failure_rate = 0.0
+    message = routed.invoke(messages)
+    checks.append(("half-open trial: failure reopens, success closes",
+                   half_open == "half_open" and reopened == "open" and stats.state == "closed"
+                   and message.response_metadata["router"]["model"] == "Fake:primary",
+                   f"{half_open} -> {reopened} -> {stats.state}"))
+    return checks
+
+
+def _compare(args: argparse.Namespace) -> None:
+    """Prints the latency table of direct and routed calls."""
+    reply = "A short answer from the fake provider."
+    print(f"{'scenario':<9}{'mode':<8}{'route':<8}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+          f"{'errors':>8}{'fallback':>10}")
+    for scenario, failure_rate in (("tail", 0.0), ("outage", 1.0)):
+        for mode in ("invoke", "stream"):
+            def primary():
+                return FakeFlakyChatModel(
+                    reply=reply, first_token_latency=args.latency, slow_latency=args.slow_latency,
+                    slow_rate=args.slow_rate, failure_rate=failure_rate, seed=7,
+                )
+
+            fallback = FakeChatModel(reply=reply, first_token_latency=args.fallback_latency)
+            router = ProviderRouter(default_hedge_delay=1.0, min_hedge_delay=0.1, max_workers=4 * args.concurrency)
+            routed = router.route(primary(), "Fake:primary", fallback, "Fake:fallback")
+            for route, model in (("direct", primary()), ("routed", routed)):
+                r = _run(model, mode, args.requests, args.concurrency)
+                print(f"{scenario:<9}{mode:<8}{route:<8}{r['p50']:>10.0f}{r['p95']:>10.0f}{r['p99']:>10.0f}"
+                      f"{r['errors']:>8.0%}{r['fallback']:>10.0%}")
+            state = router.snapshot()["Fake:primary"]
+            print(f"{'':<25}primary circuit: {state['state']}, error rate {state['error_rate']:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and mode.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent callers.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Usual primary latency in seconds.")
+    parser.add_argument("--slow-latency", type=float, default=2.0, help="Primary latency of slow calls.")
+    parser.add_argument("--slow-rate", type=float, default=0.04, help="Share of slow primary calls.")
+    parser.add_argument("--fallback-latency", type=float, default=0.3, help="Fallback latency in seconds.")
+    parser.add_argument("--checks-only", action="store_true", help="Only run the behaviour checks.")
+    args = parser.parse_args()
+
+    if not args.checks_only:
+        _compare(args)
+
+    checks = run_checks()
+    print()
+    for name, passed, detail in checks:
+        print(f"{'PASS' if passed else 'FAIL'}  {name:<50}{detail}")
+    if not all(passed for _, passed, _ in checks):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compares sending a burst of requests straight to a rate-limited provider with queueing it client-side.
+
+The fake provider allows `--quota` requests per minute (a token bucket holding a
+minute's worth) and answers 429 with a Retry-After once it is exhausted. A
+burst of `--requests` requests is sent from `--concurrency` threads three ways:
+
+- "direct": the provider's model as is; every request over the quota fails.
+- "limited": through a limiter configured with the provider's quota; requests
+  over the quota wait in line instead, and none is rejected.
+- "over": through a limiter configured with twice the quota (the quota is shared
+  with another client, say); the provider's 429s are retried after its Retry-After.
+
+Reports the wall time, errors, 429s seen by the provider, latency percentiles
+and the limiter's queue and wait metrics.
+
+Usage:
+    python -m benchmarks.bench_rate_limiter [--quota N] [--requests N] [--concurrency N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fakes import FakeQuotaChatModel
+from benchmarks.stats import percentile
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage
+
+# --- Local Application Imports ---
+from src.langgraph.llms.rate_limiter import RateLimit, RateLimiterRegistry
+
+
+def _call(model) -> Dict[str, Any]:
+    """Sends one request and returns its latency and outcome."""
+    start = time.perf_counter()
+    try:
+        model.invoke([HumanMessage(content="What happened in AI today?")])
+        ok = True
+    except Exception:
+        ok = False
+    return {"latency": time.perf_counter() - start, "ok": ok}
+
+
+def _run(model, requests: int, concurrency: int) -> Dict[str, float]:
+    """Sends the burst; returns the wall time (s), error share and latency percentiles (ms) of successes."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results: List[Dict[str, Any]] = list(pool.map(lambda _: _call(model), range(requests)))
+    wall = time.perf_counter() - start
+    latencies = sorted(r["latency"] for r in results if r["ok"]) or [0.0]
+    return {
+        "wall": wall,
+        "errors": sum(not r["ok"] for r in results) / len(results),
+        "p50": statistics.median(latencies) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quota", type=int, default=600, help="Provider requests per minute.")
+    parser.add_argument("--requests", type=int, default=700, help="Requests in the burst.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent callers.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake provider seconds per answer.")
+    args = parser.parse_args()
+
+    print(f"provider quota: {args.quota} requests/minute, burst: {args.requests} requests")
+    print(f"\n{'route':<9}{'wall (s)':>9}{'errors':>8}{'429s':>6}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+          f"{'queued':>8}{'max queue':>11}{'wait p95 (s)':>14}{'retries':>9}")
+    for route, configured in (("direct", None), ("limited", args.quota), ("over", 2 * args.quota)):
+        provider = FakeQuotaChatModel(requests_per_minute=args.quota, first_token_latency=args.latency)
+        model, limiter = provider, None
+        if configured is not None:
+            registry = RateLimiterRegistry({"Fake:*": RateLimit(configured, 0)}, max_wait=300)
+            model, limiter = registry.limit(provider, "Fake", "model"), registry.get("Fake", "model")
+        r = _run(model, args.requests, args.concurrency)
+        stats: Optional[Dict[str, Any]] = limiter.stats() if limiter else None
+        queue = (f"{stats['queued']:>8}{stats['max_queue_depth']:>11}{stats['wait_p95']:>14.2f}{stats['retries']:>9}"
+                 if stats else f"{'-':>8}{'-':>11}{'-':>14}{'-':>9}")
+        print(f"{route:<9}{r['wall']:>9.1f}{r['errors']:>8.0%}{provider.rejected:>6}{r['p50']:>10.0f}"
+              f"{r['p95']:>10.0f}{queue}")
+
+
+if __name__ == "__main__":
+    main()
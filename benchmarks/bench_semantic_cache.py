@@ -0,0 +1,181 @@
+"""
+Measures the semantic response cache on a Basic ChatBot workload with near-duplicate prompts.
+
+A stream of prompts is sent through the Basic ChatBot graph (offline fake model
+with a fixed latency), each on a fresh thread as a first question. A share of
+the prompts are surface variants of earlier ones (casing, punctuation, spacing,
+filler words); the rest are distinct questions, some differing from earlier
+ones by a single entity ("capital of France" vs "capital of Germany"), which
+must not be answered from the cache.
+
+Reports the hit rate, false hits, lookup latency and mean turn latency with and
+without the cache. Then checks pairs of prompts the embedder scores as
+near-duplicates, after caching the first of each: the second must miss if the
+two are different questions (one entity, number or negation apart) and must hit
+if they are rewordings (a contraction or an extra adjective). Exits with 1 on
+any wrong answer or missed rewording.
+
+Usage:
+    python -m benchmarks.bench_semantic_cache [--prompts N] [--model-latency S] [--threshold T]
+"""
+# --- Standard Library Imports ---
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage
+
+# --- Local Application Imports ---
+from benchmarks.fakes import FakeChatModel, set_dummy_api_keys
+
+set_dummy_api_keys()
+
+from src.langgraph.graph.graph_builder import GraphBuilder  # noqa: E402
+from src.langgraph.llms.semantic_cache import SemanticCache  # noqa: E402
+
+TEMPLATES = [
+    "What is the capital of {}?",
+    "Tell me a fun fact about {}.",
+    "Summarize the history of {} in three sentences.",
+    "What language is spoken in {}?",
+    "Plan a one week trip to {}.",
+]
+# Different questions scored above the default threshold by the hashing embedder
+MUST_MISS = [
+    ("Can you explain in detail how garbage collection works in Java and what the tradeoffs are?",
+     "Can you explain in detail how garbage collection works in Go and what the tradeoffs are?"),
+    ("Create a 3 day itinerary for a first trip to Paris with museums and food",
+     "Create a 7 day itinerary for a first trip to Paris with museums and food"),
+    ("Is it safe to take ibuprofen on an empty stomach?",
+     "Is it not safe to take ibuprofen on an empty stomach?"),
+]
+# Rewordings scored above the default threshold, which must be answered from the cache
+MUST_HIT = [
+    ("Can you explain in detail how garbage collection works in Java and what the tradeoffs are?",
+     "Can you explain in detail how garbage collection works in Java and what the main tradeoffs are?"),
+    ("What's the best way to learn Python for data analysis as a beginner?",
+     "What is the best way to learn Python for data analysis as a beginner?"),
+    ("Summarize the history of Japan in three sentences.",
+     "Summarize the history of Japan in three short sentences."),
+]
+ENTITIES = ["France", "Germany", "Japan", "Brazil", "Kenya", "Canada", "India", "Norway", "Peru", "Egypt"]
+
+
+def _variant(prompt: str, rng: random.Random) -> str:
+    """Returns a surface variant of a prompt, as users retype the same question."""
+    choice = rng.randrange(4)
+    if choice == 0:
+        return prompt.lower()
+    if choice == 1:
+        return prompt.rstrip("?.") + " please"
+    if choice == 2:
+        return "  " + prompt.upper().replace(" ", "  ")
+    return prompt.rstrip("?.!")
+
+
+def _workload(count: int, duplicate_share: float, seed: int = 7):
+    """Returns (prompt, canonical prompt) pairs; canonical identifies the question asked."""
+    rng = random.Random(seed)
+    asked, workload = [], []
+    for _ in range(count):
+        if asked and rng.random() < duplicate_share:
+            canonical = rng.choice(asked)
+            workload.append((_variant(canonical, rng), canonical))
+        else:
+            canonical = rng.choice(TEMPLATES).format(rng.choice(ENTITIES))
+            asked.append(canonical)
+            workload.append((canonical, canonical))
+    return workload
+
+
+def _run(graph, workload):
+    """Sends every prompt as the first question of its own thread; returns latencies and answers."""
+    latencies, answers = [], []
+    for prompt, _ in workload:
+        start = time.perf_counter()
+        result = graph.invoke({"messages": [HumanMessage(content=prompt)]})
+        latencies.append(time.perf_counter() - start)
+        answers.append(result["messages"][-1])
+    return latencies, answers
+
+
+def _question(prompt: str) -> str:
+    """Normalizes a prompt back to the question it asks (undoing `_variant`)."""
+    text = " ".join(prompt.lower().split()).rstrip("?.!")
+    return text[: -len(" please")] if text.endswith(" please") else text
+
+
+class EchoModel(FakeChatModel):
+    """Answers with the question it was asked, so cached answers can be checked for correctness."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.reply = f"Answer to: {_question(messages[-1].content)}"
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--prompts", type=int, default=300, help="Prompts to send.")
+    parser.add_argument("--duplicates", type=float, default=0.5, help="Share of prompts that repeat an earlier one.")
+    parser.add_argument("--model-latency", type=float, default=0.05, help="Fake model latency in seconds.")
+    parser.add_argument("--threshold", type=float, default=0.92, help="Cache similarity threshold.")
+    args = parser.parse_args()
+
+    workload = _workload(args.prompts, args.duplicates)
+    model = EchoModel(first_token_latency=args.model_latency)
+
+    uncached = GraphBuilder(model).setup_graph("Basic ChatBot")
+    base_latencies, _ = _run(uncached, workload)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticCache(os.path.join(tmp, "semantic_cache.sqlite3"), threshold=args.threshold)
+        cached = GraphBuilder(model, response_cache=cache, cache_namespace="Fake:echo").setup_graph("Basic ChatBot")
+        latencies, answers = _run(cached, workload)
+        stats = cache.stats()
+
+        must_miss_hits = []
+        for number, (first, second) in enumerate(MUST_MISS):
+            namespace = f"Fake:must-miss-{number}"
+            cache.store(namespace, first, "answer")
+            similarity = float(cache.embed(first) @ cache.embed(second))
+            if cache.lookup(namespace, second) is not None:
+                must_miss_hits.append(f"{second!r} (similarity {similarity:.3f})")
+
+        must_hit_misses = []
+        for number, (first, second) in enumerate(MUST_HIT):
+            namespace = f"Fake:must-hit-{number}"
+            cache.store(namespace, first, "answer")
+            similarity = float(cache.embed(first) @ cache.embed(second))
+            if cache.lookup(namespace, second) is None:
+                must_hit_misses.append(f"{second!r} (similarity {similarity:.3f})")
+
+    false_hits = sum(
+        1 for (_, canonical), answer in zip(workload, answers)
+        if "semantic_cache" in answer.response_metadata
+        and answer.content != f"Answer to: {_question(canonical)}"
+    )
+    repeats = len(workload) - len({canonical for _, canonical in workload})
+
+    print(f"prompts:               {len(workload)} ({repeats} repeats of an earlier question)")
+    print(f"hit rate:              {stats['hit_rate']:.1%} ({stats['hits']} hits, {false_hits} wrong answers)")
+    print(f"lookup p50 / p95:      {stats['lookup_ms_p50']:.3f} / {stats['lookup_ms_p95']:.3f} ms")
+    print(f"mean turn, no cache:   {statistics.mean(base_latencies) * 1000:.1f} ms")
+    print(f"mean turn, with cache: {statistics.mean(latencies) * 1000:.1f} ms")
+    print(f"must-miss pairs hit:   {len(must_miss_hits)} of {len(MUST_MISS)}")
+    for line in must_miss_hits:
+        print(f"  answered from the cache: {line}")
+    print(f"must-hit pairs missed: {len(must_hit_misses)} of {len(MUST_HIT)}")
+    for line in must_hit_misses:
+        print(f"  not answered from the cache: {line}")
+
+    if false_hits or must_miss_hits or must_hit_misses:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
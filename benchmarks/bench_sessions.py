@@ -0,0 +1,293 @@
+"""
+Load-tests the Streamlit request path with many concurrent simulated sessions.
+
+Each session runs in its own thread, as Streamlit runs every session's script
+in its own thread, and sends `--turns` messages with `--think-time` seconds
+between them. Every message goes through `process_request`, and from there
+through `DisplayResultStreamlit`, exactly as a chat input would. `streamlit` is
+replaced in both modules with a headless shim that renders nothing but keeps
+per-session `session_state` and records errors and the first render of each
+answer. The provider is an offline fake model waiting `--latency` seconds per
+call (ChatBot with Tools also calls three fake tools waiting `--tool-latency`).
+
+For each number of concurrent sessions it reports the throughput, turn latency
+and time-to-first-render percentiles, errors, the peak thread count and the
+resident memory per session (the RSS growth over the level divided by its
+sessions; Linux only).
+
+Usage:
+    python -m benchmarks.bench_sessions [--sessions 1,8,32,64] [--turns N] [--usecase NAME]
+"""
+# --- Standard Library Imports ---
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fakes import FakeChatModel, FakeToolCallingChatModel, make_fake_tools, set_dummy_api_keys
+from benchmarks.stats import percentile
+
+set_dummy_api_keys()
+
+# --- Local Application Imports ---
+import src.langgraph.main as app_main  # noqa: E402
+import src.langgraph.tools.tools as tools_module  # noqa: E402
+import src.langgraph.ui.streamlitui.display_result as display_result  # noqa: E402
+
+TOOL_NAMES = ["duckduckgo_search", "wikipedia", "arxiv"]
+
+
+class StopRun(Exception):
+    """Raised by the shim's `st.stop()`, which ends the script run like Streamlit's."""
+
+
+class _SessionState(dict):
+    """A dict with attribute access, like `st.session_state`."""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self[name] = value
+
+
+class _Element:
+    """
+    A container or placeholder: a context manager whose calls render through the shim.
+
+    It remembers the chat message it was created in, so a placeholder filled after
+    its `with st.chat_message(...)` block still renders as that role.
+    """
+
+    def __init__(self, shim: "StreamlitShim", role: Optional[str] = None):
+        self._shim = shim
+        self._role = role
+
+    def __enter__(self) -> "_Element":
+        self._outer_role = self._shim._local.role
+        self._shim._local.role = self._role or self._outer_role
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self._shim._local.role = self._outer_role
+        return False
+
+    def markdown(self, body: Any, **kwargs: Any) -> None:
+        with self:
+            self._shim.markdown(body, **kwargs)
+
+    def update(self, **kwargs: Any) -> None:
+        """`st.status(...).update(label=..., state=...)`."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._shim, name)
+
+
+class StreamlitShim:
+    """
+    A headless stand-in for the parts of the `streamlit` module the app calls.
+
+    Session state and the per-turn records are thread-local, so each session
+    thread sees only its own. The first render is the first markdown written
+    into an assistant chat message: the answer's first tokens.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    # ---- Per-session bookkeeping ---- #
+
+    def start_session(self) -> None:
+        self._local.session_state = _SessionState()
+
+    def start_turn(self) -> None:
+        self._local.turn_start = time.perf_counter()
+        self._local.first_render = None
+        self._local.errors = []
+        self._local.role = None
+
+    def turn_elapsed(self) -> float:
+        return time.perf_counter() - self._local.turn_start
+
+    @property
+    def first_render(self) -> Optional[float]:
+        return self._local.first_render
+
+    @property
+    def errors(self) -> List[str]:
+        return self._local.errors
+
+    @property
+    def session_state(self) -> _SessionState:
+        return self._local.session_state
+
+    # ---- Rendering ---- #
+
+    def markdown(self, body: Any, **kwargs: Any) -> None:
+        if self._local.first_render is None and self._local.role == "assistant":
+            self._local.first_render = time.perf_counter() - self._local.turn_start
+
+    def json(self, body: Any, **kwargs: Any) -> None:
+        json.dumps(body, default=str)
+
+    def error(self, body: Any, **kwargs: Any) -> None:
+        self._local.errors.append(str(body))
+
+    def stop(self) -> None:
+        raise StopRun()
+
+    def columns(self, spec: Any, **kwargs: Any) -> List[_Element]:
+        return [_Element(self, role=self._local.role) for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def chat_message(self, name: str, **kwargs: Any) -> _Element:
+        return _Element(self, role=name)
+
+    def _element(self, *args: Any, **kwargs: Any) -> _Element:
+        return _Element(self, role=self._local.role)
+
+    spinner = status = expander = empty = _element
+    write = caption = subheader = warning = image = download_button = markdown
+
+
+def _rss_mb() -> float:
+    """Returns the resident set size of this process in MB (0 if /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return 0.0
+
+
+class Sampler:
+    """Records the peak thread count and RSS while it runs."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak_threads = threading.active_count()
+        self.peak_rss = _rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            self.peak_rss = max(self.peak_rss, _rss_mb())
+
+    def __enter__(self) -> "Sampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class FakeProvider:
+    """An LLM provider handler returning the fake model set up by `main`."""
+
+    model = None
+
+    def __init__(self, user_control_input: Dict[str, Any]):
+        self.user_control_input = user_control_input
+
+    def get_llm_model(self):
+        return FakeProvider.model
+
+
+def run_level(shim: StreamlitShim, ui_settings: Dict[str, Any], sessions: int, args) -> Dict[str, float]:
+    """Runs `sessions` concurrent sessions to completion and returns their statistics."""
+    latencies: List[float] = []
+    first_renders: List[float] = []
+    failures = [0]
+    lock = threading.Lock()
+
+    def session(number: int):
+        shim.start_session()
+        for turn in range(args.turns):
+            shim.start_turn()
+            try:
+                app_main.process_request(f"Session {number} question {turn}", ui_settings)
+            except StopRun:
+                pass
+            elapsed = shim.turn_elapsed()
+            with lock:
+                if shim.errors:
+                    failures[0] += 1
+                else:
+                    latencies.append(elapsed)
+                    if shim.first_render is not None:
+                        first_renders.append(shim.first_render)
+            time.sleep(args.think_time)
+
+    rss_before = _rss_mb()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    with Sampler() as sampler:
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+
+    latencies.sort()
+    first_renders.sort()
+    return {
+        "rate": (len(latencies) + failures[0]) / wall,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "render_p50": statistics.median(first_renders) * 1000 if first_renders else 0.0,
+        "errors": failures[0],
+        "threads": sampler.peak_threads,
+        "rss_per_session": max(0.0, sampler.peak_rss - rss_before) / sessions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", default="1,8,32,64", help="Comma-separated concurrent session counts.")
+    parser.add_argument("--turns", type=int, default=5, help="Messages per session.")
+    parser.add_argument("--think-time", type=float, default=0.2, help="Seconds a session waits between messages.")
+    parser.add_argument("--usecase", default="Basic ChatBot", choices=["Basic ChatBot", "ChatBot with Tools"])
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake model seconds before the first token.")
+    parser.add_argument("--per-token", type=float, default=0.005, help="Fake model seconds per token.")
+    parser.add_argument("--words", type=int, default=40, help="Words in the fake reply.")
+    parser.add_argument("--tool-latency", type=float, default=0.3, help="Fake tool seconds per call.")
+    args = parser.parse_args()
+
+    shim = StreamlitShim()
+    app_main.st = display_result.st = shim
+    tools = make_fake_tools(TOOL_NAMES, latency=args.tool_latency)
+    tools_module.get_tools = lambda: tools
+    options = dict(reply=" ".join(["token"] * args.words), first_token_latency=args.latency,
+                   per_token_latency=args.per_token)
+    FakeProvider.model = (
+        FakeToolCallingChatModel(tool_names=TOOL_NAMES, **options)
+        if args.usecase == "ChatBot with Tools" else FakeChatModel(**options)
+    )
+    app_main.LLM_PROVIDERS["Fake"] = FakeProvider
+    ui_settings = {"selected_llm": "Fake", "selected_fake_model": "fake-model", "selected_use_case": args.usecase}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CHECKPOINT_DB_PATH"] = os.path.join(tmp, "checkpoints.sqlite3")
+        os.environ["LLM_FALLBACK_MODEL"] = ""
+        os.environ["SEMANTIC_CACHE_ENABLED"] = "false"
+        print(f"{args.usecase}: {args.turns} turns per session, think time {args.think_time:.1f}s, "
+              f"fake model {args.latency * 1000:.0f} ms + {args.words} tokens")
+        print(f"\n{'sessions':>9}{'turns/s':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+              f"{'render p50':>12}{'errors':>8}{'threads':>9}{'MB/session':>12}")
+        for sessions in (int(s) for s in args.sessions.split(",")):
+            r = run_level(shim, ui_settings, sessions, args)
+            print(f"{sessions:>9}{r['rate']:>9.1f}{r['p50']:>10.0f}{r['p95']:>10.0f}{r['p99']:>10.0f}"
+                  f"{r['render_p50']:>12.0f}{r['errors']:>8}{r['threads']:>9}{r['rss_per_session']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
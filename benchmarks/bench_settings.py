@@ -0,0 +1,71 @@
+"""
+Compares reading the settings on every rerun with the shared, cached settings.
+
+Each simulated Streamlit rerun reads what the sidebar needs: the page title,
+the provider, use case and model options, and the selected model's history
+budget and metadata. "parse per rerun" loads the config file for every rerun,
+as the app did before the settings were shared; "shared" asks the process-wide
+store (see `get_settings`). It also reports how long after an edit of the file
+the new settings are served, with the default check interval.
+
+Usage:
+    python -m benchmarks.bench_settings [--reruns N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable
+
+# --- Local Application Imports ---
+from src.langgraph.ui.uiconfigfile import DEFAULT_CONFIG_FILE, Settings, get_settings, get_settings_store, load_settings
+
+
+def _rerun(settings: Settings) -> None:
+    """Reads what one rerun of the sidebar reads."""
+    _ = settings.page_title, settings.llm_options, settings.usecase_options
+    models = settings.model_options("Groq")
+    settings.history_token_budget("Groq", models[0])
+    settings.model_info("Groq", models[0])
+
+
+def _per_rerun_us(get: Callable[[], Settings], reruns: int) -> float:
+    """Returns the mean microseconds of `reruns` reruns reading the settings from `get`."""
+    start = time.perf_counter()
+    for _ in range(reruns):
+        _rerun(get())
+    return (time.perf_counter() - start) / reruns * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reruns", type=int, default=2000, help="Simulated reruns per mode.")
+    args = parser.parse_args()
+
+    get_settings()
+    parsed = _per_rerun_us(load_settings, args.reruns)
+    shared = _per_rerun_us(get_settings, args.reruns)
+    print(f"{'mode':<20}{'per rerun (us)':>16}")
+    print(f"{'parse per rerun':<20}{parsed:>16.1f}")
+    print(f"{'shared':<20}{shared:>16.1f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = os.path.join(tmp, "uiconfigfile.ini")
+        shutil.copy(DEFAULT_CONFIG_FILE, config_file)
+        store = get_settings_store(config_file)
+        before = store.get()
+        with open(config_file, encoding="utf-8") as f:
+            text = f.read()
+        with open(config_file, "w", encoding="utf-8") as f:
+            f.write(text.replace("PAGE_TITLE = ", "PAGE_TITLE = Edited ", 1))
+        edited = time.perf_counter()
+        while store.get() is before:
+            time.sleep(0.01)
+        print(f"\nEdit served after {time.perf_counter() - edited:.2f} s "
+              f"(check interval {store.check_interval:.1f} s): '{store.get().page_title}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compares the wall time of one multi-tool model turn with the sum of its tool latencies.
+
+The fake tools sleep for fixed latencies modelled on the real search tools, so
+the sequential cost is known up front; the tool executor should bring the turn
+down to roughly the slowest single call.
+
+Usage:
+    python -m benchmarks.bench_tool_fanout [--repeat N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import statistics
+import time
+
+from benchmarks.fakes import make_fake_tools, set_dummy_api_keys
+
+set_dummy_api_keys()
+
+# --- Third-Party Imports ---
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+# --- Local Application Imports ---
+from src.langgraph.tools.tool_executor import ToolExecutor  # noqa: E402
+
+# Simulated per-call latencies in seconds
+TOOL_LATENCIES = {
+    "duckduckgo_search": 0.30,
+    "brave_search": 0.45,
+    "wikipedia": 0.40,
+    "arxiv": 0.60,
+    "google_scholar": 0.80,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Turns to time per scenario.")
+    args = parser.parse_args()
+
+    names = list(TOOL_LATENCIES)
+    tools = make_fake_tools(names, latencies=TOOL_LATENCIES)
+    executor = ToolExecutor(max_workers=8)
+
+    print(f"{'calls in turn':<14}{'sum (s)':>9}{'wall (s)':>10}{'speed-up':>10}")
+    for count in (1, 3, len(names)):
+        tool_calls = [
+            {"name": name, "args": {"query": "benchmark"}, "id": f"call_{i}", "type": "tool_call"}
+            for i, name in enumerate(names[:count])
+        ]
+        node = executor.create_node(tools)
+        state = {"messages": [HumanMessage("hi"), AIMessage(content="", tool_calls=tool_calls)]}
+
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = node.invoke(state)
+            samples.append(time.perf_counter() - start)
+        assert [m.tool_call_id for m in result["messages"]] == [tc["id"] for tc in tool_calls]
+
+        sequential = sum(TOOL_LATENCIES[name] for name in names[:count])
+        wall = statistics.median(samples)
+        print(f"{count:<14}{sequential:>9.2f}{wall:>10.2f}{sequential / wall:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures import time and peak RSS of the tools module, with and without building the tools.
+
+Each scenario runs in a fresh interpreter so module caches do not leak between
+measurements:
+
+- "baseline": the interpreter plus langchain_core and langgraph, which every graph loads anyway.
+- "import": only `import src.langgraph.tools.tools` (what every session pays).
+- "import + get_tools()": also builds every tool (what a tools session pays).
+
+Usage:
+    python -m benchmarks.bench_tools_import [--repeat N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import json, resource, time
+from benchmarks.fakes import set_dummy_api_keys
+set_dummy_api_keys()
+import langchain_core.messages, langchain_core.runnables, langchain_core.tools, langgraph.graph  # shared baseline
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+SCENARIOS = {
+    "baseline": "",
+    "import": "import src.langgraph.tools.tools as tools",
+    "import + get_tools()": "import src.langgraph.tools.tools as tools; tools.get_tools()",
+}
+
+
+def _run(body: str) -> dict:
+    """Runs one probe in a fresh interpreter and returns its measurements."""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(body=body)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per scenario.")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<24}{'time (ms)':>12}{'peak RSS (MB)':>16}")
+    for name, body in SCENARIOS.items():
+        samples = [_run(body) for _ in range(args.repeat)]
+        seconds = statistics.median(s["seconds"] for s in samples)
+        rss = statistics.median(s["maxrss_mb"] for s in samples)
+        print(f"{name:<24}{seconds * 1000:>12.1f}{rss:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures the per-turn cost of trimming a growing history to a context budget.
+
+A synthetic tools conversation (question, tool call, two tool results, answer per
+turn) is grown turn by turn, and the history is trimmed before every model call,
+as the chatbot nodes do. Three variants are compared:
+
+- "cached": `MessageTrimmer` with the shared per-message-id token cache.
+- "uncached": the same trimmer, re-counting every message it looks at.
+- "count all": counting the full history each turn (what a naive trimmer does).
+
+Usage:
+    python -m benchmarks.bench_trimming [--turns N] [--budget TOKENS]
+"""
+# --- Standard Library Imports ---
+import argparse
+import time
+
+# --- Third-Party Imports ---
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+# --- Local Application Imports ---
+from src.langgraph.nodes.message_trimmer import MessageTrimmer, TokenCounter, count_message_tokens
+
+REPORT_AT = (10, 100, 500, 1000, 2000)
+
+
+def _turn(i: int) -> list:
+    """Returns the messages of one synthetic tool-using turn."""
+    calls = [{"name": "search", "args": {"query": f"topic {i} part {k}"}, "id": f"call_{i}_{k}"} for k in range(2)]
+    return [
+        HumanMessage(content=f"Question {i}: " + "please explain the topic " * 10, id=f"human_{i}"),
+        AIMessage(content="", tool_calls=calls, id=f"call_{i}"),
+        *(ToolMessage(content="result text " * 150, tool_call_id=c["id"], id=f"tool_{c['id']}") for c in calls),
+        AIMessage(content="The answer is " + "detailed " * 80, id=f"answer_{i}"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=2000, help="Turns to grow the history to.")
+    parser.add_argument("--budget", type=int, default=32768, help="History token budget.")
+    args = parser.parse_args()
+
+    variants = {
+        "cached": MessageTrimmer(args.budget, counter=TokenCounter()),
+        "uncached": MessageTrimmer(args.budget, counter=count_message_tokens),
+        "count all": None,
+    }
+    print(f"{'turn':>6}{'messages':>10}{'kept':>8}" + "".join(f"{name + ' (ms)':>18}" for name in variants))
+
+    history = []
+    for turn in range(1, args.turns + 1):
+        history.extend(_turn(turn))
+        if turn not in REPORT_AT:
+            # Keep the cache warm as in a real conversation
+            variants["cached"].trim(history)
+            continue
+
+        timings = []
+        for trimmer in variants.values():
+            start = time.perf_counter()
+            if trimmer is None:
+                sum(count_message_tokens(m) for m in history)
+            else:
+                kept = trimmer.trim(history)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{turn:>6}{len(history):>10}{len(kept):>8}" + "".join(f"{t:>18.3f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
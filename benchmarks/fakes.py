@@ -0,0 +1,374 @@
+"""
+Deterministic, offline stand-ins for the LLM providers used by the benchmarks.
+
+Nothing in this module touches the network, so every benchmark can run on an
+offline machine with dummy API keys.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import json
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+# --- Third-Party Imports ---
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import BaseTool, StructuredTool
+from pydantic import PrivateAttr
+
+
+def set_dummy_api_keys() -> None:
+    """Sets placeholder values for every API key the application reads at import time."""
+    for key in (
+        "SERP_API_KEY",
+        "TAVILY_API_KEY",
+        "BRAVE_SEARCH_API_KEY",
+        "GROQ_API_KEY",
+        "OPENROUTER_API_KEY",
+        "NVIDIA_API_KEY",
+    ):
+        os.environ.setdefault(key, "benchmark-dummy-key")
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    A chat model that replies with a fixed answer after a configurable delay.
+
+    The delay is modelled as `first_token_latency + per_token_latency * tokens`,
+    where tokens are the whitespace-separated words of the reply. The sync methods
+    sleep the calling thread; the async ones await, like a native async client.
+    """
+
+    reply: str = "This is a deterministic answer from the fake chat model."
+    first_token_latency: float = 0.0
+    per_token_latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark-chat"
+
+    def _tokens(self) -> List[str]:
+        """Splits the reply into word tokens, keeping the separating whitespace."""
+        words = self.reply.split(" ")
+        return [word + " " for word in words[:-1]] + [words[-1]]
+
+    def _call_delay(self) -> float:
+        """Returns the seconds before the first token of this call."""
+        return self.first_token_latency
+
+    def _usage(self, messages: List[BaseMessage]) -> Dict[str, int]:
+        """Reports token usage like a provider, counting words as tokens."""
+        input_tokens = sum(len(str(message.content).split()) for message in messages)
+        output_tokens = len(self._tokens())
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        """Accepts any tools and returns the model unchanged."""
+        return self
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._call_delay() + self.per_token_latency * len(self._tokens()))
+        message = AIMessage(content=self.reply, usage_metadata=self._usage(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self._call_delay())
+        tokens = self._tokens()
+        for i, token in enumerate(tokens):
+            time.sleep(self.per_token_latency)
+            # The last chunk carries the usage, as providers report it at the end of a stream
+            usage = self._usage(messages) if i == len(tokens) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._call_delay() + self.per_token_latency * len(self._tokens()))
+        message = AIMessage(content=self.reply, usage_metadata=self._usage(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._call_delay())
+        tokens = self._tokens()
+        for i, token in enumerate(tokens):
+            await asyncio.sleep(self.per_token_latency)
+            # The last chunk carries the usage, as providers report it at the end of a stream
+            usage = self._usage(messages) if i == len(tokens) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+class FakeFlakyChatModel(FakeChatModel):
+    """
+    A fake chat model with a heavy latency tail and random failures.
+
+    Each call independently takes `slow_latency` instead of `first_token_latency`
+    with probability `slow_rate`, and raises a `RuntimeError` (like a 5xx from the
+    provider) with probability `failure_rate`. Calls are drawn from a seeded
+    generator, so a benchmark run is repeatable.
+    """
+
+    slow_rate: float = 0.0
+    slow_latency: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 0
+    _rng: Any = PrivateAttr(default=None)
+    _rng_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _call_delay(self) -> float:
+        with self._rng_lock:
+            if self._rng is None:
+                self._rng = random.Random(self.seed)
+            failed, slow = self._rng.random() < self.failure_rate, self._rng.random() < self.slow_rate
+        if failed:
+            raise RuntimeError("503 Service Unavailable (fake provider failure)")
+        return self.slow_latency if slow else self.first_token_latency
+
+
+class FakeRateLimitError(Exception):
+    """A 429 answer shaped like the provider SDK errors: a status code and response headers."""
+
+    class _Response:
+        def __init__(self, headers: Dict[str, str]):
+            self.status_code = 429
+            self.headers = headers
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Error code: 429 - Rate limit reached, please try again in {retry_after}s")
+        self.status_code = 429
+        self.response = self._Response({"retry-after": str(retry_after)})
+
+
+class FakeQuotaChatModel(FakeChatModel):
+    """
+    A fake chat model that enforces a requests-per-minute quota, like a free-tier provider.
+
+    The quota is a token bucket holding a minute's worth of requests. A call that
+    finds it empty raises `FakeRateLimitError` with a Retry-After of the whole
+    seconds until the next request is allowed. `rejected` counts those answers.
+    """
+
+    requests_per_minute: int = 60
+    _level: Any = PrivateAttr(default=None)
+    _updated: float = PrivateAttr(default=0.0)
+    _quota_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _rejected: int = PrivateAttr(default=0)
+
+    @property
+    def rejected(self) -> int:
+        return self._rejected
+
+    def _call_delay(self) -> float:
+        rate = self.requests_per_minute / 60.0
+        with self._quota_lock:
+            now = time.monotonic()
+            if self._level is None:
+                self._level = float(self.requests_per_minute)
+            self._level = min(float(self.requests_per_minute), self._level + (now - self._updated) * rate)
+            self._updated = now
+            if self._level < 1:
+                self._rejected += 1
+                raise FakeRateLimitError(math.ceil((1 - self._level) / rate))
+            self._level -= 1
+        return self.first_token_latency
+
+
+class FakeToolCallingChatModel(FakeChatModel):
+    """
+    A chat model that calls every tool in `tool_names` once, then answers.
+
+    On a turn whose last message is not a `ToolMessage` it emits one tool call per
+    name (all in the same turn); once the tool results are in, it replies with
+    `reply` like `FakeChatModel`.
+    """
+
+    tool_names: List[str] = []
+
+    def _tool_call_message(self, messages: List[BaseMessage]) -> Optional[AIMessage]:
+        """Returns the tool-calling message for this turn, or None if it should answer."""
+        if not self.tool_names or (messages and isinstance(messages[-1], ToolMessage)):
+            return None
+        turn = len(messages)
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {"name": name, "args": {"query": f"query for {name}"}, "id": f"call_{turn}_{i}"}
+                for i, name in enumerate(self.tool_names)
+            ],
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        tool_call_message = self._tool_call_message(messages)
+        if tool_call_message is None:
+            return super()._generate(messages, stop, run_manager, **kwargs)
+        time.sleep(self._call_delay())
+        return ChatResult(generations=[ChatGeneration(message=tool_call_message)])
+
+    @staticmethod
+    def _tool_call_chunk(tool_call_message: AIMessage) -> ChatGenerationChunk:
+        """Returns the tool-calling message as a single streamed chunk."""
+        return ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": tc["name"], "args": json.dumps(tc["args"]), "id": tc["id"], "index": i}
+                    for i, tc in enumerate(tool_call_message.tool_calls)
+                ],
+            )
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        tool_call_message = self._tool_call_message(messages)
+        if tool_call_message is None:
+            yield from super()._stream(messages, stop, run_manager, **kwargs)
+            return
+        time.sleep(self._call_delay())
+        yield self._tool_call_chunk(tool_call_message)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        tool_call_message = self._tool_call_message(messages)
+        if tool_call_message is None:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+        await asyncio.sleep(self._call_delay())
+        return ChatResult(generations=[ChatGeneration(message=tool_call_message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        tool_call_message = self._tool_call_message(messages)
+        if tool_call_message is None:
+            async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+                yield chunk
+            return
+        await asyncio.sleep(self._call_delay())
+        yield self._tool_call_chunk(tool_call_message)
+
+
+def make_fake_tools(
+    names: Sequence[str],
+    latency: float = 0.0,
+    payload_size: int = 200,
+    latencies: Optional[Dict[str, float]] = None,
+) -> List[BaseTool]:
+    """
+    Creates offline tools that sleep and then return a fixed-size text payload.
+
+    Args:
+        names (Sequence[str]): The tool names to create.
+        latency (float): Seconds each tool call sleeps, unless overridden.
+        payload_size (int): Approximate number of characters each call returns.
+        latencies (Optional[Dict[str, float]]): Per-tool latency overrides.
+
+    Returns:
+        List[BaseTool]: The fake tools, in the order of `names`.
+    """
+    latencies = latencies or {}
+
+    def make(name: str) -> BaseTool:
+        delay = latencies.get(name, latency)
+
+        def payload(query: str) -> str:
+            sentence = f"Result from {name} for '{query}'. "
+            return (sentence * (payload_size // len(sentence) + 1))[:payload_size]
+
+        def run(query: str) -> str:
+            time.sleep(delay)
+            return payload(query)
+
+        async def arun(query: str) -> str:
+            await asyncio.sleep(delay)
+            return payload(query)
+
+        return StructuredTool.from_function(run, coroutine=arun, name=name, description=f"Fake {name} tool.")
+
+    return [make(name) for name in names]
+
+
+def make_fake_news_search(latency: float = 0.0, results_per_query: int = 10, story_pool: int = 30) -> BaseTool:
+    """
+    Creates an offline stand-in for the Tavily news search used by `AINewsNode`.
+
+    Each query returns `results_per_query` stories drawn deterministically from a
+    shared pool of `story_pool` stories, so different queries overlap the way real
+    searches do. Some repeats come back with tracking parameters on the URL or as
+    a syndicated copy on another site with a lightly edited snippet.
+
+    Args:
+        latency (float): Seconds each search sleeps.
+        results_per_query (int): Number of results per search.
+        story_pool (int): Number of distinct stories all searches draw from.
+
+    Returns:
+        BaseTool: A tool named "tavily_search" returning Tavily-shaped responses.
+    """
+    import hashlib
+
+    def story(i: int) -> Dict[str, Any]:
+        rng = random.Random(i)
+        words = " ".join(rng.choice(["model", "chip", "startup", "policy", "research", "agent", "cloud",
+                                     "funding", "benchmark", "robotics", "open", "source", "launch"])
+                         + str(rng.randrange(1000)) for _ in range(80))
+        return {
+            "title": f"AI story {i}",
+            "url": f"https://news{i % 7}.example.com/2025/story-{i}",
+            "content": f"Story {i}: {words}",
+            "published_date": f"2025-06-{1 + i % 28:02d}",
+        }
+
+    def respond(query: str) -> Dict[str, Any]:
+        rng = random.Random(int(hashlib.md5(query.encode()).hexdigest(), 16))
+        results = []
+        for rank, i in enumerate(rng.sample(range(story_pool), results_per_query)):
+            article = story(i)
+            variant = rng.randrange(3)
+            if variant == 1:
+                article["url"] += "?utm_source=newsletter&utm_medium=email"
+            elif variant == 2:
+                article["url"] = f"https://syndicated.example.org/copy-{i}"
+                article["content"] = article["content"].replace("Story", "Syndicated story", 1)
+            article["score"] = round(0.99 - rank * 0.05, 2)
+            results.append(article)
+        return {"query": query, "results": results, "images": [f"https://img.example.com/{query[:8]}.png"]}
+
+    def search(query: str, time_range: Optional[str] = None) -> Dict[str, Any]:
+        """Fake news search."""
+        time.sleep(latency)
+        return respond(query)
+
+    async def asearch(query: str, time_range: Optional[str] = None) -> Dict[str, Any]:
+        """Fake news search."""
+        await asyncio.sleep(latency)
+        return respond(query)
+
+    return StructuredTool.from_function(search, coroutine=asearch, name="tavily_search", description="Fake news search.")
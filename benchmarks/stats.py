@@ -0,0 +1,28 @@
+"""
+Summary statistics shared by the benchmarks.
+"""
+# --- Standard Library Imports ---
+import math
+from typing import Iterable
+
+
+def percentile(samples: Iterable[float], q: float) -> float:
+    """
+    Returns the nearest-rank `q` quantile of samples (e.g., 0.95 for the p95).
+
+    This is the smallest sample with at least a `q` share of the samples at or
+    below it, so with few samples the p95 is the largest one rather than a lower
+    one, and it is never below the median.
+
+    Args:
+        samples (Iterable[float]): The samples, in any order.
+        q (float): The quantile, between 0 and 1.
+
+    Returns:
+        float: The quantile, or 0.0 if there are no samples.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    # Rounded first so that e.g. 0.95 * 60 = 57.00000000000001 ranks 57, not 58
+    return ordered[max(0, math.ceil(round(len(ordered) * q, 9)) - 1)]
@@ -0,0 +1,243 @@
+"""
+Runs the three graphs end to end offline and checks the results against a saved baseline.
+
+Every use case (Basic ChatBot, ChatBot with Tools, AI News) is built with
+`GraphBuilder.setup_graph` around the offline fakes: a chat model waiting
+`--latency` seconds per call, tools waiting `--tool-latency` seconds and
+returning `--payload-size` characters, and a local Tavily stand-in for AI News.
+For each it measures:
+
+- compile time: `GraphBuilder(...).setup_graph(usecase)`, median of `--repeat` builds,
+- per-turn latency: p50/p95 of `--turns` one-turn conversations (`graph.invoke`),
+- allocations per turn (tracemalloc): peak bytes above the starting point and
+  bytes still held afterwards, averaged over `--alloc-turns` turns.
+
+It also times importing the graph builder and the Streamlit entry point in a
+fresh interpreter. The results are printed and written to `--output` as JSON.
+With `--baseline`, every measurement that is more than `--tolerance` above the
+baseline's (and above a small absolute noise floor) is reported as a regression
+and the exit code is 1. `--save-baseline` writes the results as the new baseline.
+
+Usage:
+    python -m benchmarks.suite [--turns N] [--output FILE] [--baseline FILE] [--save-baseline]
+"""
+# --- Standard Library Imports ---
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fakes import (
+    FakeChatModel,
+    FakeToolCallingChatModel,
+    make_fake_news_search,
+    make_fake_tools,
+    set_dummy_api_keys,
+)
+from benchmarks.stats import percentile
+
+set_dummy_api_keys()
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+
+# --- Local Application Imports ---
+from src.langgraph.graph.graph_builder import GraphBuilder  # noqa: E402
+from src.langgraph.nodes.ai_news import AINewsNode  # noqa: E402
+
+USE_CASES = ["Basic ChatBot", "ChatBot with Tools", "AI News"]
+TOOL_NAMES = ["duckduckgo_search", "wikipedia", "arxiv"]
+IMPORTS = ["src.langgraph.graph.graph_builder", "src.langgraph.main"]
+
+# Differences below these are noise, whatever the relative change
+NOISE_FLOORS = {"ms": 1.5, "kb": 16.0}
+
+
+def _import_ms(module: str, repeat: int) -> float:
+    """Returns the median time to import `module` in a fresh interpreter, in milliseconds."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print((time.perf_counter() - start) * 1000)"
+    )
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=os.environ.copy()
+        )
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+class GraphBench:
+    """Builds and runs one use case's graph around the offline fakes."""
+
+    def __init__(self, usecase: str, args: argparse.Namespace, reports_dir: str):
+        self.usecase = usecase
+        self.args = args
+        self.reports_dir = reports_dir
+        self.runs = 0
+        if usecase == "ChatBot with Tools":
+            self.model = FakeToolCallingChatModel(first_token_latency=args.latency, tool_names=TOOL_NAMES)
+        else:
+            self.model = FakeChatModel(first_token_latency=args.latency)
+        self.tools = make_fake_tools(TOOL_NAMES, latency=args.tool_latency, payload_size=args.payload_size)
+        self.news_search = make_fake_news_search(latency=args.tool_latency)
+
+    def build(self):
+        """Builds and compiles the graph, with the fake tools and news search in place."""
+        AINewsNode._OUTPUT_DIR = self.reports_dir
+        builder = GraphBuilder(
+            self.model, checkpointer=InMemorySaver(), tools=self.tools, news_search=self.news_search
+        )
+        return builder.setup_graph(self.usecase)
+
+    def turn(self, graph) -> None:
+        """Runs one turn of a new conversation (AI News: one daily report)."""
+        self.runs += 1
+        message = "daily" if self.usecase == "AI News" else f"Question {self.runs}"
+        # AI News prints a line per saved report
+        with contextlib.redirect_stdout(io.StringIO()):
+            graph.invoke(
+                {"messages": [HumanMessage(content=message)]},
+                {"configurable": {"thread_id": f"suite-{self.runs}"}},
+            )
+
+
+def _timed_ms(fn: Callable[[], Any], repeat: int) -> List[float]:
+    """Runs `fn` `repeat` times and returns each wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _allocations_kb(fn: Callable[[], Any], turns: int) -> Dict[str, float]:
+    """Returns the mean peak and retained tracemalloc kilobytes of `turns` calls of `fn`."""
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(turns):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append((peak - before) / 1024)
+            retained.append((current - before) / 1024)
+    finally:
+        tracemalloc.stop()
+    return {"alloc_peak_kb": statistics.mean(peaks), "alloc_retained_kb": statistics.mean(retained)}
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    """Runs every measurement and returns the results."""
+    results: Dict[str, Any] = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {k: getattr(args, k) for k in ("turns", "repeat", "alloc_turns", "latency",
+                                                        "tool_latency", "payload_size")},
+        },
+        "imports": {module: {"import_ms": _import_ms(module, args.import_repeat)} for module in IMPORTS},
+        "graphs": {},
+    }
+    with tempfile.TemporaryDirectory() as reports_dir:
+        for usecase in USE_CASES:
+            bench = GraphBench(usecase, args, reports_dir)
+            compile_ms = statistics.median(_timed_ms(bench.build, args.repeat))
+            graph = bench.build()
+            bench.turn(graph)  # warm-up
+            turns = sorted(_timed_ms(lambda: bench.turn(graph), args.turns))
+            results["graphs"][usecase] = {
+                "compile_ms": compile_ms,
+                "turn_p50_ms": statistics.median(turns),
+                "turn_p95_ms": percentile(turns, 0.95),
+                **_allocations_kb(lambda: bench.turn(graph), args.alloc_turns),
+            }
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Lists the measurements that regressed against the baseline.
+
+    Every measurement is lower-is-better. One regresses if it exceeds the baseline by
+    more than `tolerance` (relative) and by more than the noise floor of its unit.
+    """
+    regressions = []
+    for section in ("imports", "graphs"):
+        for name, metrics in results[section].items():
+            for metric, value in metrics.items():
+                base = baseline.get(section, {}).get(name, {}).get(metric)
+                if base is None:
+                    continue
+                floor = NOISE_FLOORS[metric.rsplit("_", 1)[-1]]
+                if value > base * (1 + tolerance) and value - base > floor:
+                    change = (value / base - 1) if base > 0 else float("inf")
+                    regressions.append(f"{name} {metric}: {base:.2f} -> {value:.2f} (+{change:.0%})")
+    return regressions
+
+
+def _print_results(results: Dict[str, Any]) -> None:
+    for module, metrics in results["imports"].items():
+        print(f"import {module:<40}{metrics['import_ms']:>10.1f} ms")
+    print(f"\n{'graph':<20}{'compile (ms)':>13}{'p50 (ms)':>10}{'p95 (ms)':>10}{'peak (KB)':>11}{'retained (KB)':>15}")
+    for usecase, m in results["graphs"].items():
+        print(f"{usecase:<20}{m['compile_ms']:>13.2f}{m['turn_p50_ms']:>10.2f}{m['turn_p95_ms']:>10.2f}"
+              f"{m['alloc_peak_kb']:>11.1f}{m['alloc_retained_kb']:>15.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=100, help="Timed turns per graph.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed builds per graph.")
+    parser.add_argument("--alloc-turns", type=int, default=10, help="Turns traced for allocations.")
+    parser.add_argument("--import-repeat", type=int, default=3, help="Fresh interpreters per import timing.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake model seconds per call.")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="Fake tool and news search seconds per call.")
+    parser.add_argument("--payload-size", type=int, default=2000, help="Characters per fake tool result.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results.")
+    parser.add_argument("--baseline", help="Baseline results to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results to --baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown.")
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    _print_results(results)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if not args.baseline:
+        return
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
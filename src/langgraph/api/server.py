@@ -0,0 +1,329 @@
+"""
+A headless async HTTP API for the chatbot graphs.
+
+Exposes the Basic ChatBot, ChatBot with Tools and AI News graphs over HTTP, so
+other services can call them and several workers can sit behind a load balancer.
+Every use case has two endpoints:
+
+- `POST /v1/{usecase}/invoke` runs the graph and returns the answer as JSON.
+- `POST /v1/{usecase}/stream` streams it as server-sent events: `metadata`,
+  then `token`, `tool_call` and `tool_result` events as they happen, then `end`
+  (or `error`). AI News streams a single `report` event before `end`.
+
+`GET /v1/models` lists every provider's models with their context window and
+latency tier. `GET /v1/providers` reports the rate-limit queues and routing state of every
+model used so far. `GET /metrics` exports the node, model and tool latency and
+token histograms in the Prometheus text format, and `GET /v1/metrics` as JSON.
+
+The use cases are addressed as `basic-chatbot`, `chatbot-with-tools` and
+`ai-news`. Graphs come from the same process-wide registry, checkpointer and
+caches as the Streamlit app. Each worker serves many requests at once: graphs
+and their async nodes run on the event loop, so a conversation waiting on the
+provider holds no thread. Blocking work (checkpoint and cache I/O, tools without
+an async client) runs on a thread pool sized by `API_THREADS`.
+
+Usage:
+    python -m src.langgraph.api.server [--host HOST] [--port PORT] [--workers N]
+"""
+# --- Standard Library Imports ---
+import argparse
+import asyncio
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# --- Third-Party Imports ---
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from pydantic import BaseModel, Field
+from sse_starlette.sse import EventSourceResponse
+
+# --- Local Application Imports ---
+from src.langgraph.graph.graph_registry import get_graph_registry
+from src.langgraph.graph.instrumentation import get_graph_metrics
+from src.langgraph.graph.news_scheduler import get_news_scheduler
+from src.langgraph.llms.provider_router import get_provider_router
+from src.langgraph.llms.rate_limiter import get_rate_limiters
+from src.langgraph.main import LLM_PROVIDERS, build_graph, build_graph_key, create_llm
+from src.langgraph.nodes.news_reports import NewsReport
+from src.langgraph.ui.streamlitui.display_result import message_text
+from src.langgraph.ui.uiconfigfile import Settings, get_settings
+
+# URL names of the use cases, as listed in the UI
+USECASES = {
+    "basic-chatbot": "Basic ChatBot",
+    "chatbot-with-tools": "ChatBot with Tools",
+    "ai-news": "AI News",
+}
+
+
+class ChatRequest(BaseModel):
+    """The body of an invoke or stream request."""
+    message: str = Field(description="The user's message; for AI News, the time frame (e.g. 'daily').")
+    provider: str = Field(default="Groq", description="The LLM provider, as named in the UI.")
+    model: Optional[str] = Field(default=None, description="The model; defaults to the provider's first model.")
+    api_key: Optional[str] = Field(default=None, description="The provider API key; defaults to the server's.")
+    thread_id: Optional[str] = Field(default=None, description="The conversation to continue; a new one if omitted.")
+
+
+def _ui_settings(usecase: str, request: ChatRequest, settings: Settings) -> Dict[str, Any]:
+    """
+    Translates a request into the settings dictionary the UI loader would produce.
+
+    Raises:
+        HTTPException: 400 if the provider is unknown or no model is available.
+    """
+    provider = request.provider
+    if provider not in LLM_PROVIDERS:
+        raise HTTPException(400, f"Unsupported LLM provider: '{provider}'. Must be one of: {', '.join(LLM_PROVIDERS)}")
+    model = request.model or next(iter(settings.model_options(provider)), None)
+    if not model:
+        raise HTTPException(400, f"No model given and none configured for provider '{provider}'.")
+    key_name = f"{provider.upper()}_API_KEY"
+    return {
+        "selected_llm": provider,
+        f"selected_{provider.lower()}_model": model,
+        key_name: request.api_key or os.getenv(key_name, ""),
+        "selected_use_case": usecase,
+        "history_token_budget": settings.history_token_budget(provider, model),
+    }
+
+
+def _get_graph(ui_settings: Dict[str, Any]):
+    """
+    Returns the registered graph for the settings, building it on first use.
+
+    Raises:
+        HTTPException: 400 if the model cannot be initialized.
+    """
+    graph_registry = get_graph_registry()
+    graph_key = build_graph_key(ui_settings)
+    graph = graph_registry.get(graph_key)
+    if graph is not None:
+        return graph
+    try:
+        llm = create_llm(ui_settings)
+    except Exception as e:
+        raise HTTPException(400, f"Could not initialize the language model: {e}") from e
+    if llm is None:
+        raise HTTPException(400, "Could not initialize the language model. Check the API key and model.")
+    return graph_registry.get_or_build(graph_key, lambda: build_graph(llm, ui_settings))
+
+
+def _report_payload(report: NewsReport, refreshing: bool) -> Dict[str, Any]:
+    """Returns the JSON form of an AI News report."""
+    return {
+        "frequency": report.frequency,
+        "version": report.version,
+        "generated_at": report.generated_at,
+        "articles": report.articles,
+        "summary": report.summary,
+        "refreshing": refreshing,
+    }
+
+
+def _news_frequency(message: str) -> str:
+    """
+    Returns the AI News time frame a request asks for.
+
+    Raises:
+        HTTPException: 400 if the scheduler does not serve that time frame.
+    """
+    frequency = message.lower().strip()
+    frequencies = get_news_scheduler().frequencies
+    if frequency not in frequencies:
+        raise HTTPException(400, f"Invalid AI News time frame: '{message}'. Must be one of: {', '.join(frequencies)}")
+    return frequency
+
+
+async def _news_report(graph, frequency: str) -> Dict[str, Any]:
+    """
+    Serves an AI News report like the UI does: the saved one if there is one
+    (refreshing it in the background when stale), otherwise a freshly generated one.
+    """
+    scheduler = get_news_scheduler()
+    scheduler.start()
+    report = scheduler.get_report(frequency)
+    refreshing = False
+    if report is None:
+        report = await asyncio.wrap_future(scheduler.refresh(frequency, graph=graph))
+    elif scheduler.is_stale(report):
+        refreshing = scheduler.refresh(frequency, graph=graph) is not None
+    return _report_payload(report, refreshing)
+
+
+async def _chat_events(graph, message: str, config: Dict[str, Any]) -> AsyncIterator[tuple]:
+    """
+    Runs a chatbot graph and yields (event, data) pairs as the answer is produced.
+
+    Tokens are only forwarded from the `ChatBot` node; tool calls and tool results
+    are taken from the node updates, as in the Streamlit chat view.
+    """
+    content: List[str] = []
+    final: Optional[AIMessage] = None
+    async for mode, payload in graph.astream(
+        {"messages": [HumanMessage(content=message)]},
+        config=config,
+        stream_mode=["messages", "updates"],
+        durability="exit",
+    ):
+        if mode == "messages":
+            chunk, metadata = payload
+            if isinstance(chunk, AIMessage) and metadata.get("langgraph_node") == "ChatBot":
+                text = message_text(chunk.content)
+                if text:
+                    content.append(text)
+                    yield "token", {"text": text}
+            continue
+
+        for node, update in payload.items():
+            if node not in ("ChatBot", "tools"):
+                continue
+            for update_message in (update or {}).get("messages", []):
+                if isinstance(update_message, AIMessage):
+                    final = update_message
+                    for tool_call in update_message.tool_calls:
+                        yield "tool_call", {"id": tool_call["id"], "name": tool_call["name"], "args": tool_call["args"]}
+                elif isinstance(update_message, ToolMessage):
+                    yield "tool_result", {
+                        "tool_call_id": update_message.tool_call_id,
+                        "name": update_message.name,
+                        "status": getattr(update_message, "status", "success"),
+                        "content": message_text(update_message.content),
+                    }
+
+    yield "end", {
+        "content": message_text(final.content) if final is not None else "".join(content),
+        "cached": bool(final is not None and final.response_metadata.get("semantic_cache")),
+    }
+
+
+def create_app() -> FastAPI:
+    """
+    Creates the FastAPI application.
+
+    Returns:
+        FastAPI: The application, ready to be served by uvicorn.
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Checkpoint and cache I/O and tools without an async client run on the
+        # event loop's default executor; model calls are awaited on the loop itself
+        executor = ThreadPoolExecutor(max_workers=int(os.getenv("API_THREADS", "64")), thread_name_prefix="graph")
+        asyncio.get_running_loop().set_default_executor(executor)
+        yield
+        executor.shutdown(wait=False)
+
+    app = FastAPI(title="Multi-Tool Agentic ChatBot API", lifespan=lifespan)
+
+    async def resolve(usecase_name: str, request: ChatRequest):
+        """Returns the use case, its graph, its run config and the thread id of a request."""
+        usecase = USECASES.get(usecase_name)
+        if usecase is None:
+            raise HTTPException(404, f"Unknown use case: '{usecase_name}'. Must be one of: {', '.join(USECASES)}")
+        if usecase == "AI News":
+            _news_frequency(request.message)
+        # Building a graph for a new configuration blocks, so it runs off the event loop
+        graph = await asyncio.to_thread(_get_graph, _ui_settings(usecase, request, get_settings()))
+        thread_id = request.thread_id or uuid.uuid4().hex
+        run_config = {"configurable": {"thread_id": f"{thread_id}:{usecase}"}}
+        return usecase, graph, run_config, thread_id
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        return {"status": "ok", "usecases": list(USECASES)}
+
+    @app.get("/v1/providers")
+    async def providers() -> Dict[str, Any]:
+        """Provider health: rate-limit queues and wait times, and routing latency and circuit state."""
+        return {"rate_limits": get_rate_limiters().stats(), "routing": get_provider_router().snapshot()}
+
+    @app.get("/v1/models")
+    async def models() -> Dict[str, Any]:
+        """The model catalog of every provider, with each model's context window and tier."""
+        settings = get_settings()
+        return {
+            provider: [settings.model_info(provider, model)._asdict() for model in models]
+            for provider, models in settings.catalogs.items()
+        }
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        """Graph node, model and tool histograms in the Prometheus text format."""
+        return PlainTextResponse(
+            get_graph_metrics().registry.render_prometheus(), media_type="text/plain; version=0.0.4"
+        )
+
+    @app.get("/v1/metrics")
+    async def metrics_json() -> Dict[str, Any]:
+        """Graph node, model and tool histograms with estimated percentiles."""
+        return get_graph_metrics().registry.to_dict()
+
+    @app.post("/v1/{usecase_name}/invoke")
+    async def invoke(usecase_name: str, request: ChatRequest) -> Dict[str, Any]:
+        usecase, graph, run_config, thread_id = await resolve(usecase_name, request)
+        try:
+            if usecase == "AI News":
+                return {"thread_id": thread_id, **await _news_report(graph, _news_frequency(request.message))}
+            result = {}
+            async for event, data in _chat_events(graph, request.message, run_config):
+                if event == "tool_call":
+                    result.setdefault("tool_calls", []).append(data)
+                elif event == "end":
+                    result.update(data)
+            return {"thread_id": thread_id, **result}
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(500, f"The {usecase} graph failed: {e}") from e
+
+    @app.post("/v1/{usecase_name}/stream")
+    async def stream(usecase_name: str, request: ChatRequest) -> EventSourceResponse:
+        usecase, graph, run_config, thread_id = await resolve(usecase_name, request)
+
+        async def events():
+            yield {"event": "metadata", "data": json.dumps({"thread_id": thread_id, "usecase": usecase})}
+            try:
+                if usecase == "AI News":
+                    report = await _news_report(graph, _news_frequency(request.message))
+                    yield {"event": "report", "data": json.dumps(report)}
+                    yield {"event": "end", "data": json.dumps({"content": report["summary"]})}
+                    return
+                async for event, data in _chat_events(graph, request.message, run_config):
+                    yield {"event": event, "data": json.dumps(data, default=str)}
+            except Exception as e:
+                yield {"event": "error", "data": json.dumps({"detail": f"The {usecase} graph failed: {e}"})}
+
+        return EventSourceResponse(events())
+
+    return app
+
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the chatbot graphs over HTTP.")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"), help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")), help="Port to bind.")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "1")),
+                        help="Worker processes; each serves many concurrent requests.")
+    parser.add_argument("--app", default="src.langgraph.api.server:app", help="The ASGI application to serve.")
+    args = parser.parse_args()
+
+    # Every worker has its own news scheduler; only on-demand refreshes are kept
+    # with several workers, so they do not all regenerate the same reports
+    if args.workers > 1:
+        os.environ.setdefault("AI_NEWS_SCHEDULER_ENABLED", "false")
+
+    import uvicorn
+
+    uvicorn.run(args.app, host=args.host, port=args.port, workers=args.workers, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
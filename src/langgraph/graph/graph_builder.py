@@ -1,17 +1,22 @@
 # --- Standard Library Imports ---
-from typing import Optional
+import os
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
 
 # --- Third-Party Imports ---
 from langchain_core.language_models import BaseLanguageModel
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import BaseTool
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, START, END
-from langgraph.prebuilt import tools_condition
 
 # --- Local Application Imports ---
 from src.langgraph.state.state import State
-from src.langgraph.nodes.basic_chatbot import BasicChatBotNode
-from src.langgraph.nodes.tools_chatbot import ChatBotwithToolsNode
-from src.langgraph.nodes.ai_news import AINewsNode
-from src.langgraph.tools.tools import get_tools, create_tools_node
+
+# Nodes and tools are imported by the use case that needs them (see `GraphBuilder`)
+if TYPE_CHECKING:
+    from src.langgraph.llms.semantic_cache import SemanticCache
+    from src.langgraph.nodes.article_store import ArticleStore
+    from src.langgraph.nodes.news_archive import NewsArchive
 
 
 class GraphBuilder:
@@ -22,19 +27,83 @@ class GraphBuilder:
     1. A simple conversational agent.
     2. An agent augmented with external tools.
     3. A sequential pipeline for fetching and summarizing AI news.
+
+    Every node has a synchronous and an async implementation, so the graphs run
+    under `invoke`/`stream` (Streamlit) as well as `ainvoke`/`astream` (the HTTP
+    API), where a conversation waiting on the provider holds no thread.
+
+    Only the use case being built imports and creates its nodes, tools and clients
+    (the AI News graph's Tavily client, for instance), so a chatbot session never
+    pays for the others.
     """
 
-    def __init__(self, model: BaseLanguageModel):
+    def __init__(
+        self,
+        model: BaseLanguageModel,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        history_token_budget: Optional[int] = None,
+        response_cache: Optional["SemanticCache"] = None,
+        cache_namespace: str = "",
+        article_store: Optional["ArticleStore"] = None,
+        news_archive: Optional["NewsArchive"] = None,
+        tools: Optional[Sequence[BaseTool]] = None,
+        news_search: Optional[BaseTool] = None,
+    ):
         """
-        Initializes the GraphBuilder with a language model and node handlers.
+        Initializes the GraphBuilder with a language model and the nodes' settings.
+
+        The nodes themselves are created by `setup_graph`, only for the use case built.
 
         Args:
             model (BaseLanguageModel): The language model instance to be used by the nodes.
+            checkpointer (Optional[BaseCheckpointSaver]): Persists the conversation state of
+                the chatbot graphs per `thread_id`, so each turn continues the earlier ones.
+            history_token_budget (Optional[int]): Maximum tokens of conversation history the
+                chatbot nodes send to the model; if None, the history is not trimmed.
+            response_cache (Optional[SemanticCache]): Serves the Basic ChatBot's answers to
+                near-duplicate prompts; if None, every prompt goes to the model.
+            cache_namespace (str): Keeps cached answers apart per provider and model.
+            article_store (Optional[ArticleStore]): Lets AI News reports reuse the summaries
+                of articles already summarized by earlier runs.
+            news_archive (Optional[NewsArchive]): Archives every AI News report for search.
+            tools (Optional[Sequence[BaseTool]]): The tools of the ChatBot with Tools graph;
+                defaults to every available tool (see `get_tools`).
+            news_search (Optional[BaseTool]): The AI News search tool; defaults to Tavily.
         """
         self.llm = model
-        self.basic_chatbot_node = BasicChatBotNode(self.llm)
-        self.chatbot_with_tools_node = ChatBotwithToolsNode(self.llm)
-        self.ai_news_node = AINewsNode(self.llm)
+        self.checkpointer = checkpointer
+        self.history_token_budget = history_token_budget
+        self.response_cache = response_cache
+        self.cache_namespace = cache_namespace
+        self.article_store = article_store
+        self.news_archive = news_archive
+        self.tools = list(tools) if tools is not None else None
+        self.news_search = news_search
+
+    def _trimmer(self):
+        """Returns the history trimmer of the chatbot nodes, or None if the history is not trimmed."""
+        from src.langgraph.nodes.message_trimmer import MessageTrimmer
+
+        return MessageTrimmer(self.history_token_budget) if self.history_token_budget else None
+
+    @staticmethod
+    def get_tool_names(usecase: str) -> Tuple[str, ...]:
+        """
+        Returns the names of the tools a use case's graph binds to the model.
+
+        The names are resolved without building any tool.
+
+        Args:
+            usecase (str): The use case the graph is built for.
+
+        Returns:
+            Tuple[str, ...]: The tool names, or an empty tuple for tool-less graphs.
+        """
+        if usecase == "ChatBot with Tools":
+            from src.langgraph.tools.tools import get_tool_names
+
+            return tuple(get_tool_names())
+        return ()
 
     def _build_basic_chatbot_graph(self):
         """
@@ -43,11 +112,16 @@ class GraphBuilder:
         ## Graph Flow
         `START` → `ChatBot` → `END`
         """
+        from src.langgraph.nodes.basic_chatbot import BasicChatBotNode
+
+        node = BasicChatBotNode(
+            self.llm, trimmer=self._trimmer(), cache=self.response_cache, cache_namespace=self.cache_namespace
+        )
         graph_builder = StateGraph(State)
-        graph_builder.add_node("ChatBot", self.basic_chatbot_node.process)
+        graph_builder.add_node("ChatBot", RunnableLambda(node.process, afunc=node.aprocess))
         graph_builder.add_edge(START, "ChatBot")
         graph_builder.add_edge("ChatBot", END)
-        return graph_builder.compile()
+        return graph_builder.compile(checkpointer=self.checkpointer)
 
     def _build_chatbot_with_tools_graph(self):
         """
@@ -55,20 +129,31 @@ class GraphBuilder:
 
         ## Graph Flow
         `START` → `ChatBot` → (conditional) ↴
-                  ↑└ `tools` ←┘
+                  ↑└ `CompactToolOutput` ← `tools` ←┘
+
+        Tool outputs are compacted to the parts most relevant to the user's question
+        before they are sent back to the model.
         """
-        graph_builder = StateGraph(State)
-        tools = get_tools()
-        tool_node = create_tools_node(tools)
+        from langgraph.prebuilt import tools_condition
+        from src.langgraph.nodes.tool_output_compactor import ToolOutputCompactorNode
+        from src.langgraph.nodes.tools_chatbot import ChatBotwithToolsNode
+        from src.langgraph.tools.tools import create_tools_node, get_tools
 
+        tools = self.tools if self.tools is not None else get_tools()
+        chatbot_node = ChatBotwithToolsNode(self.llm, trimmer=self._trimmer())
+        compactor_node = ToolOutputCompactorNode(token_budget=int(os.getenv("TOOL_OUTPUT_TOKEN_BUDGET", "3000")))
+
+        graph_builder = StateGraph(State)
         # The 'ChatBot' node can either respond directly or call a tool
-        graph_builder.add_node("ChatBot", self.chatbot_with_tools_node.process(tools))
-        graph_builder.add_node("tools", tool_node)
+        graph_builder.add_node("ChatBot", chatbot_node.process(tools))
+        graph_builder.add_node("tools", create_tools_node(tools))
+        graph_builder.add_node("CompactToolOutput", compactor_node.process)
 
         graph_builder.add_edge(START, "ChatBot")
         graph_builder.add_conditional_edges("ChatBot", tools_condition)
-        graph_builder.add_edge("tools", "ChatBot")
-        return graph_builder.compile()
+        graph_builder.add_edge("tools", "CompactToolOutput")
+        graph_builder.add_edge("CompactToolOutput", "ChatBot")
+        return graph_builder.compile(checkpointer=self.checkpointer)
 
     def _build_ai_news_graph(self):
         """
@@ -76,11 +161,18 @@ class GraphBuilder:
 
         ## Graph Flow
         `START` → `FetchNews` → `Summarize` → `SaveResult` → `END`
+
+        Each report is independent, so this graph is not checkpointed.
         """
+        from src.langgraph.nodes.ai_news import AINewsNode
+
+        news = AINewsNode(
+            self.llm, search=self.news_search, article_store=self.article_store, news_archive=self.news_archive
+        )
         graph_builder = StateGraph(State)
-        graph_builder.add_node("FetchNews", self.ai_news_node.fetch_news)
-        graph_builder.add_node("Summarize", self.ai_news_node.summarize_news)
-        graph_builder.add_node("SaveResult", self.ai_news_node.save_result)
+        graph_builder.add_node("FetchNews", RunnableLambda(news.fetch_news, afunc=news.afetch_news))
+        graph_builder.add_node("Summarize", RunnableLambda(news.summarize_news, afunc=news.asummarize_news))
+        graph_builder.add_node("SaveResult", RunnableLambda(news.save_result, afunc=news.asave_result))
 
         graph_builder.add_edge(START, "FetchNews")
         graph_builder.add_edge("FetchNews", "Summarize")
@@ -0,0 +1,215 @@
+"""
+A process-wide registry of compiled LangGraph workflows.
+
+Building a graph means creating the LLM client, the node objects, binding the
+tools and compiling the `StateGraph`. None of that depends on the message being
+processed, so the compiled graph is built once per configuration and reused by
+every later request, Streamlit rerun and session in the same process.
+"""
+# --- Standard Library Imports ---
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+# --- Local Application Imports ---
+from src.langgraph.llms.client_pool import ClientKey, get_client_pool
+
+
+class GraphKey(NamedTuple):
+    """
+    Identifies one compiled graph configuration.
+
+    Attributes:
+        provider: The LLM provider name as shown in the UI (e.g., "Groq").
+        model: The selected model name for that provider.
+        usecase: The selected use case (e.g., "ChatBot with Tools").
+        tool_set: The names of the tools bound to the graph, if any.
+        api_key_hash: A fingerprint of the API key, so graphs holding a client
+                      for one key are never served to a session using another.
+        history_token_budget: The tokens of history the chatbot node keeps, if trimmed.
+        fallback_model: The configured fallback model ("Provider:model"), if any.
+    """
+    provider: str
+    model: str
+    usecase: str
+    tool_set: Tuple[str, ...] = ()
+    api_key_hash: str = ""
+    history_token_budget: Optional[int] = None
+    fallback_model: str = ""
+
+
+class GraphRegistry:
+    """
+    A thread-safe LRU cache of compiled graphs keyed by `GraphKey`.
+
+    Concurrent requests for the same missing key build the graph only once; the
+    other callers wait for that build and then share its result.
+    """
+
+    def __init__(self, max_size: int = 32):
+        """
+        Initializes an empty registry.
+
+        Args:
+            max_size (int): The maximum number of compiled graphs to keep. The least
+                            recently used graph is evicted once this is exceeded.
+        """
+        if max_size < 1:
+            raise ValueError("GraphRegistry max_size must be at least 1.")
+        self.max_size = max_size
+        self._graphs: "OrderedDict[GraphKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[GraphKey, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: GraphKey) -> Optional[Any]:
+        """
+        Returns the compiled graph for a key, or None if it is not registered.
+
+        Args:
+            key (GraphKey): The graph configuration to look up.
+
+        Returns:
+            Optional[CompiledGraph]: The cached graph, marked as most recently used.
+        """
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is None:
+                self.misses += 1
+                return None
+            self._graphs.move_to_end(key)
+            self.hits += 1
+            return graph
+
+    def put(self, key: GraphKey, graph: Any) -> None:
+        """
+        Registers a compiled graph, evicting the least recently used one if full.
+
+        Args:
+            key (GraphKey): The graph configuration.
+            graph (CompiledGraph): The compiled graph to store.
+        """
+        with self._lock:
+            self._graphs[key] = graph
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_build(self, key: GraphKey, builder: Callable[[], Any]) -> Optional[Any]:
+        """
+        Returns the cached graph for a key, building and registering it on a miss.
+
+        Args:
+            key (GraphKey): The graph configuration.
+            builder (Callable[[], CompiledGraph]): Builds the graph when it is not cached.
+                A `None` result is returned to the caller but never cached.
+
+        Returns:
+            Optional[CompiledGraph]: The cached or freshly built graph.
+        """
+        graph = self.get(key)
+        if graph is not None:
+            return graph
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            # Another thread may have finished building while we waited
+            with self._lock:
+                graph = self._graphs.get(key)
+            if graph is None:
+                graph = builder()
+                if graph is not None:
+                    self.put(key, graph)
+
+        with self._lock:
+            self._build_locks.pop(key, None)
+        return graph
+
+    def invalidate(
+        self,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        usecase: Optional[str] = None,
+        api_key_hash: Optional[str] = None,
+    ) -> int:
+        """
+        Removes every registered graph matching all of the given fields.
+
+        Calling this without arguments clears the whole registry.
+
+        Args:
+            provider (Optional[str]): Only remove graphs for this provider.
+            model (Optional[str]): Only remove graphs for this model.
+            usecase (Optional[str]): Only remove graphs for this use case.
+            api_key_hash (Optional[str]): Only remove graphs for this API key fingerprint.
+
+        Returns:
+            int: The number of graphs removed.
+        """
+        with self._lock:
+            stale = [
+                key for key in self._graphs
+                if (provider is None or key.provider == provider)
+                and (model is None or key.model == model)
+                and (usecase is None or key.usecase == usecase)
+                and (api_key_hash is None or key.api_key_hash == api_key_hash)
+            ]
+            for key in stale:
+                del self._graphs[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        """Removes every registered graph and resets the counters."""
+        with self._lock:
+            self._graphs.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the current size and hit/miss/eviction counters.
+
+        Returns:
+            Dict[str, int]: A snapshot of the registry counters.
+        """
+        with self._lock:
+            return {
+                "size": len(self._graphs),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# -----------------------------------------------------------------------------
+# Process-wide instance
+# -----------------------------------------------------------------------------
+graph_registry = GraphRegistry(max_size=int(os.getenv("GRAPH_REGISTRY_MAX_SIZE", "32")))
+
+
+def get_graph_registry() -> GraphRegistry:
+    """
+    Returns the registry shared by all Streamlit sessions in this process.
+
+    Returns:
+        GraphRegistry: The process-wide graph registry.
+    """
+    return graph_registry
+
+
+def _invalidate_graphs_for_client(client_key: ClientKey) -> None:
+    """Drops graphs holding an LLM client that the client pool has just released."""
+    graph_registry.invalidate(
+        provider=client_key.provider,
+        model=client_key.model,
+        api_key_hash=client_key.api_key_hash,
+    )
+
+
+get_client_pool().add_close_listener(_invalidate_graphs_for_client)
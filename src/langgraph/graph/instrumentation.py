@@ -0,0 +1,421 @@
+"""
+Latency and token instrumentation of the chatbot graphs.
+
+`instrument` attaches a LangChain callback handler to a compiled graph, together
+with the use case, provider and model as run metadata. Every run of the graph
+then records into process-wide histograms:
+
+- the wall time of each graph node,
+- each chat model call's time to first token (streamed calls only), total
+  latency and input/output tokens,
+- each tool call's latency and output size.
+
+The histograms are exported in the Prometheus text format (`render_prometheus`)
+and as JSON with estimated percentiles (`to_dict`). Metrics are kept per
+process: with several API workers, each reports its own.
+"""
+# --- Standard Library Imports ---
+import bisect
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import UUID
+
+# --- Third-Party Imports ---
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """
+    A Prometheus-style histogram with fixed buckets and one series per label set.
+
+    Each series keeps a count per bucket (not cumulative; cumulated on export),
+    the total count and the sum of the observed values.
+    """
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], labelnames: Sequence[str]):
+        """
+        Initializes an empty histogram.
+
+        Args:
+            name (str): The metric name.
+            help_text (str): The one-line description exported as HELP.
+            buckets (Sequence[float]): Ascending upper bounds; +Inf is implied.
+            labelnames (Sequence[str]): The label names every observation must give.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Records one value.
+
+        Args:
+            value (float): The observed value.
+            **labels: A value for every label name; missing ones are recorded as "".
+        """
+        key = tuple(str(labels.get(name) or "") for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Bucket counts (the last one is +Inf), then count and sum
+                series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def series(self) -> List[Tuple[Dict[str, str], List[float], int, float]]:
+        """Returns every series as (labels, per-bucket counts, count, sum)."""
+        with self._lock:
+            items = [(key, list(values)) for key, values in self._series.items()]
+        return [
+            (dict(zip(self.labelnames, key)), values[:-2], int(values[-2]), values[-1])
+            for key, values in sorted(items)
+        ]
+
+    def quantile(self, q: float, counts: List[float]) -> Optional[float]:
+        """
+        Estimates a quantile from bucket counts, interpolating linearly inside the
+        bucket, as Prometheus' `histogram_quantile` does.
+        """
+        total = sum(counts)
+        if total == 0:
+            return None
+        rank, seen = q * total, 0.0
+        for index, count in enumerate(counts):
+            if seen + count >= rank and count > 0:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """A set of histograms that can be exported together."""
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(
+        self, name: str, help_text: str, buckets: Sequence[float], labelnames: Sequence[str]
+    ) -> Histogram:
+        """
+        Returns the histogram registered under `name`, creating it on first use.
+
+        Raises:
+            ValueError: If `name` is already registered with other labels.
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(name, help_text, buckets, labelnames)
+            elif histogram.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric '{name}' is already registered with labels {histogram.labelnames}.")
+            return histogram
+
+    def render_prometheus(self) -> str:
+        """
+        Renders every histogram in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            str: The `# HELP` / `# TYPE` lines and the `_bucket`, `_sum` and `_count`
+                 samples of every series.
+        """
+        with self._lock:
+            histograms = list(self._histograms.values())
+        lines: List[str] = []
+        for histogram in histograms:
+            lines.append(f"# HELP {histogram.name} {histogram.help_text}")
+            lines.append(f"# TYPE {histogram.name} histogram")
+            for labels, counts, count, total in histogram.series():
+                label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+                prefix = f"{label_text}," if label_text else ""
+                cumulative = 0.0
+                for bound, bucket_count in zip(histogram.buckets + (math.inf,), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{histogram.name}_bucket{{{prefix}le="{_format_value(bound)}"}} {int(cumulative)}')
+                lines.append(f"{histogram.name}_sum{{{label_text}}} {_format_value(total)}")
+                lines.append(f"{histogram.name}_count{{{label_text}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns every histogram as JSON-ready data.
+
+        Returns:
+            Dict[str, Any]: Per metric, its help text and series; each series holds its
+                            labels, count, sum, mean and estimated p50/p95/p99.
+        """
+        with self._lock:
+            histograms = list(self._histograms.values())
+        result: Dict[str, Any] = {}
+        for histogram in histograms:
+            series = []
+            for labels, counts, count, total in histogram.series():
+                series.append({
+                    "labels": labels,
+                    "count": count,
+                    "sum": total,
+                    "mean": total / count if count else None,
+                    "p50": histogram.quantile(0.50, counts),
+                    "p95": histogram.quantile(0.95, counts),
+                    "p99": histogram.quantile(0.99, counts),
+                })
+            result[histogram.name] = {"help": histogram.help_text, "series": series}
+        return result
+
+
+class _Run(NamedTuple):
+    """A callback run being timed: its start, labels and (for chat models) first token time."""
+    start: float
+    labels: Dict[str, str]
+    first_token: List[float]
+
+
+def _graph_labels(metadata: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Picks the use case, provider and model labels out of a run's metadata."""
+    metadata = metadata or {}
+    return {name: str(metadata.get(name) or "") for name in ("usecase", "provider", "model")}
+
+
+def _output_size(output: Any) -> int:
+    """Returns the size in bytes of a tool's output (the content of a ToolMessage)."""
+    content = getattr(output, "content", output)
+    return len((content if isinstance(content, str) else str(content)).encode("utf-8"))
+
+
+class GraphMetrics(BaseCallbackHandler):
+    """
+    A callback handler recording graph node, chat model and tool metrics.
+
+    One handler is shared by every graph and session; the labels of each run come
+    from the metadata `instrument` adds to the graph. The handler runs inline
+    (also under `ainvoke`/`astream`) since recording only takes a lock briefly.
+    """
+
+    run_inline = True
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        Initializes the handler and registers its histograms.
+
+        Args:
+            registry (Optional[MetricsRegistry]): Where to record; a new registry if None.
+        """
+        self.registry = registry or MetricsRegistry()
+        graph_labels = ("usecase", "provider", "model")
+        self.node_seconds = self.registry.histogram(
+            "chatbot_graph_node_seconds", "Wall time of each graph node run.",
+            SECONDS_BUCKETS, graph_labels + ("node", "status"),
+        )
+        self.llm_ttft_seconds = self.registry.histogram(
+            "chatbot_llm_time_to_first_token_seconds", "Time to the first token of streamed chat model calls.",
+            SECONDS_BUCKETS, graph_labels + ("node",),
+        )
+        self.llm_seconds = self.registry.histogram(
+            "chatbot_llm_request_seconds", "Total latency of chat model calls.",
+            SECONDS_BUCKETS, graph_labels + ("node", "status"),
+        )
+        self.llm_input_tokens = self.registry.histogram(
+            "chatbot_llm_input_tokens", "Prompt tokens of chat model calls, as reported by the provider.",
+            TOKEN_BUCKETS, graph_labels + ("node",),
+        )
+        self.llm_output_tokens = self.registry.histogram(
+            "chatbot_llm_output_tokens", "Completion tokens of chat model calls, as reported by the provider.",
+            TOKEN_BUCKETS, graph_labels + ("node",),
+        )
+        self.tool_seconds = self.registry.histogram(
+            "chatbot_tool_seconds", "Latency of tool calls.",
+            SECONDS_BUCKETS, ("usecase", "tool", "status"),
+        )
+        self.tool_output_bytes = self.registry.histogram(
+            "chatbot_tool_output_bytes", "Size of tool outputs in bytes.",
+            BYTE_BUCKETS, ("usecase", "tool"),
+        )
+        self._runs: Dict[UUID, _Run] = {}
+        self._lock = threading.Lock()
+
+    # ---- Run bookkeeping ---- #
+
+    def _start(self, run_id: UUID, labels: Dict[str, str]) -> None:
+        with self._lock:
+            self._runs[run_id] = _Run(time.perf_counter(), labels, [])
+
+    def _finish(self, run_id: UUID) -> Tuple[Optional[_Run], float]:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        return run, (time.perf_counter() - run.start if run else 0.0)
+
+    # ---- Graph nodes ---- #
+
+    def on_chain_start(
+        self,
+        serialized: Dict[str, Any],
+        inputs: Dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        # A node's own run is tagged with its graph step; runs nested inside a node
+        # only inherit the node's metadata
+        node = (metadata or {}).get("langgraph_node")
+        if node is None or node != kwargs.get("name") or not any(t.startswith("graph:step:") for t in tags or ()):
+            return
+        self._start(run_id, {**_graph_labels(metadata), "node": node})
+
+    def _end_node(self, run_id: UUID, status: str) -> None:
+        run, elapsed = self._finish(run_id)
+        if run:
+            self.node_seconds.observe(elapsed, status=status, **run.labels)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id, "ok")
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id, "error")
+
+    # ---- Chat models ---- #
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, {**_graph_labels(metadata), "node": str((metadata or {}).get("langgraph_node") or "")})
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None or run.first_token:
+                return
+            run.first_token.append(time.perf_counter() - run.start)
+        self.llm_ttft_seconds.observe(run.first_token[0], **run.labels)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        run, elapsed = self._finish(run_id)
+        if run is None:
+            return
+        labels = dict(run.labels)
+        message = getattr(response.generations[0][0], "message", None) if response.generations and response.generations[0] else None
+        route = (getattr(message, "response_metadata", None) or {}).get("router")
+        if route and ":" in route.get("model", ""):
+            # A routed call is labelled with the model that actually answered
+            labels["provider"], labels["model"] = route["model"].split(":", 1)
+        self.llm_seconds.observe(elapsed, status="ok", **labels)
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            usage = {"input_tokens": token_usage.get("prompt_tokens"), "output_tokens": token_usage.get("completion_tokens")}
+        if usage.get("input_tokens") is not None:
+            self.llm_input_tokens.observe(usage["input_tokens"], **labels)
+        if usage.get("output_tokens") is not None:
+            self.llm_output_tokens.observe(usage["output_tokens"], **labels)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        run, elapsed = self._finish(run_id)
+        if run:
+            self.llm_seconds.observe(elapsed, status="error", **run.labels)
+
+    # ---- Tools ---- #
+
+    def on_tool_start(
+        self,
+        serialized: Dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        tool = kwargs.get("name") or (serialized or {}).get("name") or ""
+        self._start(run_id, {"usecase": _graph_labels(metadata)["usecase"], "tool": tool})
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        run, elapsed = self._finish(run_id)
+        if run:
+            self.tool_seconds.observe(elapsed, status="ok", **run.labels)
+            self.tool_output_bytes.observe(_output_size(output), **run.labels)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        run, elapsed = self._finish(run_id)
+        if run:
+            self.tool_seconds.observe(elapsed, status="error", **run.labels)
+
+
+# ---- Process-wide instance ---- #
+_graph_metrics: Optional[GraphMetrics] = None
+_graph_metrics_lock = threading.Lock()
+
+
+def get_graph_metrics() -> GraphMetrics:
+    """
+    Returns the metrics handler shared by every graph and session in this process.
+
+    Returns:
+        GraphMetrics: The handler, recording into its own registry.
+    """
+    global _graph_metrics
+    with _graph_metrics_lock:
+        if _graph_metrics is None:
+            _graph_metrics = GraphMetrics()
+        return _graph_metrics
+
+
+def instrument(graph: Any, usecase: str, provider: str, model: str) -> Any:
+    """
+    Attaches the process-wide metrics handler and the metric labels to a compiled graph.
+
+    Instrumentation is on unless the `METRICS_ENABLED` environment variable is "false".
+
+    Args:
+        graph (CompiledGraph): The compiled graph.
+        usecase (str): The use case, as in the UI.
+        provider (str): The selected provider.
+        model (str): The selected model.
+
+    Returns:
+        CompiledGraph: A copy of the graph recording its runs (or the graph itself if
+                       instrumentation is off or the graph is None).
+    """
+    if graph is None or os.getenv("METRICS_ENABLED", "true").lower() == "false":
+        return graph
+    return graph.with_config(
+        callbacks=[get_graph_metrics()],
+        metadata={"usecase": usecase, "provider": provider, "model": model},
+    )
@@ -0,0 +1,311 @@
+"""
+Background precomputation of AI News reports.
+
+Generating a report (search, summarize, save) takes tens of seconds, so the UI
+does not wait for it on every click. The UI serves the latest saved report
+immediately, asking for a background refresh with the requesting session's graph
+when it is older than its frequency's refresh interval (stale-while-revalidate).
+Only a frequency that was never generated is waited for.
+
+If the operator configures `NEWS_REFRESH_MODEL` (see the UI config file), the
+scheduler also keeps every frequency's report fresh on its own cadence, running
+the AI News graph on that model and the operator's API key in a background
+thread. Without it, nothing runs unless a user asks for a report: background
+refreshes never spend a user's API key on reports nobody asked for.
+"""
+# --- Standard Library Imports ---
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# --- Third-Party Imports ---
+from langchain_core.messages import HumanMessage
+
+# --- Local Application Imports ---
+from src.langgraph.nodes.news_reports import REPORTS_DIR, NewsReport, read_report
+from src.langgraph.ui.uiconfigfile import get_settings
+
+# Seconds after which a report is refreshed (override with AI_NEWS_REFRESH_MINUTES,
+# e.g. "daily=30;weekly=180"). Only the frequencies listed there are precomputed.
+DEFAULT_REFRESH_INTERVALS = {
+    "daily": 60 * 60,
+    "weekly": 6 * 60 * 60,
+    "monthly": 24 * 60 * 60,
+    "yearly": 7 * 24 * 60 * 60,
+}
+
+
+class NewsReportScheduler:
+    """
+    Refreshes AI News reports in the background and serves the saved ones.
+
+    Refreshes run on a small thread pool. A frequency is only refreshed by one run
+    at a time: asking for a refresh while one is in flight returns that run.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = REPORTS_DIR,
+        refresh_intervals: Optional[Mapping[str, float]] = None,
+        check_interval: float = 60.0,
+        retry_after: float = 5 * 60.0,
+        max_workers: int = 2,
+        background: bool = True,
+        graph_factory: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Initializes the scheduler. Nothing runs in the background until a graph is
+        attached or a `graph_factory` is given.
+
+        Args:
+            output_dir (str): The reports directory the AI News graph saves to.
+            refresh_intervals (Optional[Mapping[str, float]]): Seconds after which each
+                frequency's report is stale; defaults to `DEFAULT_REFRESH_INTERVALS`.
+            check_interval (float): Seconds between two checks of the background loop.
+            retry_after (float): Seconds the background loop waits before retrying a
+                frequency whose last refresh failed.
+            max_workers (int): Maximum number of reports generated at once.
+            background (bool): Whether `start` runs the periodic refresh loop. When
+                False, reports are only refreshed when the UI finds them stale.
+            graph_factory (Optional[Callable[[], Any]]): Builds the AI News graph the
+                periodic refreshes run, on the operator's model and API key. Called
+                once, by the refresh loop.
+        """
+        self.output_dir = output_dir
+        self.refresh_intervals: Dict[str, float] = dict(refresh_intervals or DEFAULT_REFRESH_INTERVALS)
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self.background = background
+        self._graph: Any = None
+        self._graph_factory = graph_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-news-refresh")
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._failed_at: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def attach(self, graph: Any) -> None:
+        """
+        Sets the compiled AI News graph used by the periodic refreshes.
+
+        The graph should run on the operator's model and API key, not a user's:
+        the periodic refreshes are not tied to anyone's request.
+
+        Args:
+            graph (CompiledGraph): The AI News graph.
+        """
+        self._graph = graph
+
+    def _background_graph(self) -> Any:
+        """Returns the graph of the periodic refreshes, building it on first use."""
+        if self._graph is None and self._graph_factory is not None:
+            factory, self._graph_factory = self._graph_factory, None
+            try:
+                self._graph = factory()
+            except Exception as e:
+                print(f"Warning: AI News background refreshes are disabled, the graph could not be built: {e}")
+        return self._graph
+
+    @property
+    def frequencies(self) -> Tuple[str, ...]:
+        """The report time frames the scheduler serves (e.g., "daily")."""
+        return tuple(dict.fromkeys([*self.refresh_intervals, *DEFAULT_REFRESH_INTERVALS]))
+
+    def get_report(self, frequency: str) -> Optional[NewsReport]:
+        """Returns the latest saved report of a frequency, or None if there is none."""
+        return read_report(frequency, self.output_dir)
+
+    def is_stale(self, report: NewsReport) -> bool:
+        """Returns whether a report is older than its frequency's refresh interval."""
+        interval = self.refresh_intervals.get(report.frequency, DEFAULT_REFRESH_INTERVALS.get(report.frequency))
+        return interval is not None and report.age() > interval
+
+    def is_refreshing(self, frequency: str) -> bool:
+        """Returns whether a refresh of the frequency is in flight."""
+        with self._lock:
+            return frequency in self._in_flight
+
+    def refresh(self, frequency: str, graph: Any = None) -> Optional[Future]:
+        """
+        Starts a background refresh of a frequency's report, unless one is in flight.
+
+        Args:
+            frequency (str): The report's time frame (e.g., "daily").
+            graph (CompiledGraph): The graph to run (e.g., that of the session asking
+                for the report); defaults to the attached one.
+
+        Returns:
+            Optional[Future]: Resolves to the new `NewsReport` (or raises the run's error),
+                              or None if no graph is available.
+        """
+        graph = graph or self._graph
+        with self._lock:
+            future = self._in_flight.get(frequency)
+            if future is not None:
+                return future
+            if graph is None:
+                return None
+            future = self._executor.submit(self._generate, graph, frequency)
+            self._in_flight[frequency] = future
+        future.add_done_callback(lambda f: self._on_done(frequency, f))
+        return future
+
+    def _generate(self, graph: Any, frequency: str) -> NewsReport:
+        """Runs the AI News graph for a frequency and returns the report it saved."""
+        graph.invoke({"messages": [HumanMessage(content=frequency)]})
+        report = read_report(frequency, self.output_dir)
+        if report is None:
+            raise ValueError(f"The AI News graph did not save a {frequency} report.")
+        return report
+
+    def _on_done(self, frequency: str, future: Future) -> None:
+        """Clears a finished refresh and records its outcome."""
+        with self._lock:
+            self._in_flight.pop(frequency, None)
+            if future.exception() is None:
+                self.refreshes += 1
+                self._failed_at.pop(frequency, None)
+                return
+            self.failures += 1
+            self._failed_at[frequency] = time.monotonic()
+        print(f"Warning: refreshing the {frequency} AI News report failed: {future.exception()}")
+
+    def start(self) -> None:
+        """
+        Starts the periodic refresh loop in a daemon thread, if enabled, not running,
+        and a graph is attached or can be built.
+        """
+        with self._lock:
+            if not self.background or (self._thread and self._thread.is_alive()):
+                return
+            if self._graph is None and self._graph_factory is None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ai-news-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = False) -> None:
+        """
+        Stops the periodic refresh loop.
+
+        Args:
+            wait (bool): Whether to wait for refreshes in flight to finish.
+        """
+        self._stop.set()
+        if wait:
+            with self._lock:
+                futures = list(self._in_flight.values())
+            for future in futures:
+                future.exception()
+
+    def _run(self) -> None:
+        """Refreshes every stale or missing report, then sleeps until the next check."""
+        while not self._stop.is_set():
+            if self._background_graph() is not None:
+                for frequency in self.refresh_intervals:
+                    failed_at = self._failed_at.get(frequency)
+                    if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+                        continue
+                    report = self.get_report(frequency)
+                    if report is None or self.is_stale(report):
+                        self.refresh(frequency)
+            self._stop.wait(self.check_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the age and version of each report and the refresh counters.
+
+        Returns:
+            Dict[str, Any]: A snapshot of the scheduler state.
+        """
+        reports = {}
+        for frequency in self.refresh_intervals:
+            report = self.get_report(frequency)
+            reports[frequency] = (
+                {"version": report.version, "age_s": round(report.age(), 1), "stale": self.is_stale(report)}
+                if report else None
+            )
+        with self._lock:
+            return {
+                "reports": reports,
+                "in_flight": sorted(self._in_flight),
+                "refreshes": self.refreshes,
+                "failures": self.failures,
+            }
+
+
+def _build_refresh_graph(provider: str, model: str) -> Any:
+    """
+    Builds the AI News graph of the periodic refreshes on the operator's model.
+
+    Raises:
+        ValueError: If the provider's API key is not in the environment, or the
+                    model cannot be initialized.
+    """
+    from src.langgraph.main import build_graph, create_llm
+
+    key_name = f"{provider.upper()}_API_KEY"
+    if not os.getenv(key_name):
+        raise ValueError(f"NEWS_REFRESH_MODEL is {provider}:{model}, but {key_name} is not set.")
+    ui_settings = {
+        "selected_llm": provider,
+        f"selected_{provider.lower()}_model": model,
+        key_name: os.environ[key_name],
+        "selected_use_case": "AI News",
+    }
+    llm = create_llm(ui_settings)
+    if llm is None:
+        raise ValueError(f"Could not initialize {provider}:{model}.")
+    graph = build_graph(llm, ui_settings)
+    if graph is None:
+        raise ValueError(f"Could not build the AI News graph on {provider}:{model}.")
+    return graph
+
+
+def _parse_intervals(value: str) -> Dict[str, float]:
+    """Parses "daily=30;weekly=180" (minutes) into refresh intervals in seconds."""
+    intervals = {}
+    for item in value.split(";"):
+        if not item.strip():
+            continue
+        frequency, _, minutes = item.partition("=")
+        try:
+            intervals[frequency.strip().lower()] = float(minutes) * 60
+        except ValueError:
+            print(f"Warning: ignoring invalid AI News refresh interval '{item.strip()}'")
+    return intervals
+
+
+# ---- Process-wide instance ---- #
+_news_scheduler: Optional[NewsReportScheduler] = None
+_news_scheduler_lock = threading.Lock()
+
+
+def get_news_scheduler() -> NewsReportScheduler:
+    """
+    Returns the AI News report scheduler shared by every session in this process.
+
+    The periodic refresh loop runs on `NEWS_REFRESH_MODEL` from the UI config file,
+    and not at all if that is empty. It can also be turned off with
+    `AI_NEWS_SCHEDULER_ENABLED=false`. Either way, stale reports are still refreshed
+    when a user asks for them.
+
+    Returns:
+        NewsReportScheduler: The process-wide scheduler.
+    """
+    global _news_scheduler
+    with _news_scheduler_lock:
+        if _news_scheduler is None:
+            refresh_model = get_settings().news_refresh_model
+            _news_scheduler = NewsReportScheduler(
+                refresh_intervals=_parse_intervals(os.getenv("AI_NEWS_REFRESH_MINUTES", "")) or None,
+                background=os.getenv("AI_NEWS_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes"),
+                graph_factory=partial(_build_refresh_graph, *refresh_model) if refresh_model else None,
+            )
+        return _news_scheduler
@@ -0,0 +1,397 @@
+"""
+A process-wide pool of LLM clients shared across Streamlit reruns and sessions.
+
+Every chat model created through the pool owns an instrumented HTTP client with
+keep-alive enabled, so consecutive requests to a provider reuse the same TLS
+connection instead of paying a new handshake per message. Clients are keyed by
+(provider, model, hashed API key), capped in number, and released once idle.
+
+A released client leaves the pool, but its HTTP resources are only closed once
+nothing references its chat model any more: cached graphs, the fallback model
+of a routed model or the news scheduler may keep using it in the meantime.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# --- Third-Party Imports ---
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def hash_api_key(api_key: Optional[str]) -> str:
+    """
+    Returns a short, non-reversible fingerprint of an API key.
+
+    Args:
+        api_key (Optional[str]): The raw API key, or None/empty if not provided.
+
+    Returns:
+        str: A hex digest of the key, or an empty string when no key is given.
+    """
+    if not api_key:
+        return ""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class ClientKey(NamedTuple):
+    """Identifies one pooled client by provider, model and API key fingerprint."""
+    provider: str
+    model: str
+    api_key_hash: str
+
+
+class PooledClient:
+    """
+    A pooled chat model together with the HTTP resources it owns.
+
+    The request/connection counters are updated by hooks installed on the HTTP
+    clients, so `last_used` reflects real traffic even when callers hold on to the
+    model (e.g., inside a cached graph) instead of acquiring it again.
+    """
+
+    def __init__(self, key: ClientKey):
+        self.key = key
+        self.llm: Any = None
+        self.closables: List[Any] = []
+        self.sessions: List[requests.Session] = []
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.requests = 0
+        self.new_connections = 0
+        # The event loop the async client last sent a request on; its connections belong to it
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def touch(self) -> None:
+        """Marks the client as used now."""
+        self.last_used = time.monotonic()
+
+    def connection_counts(self) -> Tuple[int, int]:
+        """
+        Returns the total (requests, new connections) made through this client.
+
+        Returns:
+            Tuple[int, int]: Counts from the httpx hooks plus any urllib3 pools.
+        """
+        total_requests, total_connections = self.requests, self.new_connections
+        for session in self.sessions:
+            for adapter in session.adapters.values():
+                pools = adapter.poolmanager.pools
+                for pool_key in pools.keys():
+                    pool = pools.get(pool_key)
+                    if pool is not None:
+                        total_requests += pool.num_requests
+                        total_connections += pool.num_connections
+        return total_requests, total_connections
+
+    def close(self) -> None:
+        """Closes every HTTP client and session owned by this entry, ignoring errors."""
+        for resource in self.closables + self.sessions:
+            try:
+                if isinstance(resource, httpx.AsyncClient):
+                    self._aclose(resource)
+                else:
+                    resource.close()
+            except Exception as e:
+                print(f"Warning: failed to close pooled client for {self.key}: {e}")
+
+    def _aclose(self, client: httpx.AsyncClient) -> None:
+        """
+        Closes an async client on the event loop that owns its connections.
+
+        If that loop is not running (or the client was never used), there is no loop
+        to close the connections on; they are dropped with the client instead.
+        """
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    def release(self) -> None:
+        """Closes the HTTP resources as soon as nothing references the chat model any more."""
+        llm, self.llm = self.llm, None
+        if llm is None:
+            self.close()
+        else:
+            weakref.finalize(llm, self.close)
+
+
+class ClientPool:
+    """
+    A thread-safe, capped pool of LLM clients with idle expiry.
+
+    Providers call `acquire` with a factory; the factory receives the `PooledClient`
+    entry and uses `create_httpx_clients` / `create_requests_session` so the pool
+    can instrument and later close the underlying connections.
+    """
+
+    def __init__(
+        self,
+        max_clients: int = 16,
+        idle_timeout: float = 600.0,
+        sweep_interval: float = 60.0,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 120.0,
+    ):
+        """
+        Initializes an empty pool.
+
+        Args:
+            max_clients (int): The maximum number of pooled clients. The client with the
+                               least recent traffic is released once this is exceeded.
+            idle_timeout (float): Seconds without traffic after which a client is released.
+            sweep_interval (float): Seconds between background idle sweeps.
+            max_keepalive_connections (int): Keep-alive connections held per client.
+            keepalive_expiry (float): Seconds an unused keep-alive connection stays open.
+        """
+        if max_clients < 1:
+            raise ValueError("ClientPool max_clients must be at least 1.")
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+
+        self._clients: Dict[ClientKey, PooledClient] = {}
+        self._lock = threading.RLock()
+        self._close_listeners: List[Callable[[ClientKey], None]] = []
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.idle_closed = 0
+        # Traffic of clients that have already been closed
+        self._closed_requests = 0
+        self._closed_connections = 0
+
+    # ---- HTTP resources ---- #
+    def create_httpx_clients(self, entry: PooledClient) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """
+        Creates a keep-alive (sync, async) httpx client pair owned by a pool entry.
+
+        Args:
+            entry (PooledClient): The entry whose counters the hooks should update.
+
+        Returns:
+            Tuple[httpx.Client, httpx.AsyncClient]: The instrumented clients.
+        """
+        limits = httpx.Limits(
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                entry.new_connections += 1
+
+        def on_request(request: httpx.Request) -> None:
+            entry.requests += 1
+            entry.touch()
+            request.extensions["trace"] = trace
+
+        async def atrace(event_name: str, info: Dict[str, Any]) -> None:
+            trace(event_name, info)
+
+        async def aon_request(request: httpx.Request) -> None:
+            entry.loop = asyncio.get_running_loop()
+            on_request(request)
+            request.extensions["trace"] = atrace
+
+        http_client = httpx.Client(limits=limits, event_hooks={"request": [on_request]})
+        http_async_client = httpx.AsyncClient(limits=limits, event_hooks={"request": [aon_request]})
+        entry.closables.extend([http_client, http_async_client])
+        return http_client, http_async_client
+
+    def create_requests_session(self, entry: PooledClient) -> requests.Session:
+        """
+        Creates a keep-alive `requests.Session` owned by a pool entry.
+
+        Args:
+            entry (PooledClient): The entry whose `last_used` the session should update.
+
+        Returns:
+            requests.Session: A session whose adapters keep connections open.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_keepalive_connections)
+        session.mount("https://", adapter)
+        session.hooks["response"].append(lambda response, *args, **kwargs: entry.touch())
+        entry.sessions.append(session)
+        return session
+
+    # ---- Pool operations ---- #
+    def acquire(
+        self,
+        provider: str,
+        model: str,
+        api_key: Optional[str],
+        factory: Callable[[PooledClient], Any],
+    ) -> Any:
+        """
+        Returns the pooled chat model for a key, creating it with `factory` on a miss.
+
+        Args:
+            provider (str): The provider name (e.g., "Groq").
+            model (str): The model name.
+            api_key (Optional[str]): The API key used by the client; only its hash is kept.
+            factory (Callable[[PooledClient], Any]): Builds the chat model for the entry.
+
+        Returns:
+            Any: The shared chat model instance.
+        """
+        key = ClientKey(provider, model, hash_api_key(api_key))
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None:
+                self.hits += 1
+                entry.touch()
+                return entry.llm
+
+            self.misses += 1
+            entry = PooledClient(key)
+            try:
+                entry.llm = factory(entry)
+            except Exception:
+                entry.close()
+                raise
+            self._clients[key] = entry
+            evicted = []
+            while len(self._clients) > self.max_clients:
+                # Cached graphs never acquire again, so recency is judged by real traffic
+                oldest = min(self._clients.values(), key=lambda e: e.last_used)
+                del self._clients[oldest.key]
+                self.evictions += 1
+                evicted.append(oldest)
+
+        for oldest in evicted:
+            self._close_entry(oldest)
+        self._ensure_sweeper()
+        return entry.llm
+
+    def close_idle(self) -> int:
+        """
+        Releases every client that has seen no traffic for `idle_timeout` seconds.
+
+        Returns:
+            int: The number of clients released.
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [key for key, entry in self._clients.items() if entry.last_used < cutoff]
+            entries = [self._clients.pop(key) for key in idle]
+            self.idle_closed += len(entries)
+        for entry in entries:
+            self._close_entry(entry)
+        return len(entries)
+
+    def close_all(self) -> None:
+        """Closes every pooled client right away and stops the background sweeper."""
+        self._stop_sweeper.set()
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for entry in entries:
+            self._close_entry(entry, force=True)
+
+    def add_close_listener(self, listener: Callable[[ClientKey], None]) -> None:
+        """
+        Registers a callback invoked with the key of every client the pool releases.
+
+        Components that hold on to pooled models (such as the graph registry) use
+        this to drop their references, so the client's resources can be closed.
+        """
+        self._close_listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns pool occupancy and connection reuse counters.
+
+        `reused_connections` counts requests served on an already-open connection;
+        `connection_reuse_ratio` is that count divided by all requests.
+
+        Returns:
+            Dict[str, Any]: A snapshot of the pool metrics.
+        """
+        with self._lock:
+            total_requests, total_connections = self._closed_requests, self._closed_connections
+            for entry in self._clients.values():
+                entry_requests, entry_connections = entry.connection_counts()
+                total_requests += entry_requests
+                total_connections += entry_connections
+            reused = max(total_requests - total_connections, 0)
+            return {
+                "clients": len(self._clients),
+                "max_clients": self.max_clients,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "idle_closed": self.idle_closed,
+                "requests": total_requests,
+                "new_connections": total_connections,
+                "reused_connections": reused,
+                "connection_reuse_ratio": reused / total_requests if total_requests else 0.0,
+            }
+
+    # ---- Internals ---- #
+    def _close_entry(self, entry: PooledClient, force: bool = False) -> None:
+        """
+        Records an entry's traffic, notifies listeners and releases its resources
+        (closes them right away if `force`).
+        """
+        entry_requests, entry_connections = entry.connection_counts()
+        with self._lock:
+            self._closed_requests += entry_requests
+            self._closed_connections += entry_connections
+        for listener in self._close_listeners:
+            try:
+                listener(entry.key)
+            except Exception as e:
+                print(f"Warning: client pool close listener failed: {e}")
+        if force:
+            entry.llm = None
+        entry.release()
+
+    def _ensure_sweeper(self) -> None:
+        """Starts the background idle sweeper on first use."""
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop_sweeper.clear()
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="llm-client-pool-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        """Closes idle clients every `sweep_interval` seconds until stopped."""
+        while not self._stop_sweeper.wait(self.sweep_interval):
+            try:
+                self.close_idle()
+            except Exception as e:
+                print(f"Warning: client pool idle sweep failed: {e}")
+
+
+# -----------------------------------------------------------------------------
+# Process-wide instance
+# -----------------------------------------------------------------------------
+client_pool = ClientPool(
+    max_clients=int(os.getenv("LLM_CLIENT_POOL_MAX_CLIENTS", "16")),
+    idle_timeout=float(os.getenv("LLM_CLIENT_POOL_IDLE_TIMEOUT", "600")),
+)
+
+
+def get_client_pool() -> ClientPool:
+    """
+    Returns the client pool shared by all Streamlit sessions in this process.
+
+    Returns:
+        ClientPool: The process-wide LLM client pool.
+    """
+    return client_pool
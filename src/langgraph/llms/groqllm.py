@@ -2,6 +2,8 @@ from langchain_groq import ChatGroq
 import streamlit as st
 import os
 
+from src.langgraph.llms.client_pool import get_client_pool
+
 
 class GroqLLM:
     """
@@ -27,7 +29,8 @@ class GroqLLM:
         Workflow:
         - Reads the API key and model name from user_control_input.
         - If no API key is provided, warns the user in the UI.
-        - Creates and returns a ChatGroq instance.
+        - Returns the pooled ChatGroq instance for this model and key, creating it
+          with keep-alive HTTP clients on first use.
 
         Returns:
             ChatGroq: Configured LLM model instance.
@@ -47,8 +50,17 @@ class GroqLLM:
                 st.warning("⚠️ Please select a **Groq model** to proceed.")
                 return None
 
-            # Initialize the Groq LLM
-            llm = ChatGroq(model=selected_groq_model, api_key=groq_api)
+            def create_client(entry):
+                http_client, http_async_client = get_client_pool().create_httpx_clients(entry)
+                return ChatGroq(
+                    model=selected_groq_model,
+                    api_key=groq_api,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                )
+
+            # Reuse the pooled Groq LLM (and its open connections) when available
+            llm = get_client_pool().acquire("Groq", selected_groq_model, groq_api, create_client)
             return llm
 
         except Exception as e:
@@ -2,6 +2,8 @@ from langchain_nvidia_ai_endpoints import ChatNVIDIA
 import streamlit as st
 import os
 
+from src.langgraph.llms.client_pool import get_client_pool
+
 
 class NvidiaLLM:
     """
@@ -27,7 +29,9 @@ class NvidiaLLM:
         Workflow:
         - Reads the API key and model name from user_control_input.
         - If no API key is provided, warns the user in the UI.
-        - Creates and returns a ChatNVIDIA instance.
+        - Returns the pooled ChatNVIDIA instance for this model and key, creating it on
+          first use. ChatNVIDIA opens a new `requests.Session` per call by default, so
+          the pooled instance is pointed at one shared keep-alive session instead.
 
         Returns:
             ChatNVIDIA: Configured LLM model instance.
@@ -47,8 +51,18 @@ class NvidiaLLM:
                 st.warning("⚠️ Please select an **NVIDIA model** to proceed.")
                 return None
 
-            # Initialize the NVIDIA LLM
-            llm = ChatNVIDIA(model=selected_nvidia_model, nvidia_api_key=nvidia_api)
+            def create_client(entry):
+                llm = ChatNVIDIA(model=selected_nvidia_model, nvidia_api_key=nvidia_api)
+                # `_client.get_session_fn` is an internal hook; skip pooling if it changes
+                sync_client = getattr(llm, "_client", None)
+                if sync_client is not None and hasattr(sync_client, "get_session_fn"):
+                    session = get_client_pool().create_requests_session(entry)
+                    session.verify = getattr(sync_client, "verify_ssl", True)
+                    sync_client.get_session_fn = lambda: session
+                return llm
+
+            # Reuse the pooled NVIDIA LLM (and its open connections) when available
+            llm = get_client_pool().acquire("NVIDIA", selected_nvidia_model, nvidia_api, create_client)
             return llm
 
         except Exception as e:
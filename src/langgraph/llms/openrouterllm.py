@@ -1,10 +1,11 @@
 from langchain_openai import ChatOpenAI
-from src.langgraph.ui.streamlitui.loadui import LoadStreamlit
 import streamlit as st
 import os
 
+from src.langgraph.llms.client_pool import get_client_pool
 
-class OpenrouterLLM(LoadStreamlit):
+
+class OpenrouterLLM:
     """
     Wrapper class for initializing and managing an OpenRouter LLM model
     using LangChain's ChatOpenAI integration.
@@ -28,7 +29,8 @@ class OpenrouterLLM(LoadStreamlit):
         Workflow:
         - Reads the API key and model name from user_control_input.
         - If no API key is provided, warns the user in the UI.
-        - Creates and returns a ChatOpenAI instance with the OpenRouter endpoint.
+        - Returns the pooled ChatOpenAI instance for the OpenRouter endpoint, creating
+          it with keep-alive HTTP clients on first use.
 
         Returns:
             ChatOpenAI: Configured LLM model instance, or None if inputs are missing.
@@ -48,11 +50,19 @@ class OpenrouterLLM(LoadStreamlit):
                 st.warning("⚠️ Please select an **OpenRouter model** to proceed.")
                 return None
 
-            # Initialize the OpenRouter LLM
-            llm = ChatOpenAI(
-                model=selected_openrouter_model,
-                api_key=openrouter_api,
-                base_url="https://openrouter.ai/api/v1"
+            def create_client(entry):
+                http_client, http_async_client = get_client_pool().create_httpx_clients(entry)
+                return ChatOpenAI(
+                    model=selected_openrouter_model,
+                    api_key=openrouter_api,
+                    base_url="https://openrouter.ai/api/v1",
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                )
+
+            # Reuse the pooled OpenRouter LLM (and its open connections) when available
+            llm = get_client_pool().acquire(
+                "Openrouter", selected_openrouter_model, openrouter_api, create_client
             )
             return llm
 
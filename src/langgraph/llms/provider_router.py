@@ -0,0 +1,571 @@
+"""
+Latency-aware routing between a selected model and a fallback model.
+
+Every (provider, model) pair gets rolling latency and error statistics shared
+by all sessions of the process. A request goes to the selected model first; if
+no answer (or, when streaming, no first token) has arrived after that model's
+recent p95 latency, the same request is also sent to the fallback model and
+whichever answers first is used. After repeated failures a model's circuit
+opens: requests skip it and go straight to the fallback until a cool-down has
+passed, after which a single trial request decides whether it closes again.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# --- Third-Party Imports ---
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Inner calls run without the outer run's callbacks, so streamed tokens are
+# reported once (by the routed model) rather than once per attempt
+_QUIET_CONFIG = {"callbacks": []}
+
+
+class ProviderStats:
+    """
+    Rolling latency, error and circuit-breaker state of one (provider, model).
+
+    Latencies are kept per kind of request: "invoke" (full answer) and "stream"
+    (time to the first token), since the two differ by the length of the answer.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 50,
+        failure_threshold: float = 0.5,
+        consecutive_failures: int = 5,
+        min_samples: int = 5,
+        open_seconds: float = 30.0,
+    ):
+        """
+        Initializes empty statistics.
+
+        Args:
+            name (str): The "provider:model" these statistics describe.
+            window (int): Number of recent requests the latency and error rates cover.
+            failure_threshold (float): Error rate over the window that opens the circuit.
+            consecutive_failures (int): Failures in a row that open the circuit.
+            min_samples (int): Requests needed in the window before the error rate counts.
+            open_seconds (float): How long an open circuit rejects requests before a trial.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.consecutive_failures = consecutive_failures
+        self.min_samples = min_samples
+        self.open_seconds = open_seconds
+        self._latencies: Dict[str, deque] = {"invoke": deque(maxlen=window), "stream": deque(maxlen=window)}
+        self._outcomes: deque = deque(maxlen=window)
+        self._failures_in_row = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def percentile(self, kind: str, q: float = 0.95) -> Optional[float]:
+        """Returns the q-quantile of recent latencies of a kind, or None without samples."""
+        with self._lock:
+            samples = sorted(self._latencies[kind])
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def error_rate(self) -> float:
+        """Returns the share of failed requests in the window."""
+        with self._lock:
+            return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    @property
+    def state(self) -> str:
+        """The circuit state: "closed", "open" or "half_open" (cool-down over, awaiting a trial)."""
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "open" if now - self._opened_at < self.open_seconds else "half_open"
+
+    def allow_request(self) -> bool:
+        """
+        Returns whether a request may be sent to this model now.
+
+        A closed circuit allows every request; an open one none. Once the cool-down
+        is over, exactly one trial request is allowed until it reports its outcome.
+        """
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_latency(self, kind: str, seconds: float) -> None:
+        """Adds a latency sample ("invoke": full answer, "stream": first token)."""
+        with self._lock:
+            self._latencies[kind].append(seconds)
+
+    def record_success(self) -> None:
+        """Records a successful request; a successful trial closes the circuit."""
+        with self._lock:
+            self._outcomes.append(True)
+            self._failures_in_row = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Records a failed request, opening the circuit on sustained failures."""
+        with self._lock:
+            self._outcomes.append(False)
+            self._failures_in_row += 1
+            failed_trial = self._trial_running
+            self._trial_running = False
+            errors = self._outcomes.count(False)
+            sustained = len(self._outcomes) >= self.min_samples and errors / len(self._outcomes) >= self.failure_threshold
+            if failed_trial or sustained or self._failures_in_row >= self.consecutive_failures:
+                self._opened_at = time.monotonic()
+
+    def record_abandoned(self) -> None:
+        """Records a request given up on because another model answered first."""
+        with self._lock:
+            self._trial_running = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the statistics as a dictionary, for metrics and the UI."""
+        invoke_p95, stream_p95 = self.percentile("invoke"), self.percentile("stream")
+        with self._lock:
+            return {
+                "state": self._state(time.monotonic()),
+                "requests": len(self._outcomes),
+                "error_rate": self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0,
+                "invoke_p95": invoke_p95,
+                "stream_p95": stream_p95,
+            }
+
+
+class _Attempt(NamedTuple):
+    """One model a routed request may be sent to."""
+    name: str
+    model: Any
+    stats: ProviderStats
+
+
+class ProviderRouter:
+    """
+    Holds the statistics of every (provider, model) and the settings of hedged requests.
+
+    One router is shared by every session of the process, so each model's p95 and
+    circuit reflect all of its traffic.
+    """
+
+    def __init__(
+        self,
+        hedge_percentile: float = 0.95,
+        default_hedge_delay: float = 5.0,
+        min_hedge_delay: float = 0.5,
+        max_workers: int = 32,
+        **stats_settings: Any,
+    ):
+        """
+        Initializes the router.
+
+        Args:
+            hedge_percentile (float): Latency quantile of the selected model after which
+                                      the fallback is also asked.
+            default_hedge_delay (float): Hedge delay in seconds before a model has latency samples.
+            min_hedge_delay (float): Lower bound of the hedge delay, so fast models are not
+                                     hedged on every small jitter.
+            max_workers (int): Threads running synchronous requests; each attempt of a
+                               routed call holds one until it finishes.
+            **stats_settings: Circuit-breaker settings passed to every `ProviderStats`.
+        """
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.stats_settings = stats_settings
+        self._stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="provider-router")
+
+    def stats(self, name: str) -> ProviderStats:
+        """Returns the statistics of a "provider:model", creating them on first use."""
+        with self._lock:
+            if name not in self._stats:
+                self._stats[name] = ProviderStats(name, **self.stats_settings)
+            return self._stats[name]
+
+    def hedge_delay(self, name: str, kind: str) -> float:
+        """
+        Returns how long to wait for a model before also asking the fallback.
+
+        Attempts given up on because the other model answered first add no latency
+        sample: counting their full (slow) latency would raise the p95 until hedging
+        turned itself off.
+        """
+        p = self.stats(name).percentile(kind, self.hedge_percentile)
+        return max(self.min_hedge_delay, p if p is not None else self.default_hedge_delay)
+
+    def submit(self, fn: Callable, *args: Any) -> Future:
+        """Runs a synchronous attempt on the router's thread pool."""
+        return self._pool.submit(fn, *args)
+
+    def route(self, primary: BaseChatModel, primary_name: str, fallback: BaseChatModel, fallback_name: str):
+        """
+        Returns a chat model that sends requests to `primary`, hedged with `fallback`.
+
+        Args:
+            primary (BaseChatModel): The model the user selected.
+            primary_name (str): Its "provider:model" name.
+            fallback (BaseChatModel): The model asked when the primary is slow or failing.
+            fallback_name (str): Its "provider:model" name.
+
+        Returns:
+            RoutedChatModel: The routed model, usable wherever the primary was.
+        """
+        return RoutedChatModel(
+            primary=primary, primary_name=primary_name, fallback=fallback, fallback_name=fallback_name, router=self
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the statistics of every model seen so far, keyed by "provider:model"."""
+        with self._lock:
+            stats = list(self._stats.values())
+        return {s.name: s.snapshot() for s in stats}
+
+
+class RoutedChatModel(BaseChatModel):
+    """
+    A chat model that hedges its primary model with a fallback model.
+
+    The models are called through their Runnable interface, so tool-bound models
+    (see `bind_tools`) are routed the same way. The answering model is recorded
+    in the message's `response_metadata["router"]` as `{"model", "hedged",
+    "fallback"}`.
+    """
+
+    primary: Any
+    primary_name: str
+    fallback: Any
+    fallback_name: str
+    router: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"primary": self.primary_name, "fallback": self.fallback_name}
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "RoutedChatModel":
+        """Binds the tools to both models and returns the routed pair."""
+        return self.model_copy(update={
+            "primary": self.primary.bind_tools(tools, **kwargs),
+            "fallback": self.fallback.bind_tools(tools, **kwargs),
+        })
+
+    def _attempts(self) -> List[_Attempt]:
+        """
+        Returns the models to try, in order.
+
+        The primary comes first unless its circuit is open; if both circuits are
+        open the primary is tried anyway, since a request must go somewhere.
+        """
+        primary = _Attempt(self.primary_name, self.primary, self.router.stats(self.primary_name))
+        fallback = _Attempt(self.fallback_name, self.fallback, self.router.stats(self.fallback_name))
+        if primary.stats.allow_request():
+            return [primary, fallback]
+        if fallback.stats.allow_request():
+            return [fallback, primary]
+        return [primary, fallback]
+
+    def _with_route(self, message: BaseMessage, name: str, hedged: bool) -> BaseMessage:
+        """Records which model answered, and whether the fallback was asked, in the message's metadata."""
+        message.response_metadata = {
+            **message.response_metadata,
+            "router": {"model": name, "hedged": hedged, "fallback": name != self.primary_name},
+        }
+        return message
+
+    @staticmethod
+    def _call_kwargs(stop: Optional[List[str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {**kwargs, "stop": stop} if stop else kwargs
+
+    # ---- Invoke ---- #
+    @staticmethod
+    def _invoke(
+        attempt: _Attempt, messages: List[BaseMessage], kwargs: Dict[str, Any], answered: threading.Event
+    ) -> BaseMessage:
+        """
+        Sends the request to one model, recording its latency and outcome. An attempt
+        that finishes after another model has `answered` is recorded as abandoned.
+        """
+        start = time.monotonic()
+        try:
+            message = attempt.model.invoke(messages, config=_QUIET_CONFIG, **kwargs)
+        except Exception:
+            attempt.stats.record_failure()
+            raise
+        if answered.is_set():
+            attempt.stats.record_abandoned()
+            return message
+        attempt.stats.record_latency("invoke", time.monotonic() - start)
+        attempt.stats.record_success()
+        return message
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        attempts, call_kwargs = self._attempts(), self._call_kwargs(stop, kwargs)
+        running: Dict[Future, _Attempt] = {}
+        answered = threading.Event()
+        launched, error = 0, None
+        hedge_at = time.monotonic() + self.router.hedge_delay(attempts[0].name, "invoke")
+        while True:
+            if attempts and (not running or time.monotonic() >= hedge_at):
+                attempt, launched = attempts.pop(0), launched + 1
+                running[self.router.submit(self._invoke, attempt, messages, call_kwargs, answered)] = attempt
+            timeout = max(0.0, hedge_at - time.monotonic()) if attempts else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                attempt = running.pop(future)
+                if future.exception() is None:
+                    answered.set()
+                    message = self._with_route(future.result(), attempt.name, hedged=launched > 1)
+                    return ChatResult(generations=[ChatGeneration(message=message)])
+                error = future.exception()
+            if not running and not attempts:
+                raise error
+
+    async def _ainvoke(self, attempt: _Attempt, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> BaseMessage:
+        """Async variant of `_invoke`; a loser is cancelled and recorded as abandoned."""
+        start = time.monotonic()
+        try:
+            message = await attempt.model.ainvoke(messages, config=_QUIET_CONFIG, **kwargs)
+        except asyncio.CancelledError:
+            attempt.stats.record_abandoned()
+            raise
+        except Exception:
+            attempt.stats.record_failure()
+            raise
+        attempt.stats.record_latency("invoke", time.monotonic() - start)
+        attempt.stats.record_success()
+        return message
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        attempts, call_kwargs = self._attempts(), self._call_kwargs(stop, kwargs)
+        running: Dict[asyncio.Task, _Attempt] = {}
+        launched, error = 0, None
+        hedge_at = time.monotonic() + self.router.hedge_delay(attempts[0].name, "invoke")
+        try:
+            while True:
+                if attempts and (not running or time.monotonic() >= hedge_at):
+                    attempt, launched = attempts.pop(0), launched + 1
+                    running[asyncio.ensure_future(self._ainvoke(attempt, messages, call_kwargs))] = attempt
+                timeout = max(0.0, hedge_at - time.monotonic()) if attempts else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    attempt = running.pop(task)
+                    if task.exception() is None:
+                        message = self._with_route(task.result(), attempt.name, hedged=launched > 1)
+                        return ChatResult(generations=[ChatGeneration(message=message)])
+                    error = task.exception()
+                if not running and not attempts:
+                    raise error
+        finally:
+            for task in running:
+                task.cancel()
+
+    # ---- Stream ---- #
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """
+        Streams from whichever model sends its first token first.
+
+        Each attempt streams on a router thread into a shared queue. Once one model
+        has sent a token the others are abandoned; a failure after that point is
+        raised, since part of the answer has already been shown.
+        """
+        attempts, call_kwargs = self._attempts(), self._call_kwargs(stop, kwargs)
+        events: "queue.Queue[Tuple[int, str, Any]]" = queue.Queue()
+        abandoned = threading.Event()
+        launched: List[_Attempt] = []
+        winner: Optional[int] = None
+        finished: set = set()
+        error: Optional[BaseException] = None
+        tagged = False
+
+        def pump(index: int, attempt: _Attempt) -> None:
+            start, first = time.monotonic(), True
+            try:
+                for chunk in attempt.model.stream(messages, config=_QUIET_CONFIG, **call_kwargs):
+                    if winner not in (None, index) or abandoned.is_set():
+                        attempt.stats.record_abandoned()
+                        return
+                    if first:
+                        attempt.stats.record_latency("stream", time.monotonic() - start)
+                        first = False
+                    events.put((index, "chunk", chunk))
+                attempt.stats.record_success()
+                events.put((index, "end", None))
+            except Exception as e:
+                attempt.stats.record_failure()
+                events.put((index, "error", e))
+
+        hedge_at = time.monotonic() + self.router.hedge_delay(attempts[0].name, "stream")
+        try:
+            while True:
+                if attempts and winner is None and (len(launched) == len(finished) or time.monotonic() >= hedge_at):
+                    launched.append(attempts.pop(0))
+                    self.router.submit(pump, len(launched) - 1, launched[-1])
+                try:
+                    timeout = max(0.0, hedge_at - time.monotonic()) if attempts and winner is None else None
+                    index, kind, payload = events.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if kind == "error":
+                    finished.add(index)
+                    if index == winner:
+                        raise payload
+                    error = payload
+                    if winner is None and not attempts and len(finished) == len(launched):
+                        raise error
+                    continue
+                if winner is None:
+                    winner = index
+                if index != winner:
+                    continue
+                if kind == "end":
+                    return
+                if not tagged:
+                    # Only the first chunk is tagged: string metadata is concatenated when chunks merge
+                    payload, tagged = self._with_route(payload, launched[index].name, len(launched) > 1), True
+                chunk = ChatGenerationChunk(message=payload)
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        finally:
+            abandoned.set()
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Async variant of `_stream`; abandoned attempts are cancelled."""
+        attempts, call_kwargs = self._attempts(), self._call_kwargs(stop, kwargs)
+        events: "asyncio.Queue[Tuple[int, str, Any]]" = asyncio.Queue()
+        launched: List[_Attempt] = []
+        tasks: List[asyncio.Task] = []
+        finished: set = set()
+        winner: Optional[int] = None
+        error: Optional[BaseException] = None
+        tagged = False
+
+        async def pump(index: int, attempt: _Attempt) -> None:
+            start, first = time.monotonic(), True
+            try:
+                async for chunk in attempt.model.astream(messages, config=_QUIET_CONFIG, **call_kwargs):
+                    if first:
+                        attempt.stats.record_latency("stream", time.monotonic() - start)
+                        first = False
+                    await events.put((index, "chunk", chunk))
+                attempt.stats.record_success()
+                await events.put((index, "end", None))
+            except asyncio.CancelledError:
+                attempt.stats.record_abandoned()
+                raise
+            except Exception as e:
+                attempt.stats.record_failure()
+                await events.put((index, "error", e))
+
+        hedge_at = time.monotonic() + self.router.hedge_delay(attempts[0].name, "stream")
+        try:
+            while True:
+                if attempts and winner is None and (len(launched) == len(finished) or time.monotonic() >= hedge_at):
+                    launched.append(attempts.pop(0))
+                    tasks.append(asyncio.ensure_future(pump(len(launched) - 1, launched[-1])))
+                try:
+                    timeout = max(0.0, hedge_at - time.monotonic()) if attempts and winner is None else None
+                    index, kind, payload = await asyncio.wait_for(events.get(), timeout)
+                except asyncio.TimeoutError:
+                    continue
+                if kind == "error":
+                    finished.add(index)
+                    if index == winner:
+                        raise payload
+                    error = payload
+                    if winner is None and not attempts and len(finished) == len(launched):
+                        raise error
+                    continue
+                if winner is None:
+                    winner = index
+                    for other, task in enumerate(tasks):
+                        if other != index:
+                            task.cancel()
+                if index != winner:
+                    continue
+                if kind == "end":
+                    return
+                if not tagged:
+                    payload, tagged = self._with_route(payload, launched[index].name, len(launched) > 1), True
+                chunk = ChatGenerationChunk(message=payload)
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+# ---- Process-wide instance ---- #
+_provider_router: Optional[ProviderRouter] = None
+_provider_router_lock = threading.Lock()
+
+
+def get_provider_router() -> ProviderRouter:
+    """
+    Returns the provider router shared by every graph and session in this process.
+
+    Returns:
+        ProviderRouter: The router, configured from `ROUTER_*` environment variables.
+    """
+    global _provider_router
+    with _provider_router_lock:
+        if _provider_router is None:
+            _provider_router = ProviderRouter(
+                hedge_percentile=float(os.getenv("ROUTER_HEDGE_PERCENTILE", "0.95")),
+                default_hedge_delay=float(os.getenv("ROUTER_DEFAULT_HEDGE_DELAY", "5")),
+                min_hedge_delay=float(os.getenv("ROUTER_MIN_HEDGE_DELAY", "0.5")),
+                max_workers=int(os.getenv("ROUTER_MAX_WORKERS", "32")),
+                window=int(os.getenv("ROUTER_WINDOW", "50")),
+                open_seconds=float(os.getenv("ROUTER_OPEN_SECONDS", "30")),
+            )
+        return _provider_router
@@ -0,0 +1,69 @@
+"""
+The LLM providers offered in the UI, imported on first use.
+
+Each provider's handler module pulls in its LangChain integration and SDK
+(`langchain_openai`, `langchain_groq`, `langchain_nvidia_ai_endpoints`), which
+together take longer to import than the rest of the app. The mapping below
+names each handler by import path and only imports it the first time that
+provider is looked up, so the first page renders without any of them and a
+session only loads the provider it selects.
+"""
+# --- Standard Library Imports ---
+import importlib
+import threading
+from typing import Any, Dict, Iterator, MutableMapping, Union
+
+
+class LazyProviders(MutableMapping):
+    """
+    A mapping from UI provider names to LLM handler classes, imported on first access.
+
+    Values are "module:ClassName" paths until first looked up, then the imported
+    class. Handler classes can also be registered directly (e.g., offline fakes).
+    """
+
+    def __init__(self, providers: Dict[str, Union[str, type]]):
+        """
+        Initializes the mapping without importing anything.
+
+        Args:
+            providers (Dict[str, Union[str, type]]): Provider names mapped to
+                "module:ClassName" paths or to handler classes.
+        """
+        self._providers: Dict[str, Union[str, type]] = dict(providers)
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> type:
+        handler = self._providers[name]
+        if not isinstance(handler, str):
+            return handler
+        with self._lock:
+            handler = self._providers[name]
+            if isinstance(handler, str):
+                module_name, class_name = handler.split(":")
+                handler = self._providers[name] = getattr(importlib.import_module(module_name), class_name)
+        return handler
+
+    def __setitem__(self, name: str, handler: Union[str, type]) -> None:
+        self._providers[name] = handler
+
+    def __delitem__(self, name: str) -> None:
+        del self._providers[name]
+
+    def __contains__(self, name: Any) -> bool:
+        # Membership never triggers an import
+        return name in self._providers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._providers)
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+
+# A mapping from UI provider names to their respective LLM handler classes.
+LLM_PROVIDERS = LazyProviders({
+    "Openrouter": "src.langgraph.llms.openrouterllm:OpenrouterLLM",
+    "Groq": "src.langgraph.llms.groqllm:GroqLLM",
+    "NVIDIA": "src.langgraph.llms.nvidiallm:NvidiaLLM",
+})
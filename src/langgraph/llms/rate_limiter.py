@@ -0,0 +1,532 @@
+"""
+Client-side rate limiting of provider requests and tokens.
+
+Free-tier providers enforce requests-per-minute and tokens-per-minute quotas
+per model, and answer with HTTP 429 once they are exceeded. Every (provider,
+model) with a configured quota gets one limiter shared by all sessions of the
+process: two token buckets, one for requests and one for tokens. A request
+reserves one request and its estimated tokens, and waits in line until both
+buckets can cover it, instead of being sent and rejected. The estimate is
+corrected with the provider's reported usage once the answer arrives.
+
+If the provider still answers 429 (its quota is shared with other clients, or
+the configured limits are too generous), the request is retried with jittered
+exponential back-off, waiting at least as long as the provider's Retry-After,
+and every other request to that model waits for the same Retry-After.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional
+
+# --- Third-Party Imports ---
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# --- Local Application Imports ---
+from src.langgraph.nodes.message_trimmer import get_token_counter
+from src.langgraph.ui.uiconfigfile import get_settings
+
+# Inner calls run without the outer run's callbacks, so each answer is reported once
+_QUIET_CONFIG = {"callbacks": []}
+
+_DURATION_PATTERN = re.compile(r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m(?!s))?(?:(\d+(?:\.\d+)?)s)?(?:(\d+)ms)?$")
+
+
+class RateLimit(NamedTuple):
+    """A provider quota: requests and tokens per minute (0 means unlimited)."""
+    requests_per_minute: int
+    tokens_per_minute: int
+
+
+class TokenBucket:
+    """
+    A token bucket that hands out reservations in arrival order.
+
+    A reservation always succeeds and may drive the level below zero; the caller
+    then waits until the refill has paid the debt back, so later callers queue
+    behind earlier ones instead of racing them.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Initializes a full bucket.
+
+        Args:
+            per_minute (float): Refill rate, which is also the capacity (a minute's worth).
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Takes `amount` (at most the capacity) and returns the seconds until it is covered."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def give_back(self, amount: float) -> None:
+        """Returns (or, if negative, takes) tokens after a reservation turned out wrong."""
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """
+    Queues requests to one (provider, model) so they stay within its quota.
+
+    Waiting is done by each caller (sleeping its thread, or awaiting on the event
+    loop); the limiter only hands out reservations and keeps the metrics.
+    """
+
+    def __init__(self, name: str, limit: RateLimit, max_wait: float = 120.0):
+        """
+        Initializes the limiter with full buckets.
+
+        Args:
+            name (str): The "provider:model" the quota belongs to.
+            limit (RateLimit): The quota.
+            max_wait (float): Longest a request may wait in line, in seconds; requests
+                              that would wait longer fail immediately instead.
+        """
+        self.name = name
+        self.limit = limit
+        self.max_wait = max_wait
+        self._requests = TokenBucket(limit.requests_per_minute) if limit.requests_per_minute > 0 else None
+        self._tokens = TokenBucket(limit.tokens_per_minute) if limit.tokens_per_minute > 0 else None
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.waiting = 0
+        self.max_waiting = 0
+        self.requests = 0
+        self.queued = 0
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+        self._waits: deque = deque(maxlen=1000)
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Reserves one request and `tokens` tokens and returns the seconds to wait.
+
+        Raises:
+            ValueError: If the wait would exceed `max_wait`; nothing is reserved then.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self._blocked_until - now,
+                self._requests.reserve(1, now) if self._requests else 0.0,
+                self._tokens.reserve(tokens, now) if self._tokens else 0.0,
+            )
+            if wait > self.max_wait:
+                if self._requests:
+                    self._requests.give_back(1)
+                if self._tokens:
+                    self._tokens.give_back(min(tokens, self._tokens.capacity))
+                self.rejected += 1
+                raise ValueError(
+                    f"{self.name} is over its quota: the request would wait {wait:.0f}s "
+                    f"(more than {self.max_wait:.0f}s). Please try again later."
+                )
+            self.requests += 1
+            self._waits.append(wait)
+            if wait > 0:
+                self.queued += 1
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+            return wait
+
+    def _done_waiting(self) -> None:
+        with self._lock:
+            self.waiting -= 1
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Waits (sleeping the calling thread) until the quota covers one request of `tokens` tokens.
+
+        Args:
+            tokens (int): The request's estimated prompt and completion tokens.
+
+        Returns:
+            float: The seconds waited.
+
+        Raises:
+            ValueError: If the wait would exceed `max_wait`.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                self._done_waiting()
+        return wait
+
+    async def aacquire(self, tokens: int) -> float:
+        """Async variant of `acquire`; the wait is awaited on the event loop."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._done_waiting()
+        return wait
+
+    def settle(self, reserved_tokens: int, used_tokens: Optional[int]) -> None:
+        """
+        Corrects a reservation with the tokens the provider reports it used.
+
+        Both amounts are capped at the bucket's capacity, as in `reserve`, so a
+        request larger than a minute's quota is never refunded more than it took.
+
+        Args:
+            reserved_tokens (int): The tokens reserved for the request.
+            used_tokens (Optional[int]): The tokens actually used; None keeps the estimate.
+        """
+        if self._tokens is None or used_tokens is None:
+            return
+        with self._lock:
+            capacity = self._tokens.capacity
+            self._tokens.give_back(min(reserved_tokens, capacity) - min(used_tokens, capacity))
+
+    def throttle(self, retry_after: float) -> None:
+        """
+        Records a 429 from the provider and, if it gave a Retry-After, makes every
+        request to the model wait that long from now.
+        """
+        with self._lock:
+            self.throttled += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def record_retry(self) -> None:
+        """Counts a request sent again after a 429."""
+        with self._lock:
+            self.retries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the limiter's metrics.
+
+        Returns:
+            Dict[str, Any]: Queue depth (now and peak), request, queued, 429, retry and
+                            rejection counts, and wait-time percentiles in seconds.
+        """
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "requests_per_minute": self.limit.requests_per_minute,
+                "tokens_per_minute": self.limit.tokens_per_minute,
+                "queue_depth": self.waiting,
+                "max_queue_depth": self.max_waiting,
+                "requests": self.requests,
+                "queued": self.queued,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "rejected": self.rejected,
+                "wait_p50": waits[len(waits) // 2] if waits else 0.0,
+                "wait_p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                "wait_max": waits[-1] if waits else 0.0,
+            }
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After value (seconds or an HTTP date) or a reset duration such as "1m30.5s"."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    match = _DURATION_PATTERN.match(value)
+    if match and any(match.groups()):
+        hours, minutes, seconds, millis = (float(g) if g else 0.0 for g in match.groups())
+        return hours * 3600 + minutes * 60 + seconds + millis / 1000
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limit_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Tells whether an exception is a provider's 429 and, if so, how long it asked to wait.
+
+    Works with the Groq and OpenAI SDK errors (status code and response headers)
+    and with errors that only mention the status in their message.
+
+    Args:
+        error (BaseException): The exception raised by the provider call.
+
+    Returns:
+        Optional[float]: None if it is not a rate-limit error; otherwise the seconds
+                         from Retry-After (or the rate-limit reset headers), or 0 if
+                         the provider did not say.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429 and "[429]" not in str(error) and "rate limit" not in str(error).lower():
+        return None
+    headers = getattr(response, "headers", None) or {}
+    for header in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        seconds = _parse_seconds(headers.get(header))
+        if seconds is not None:
+            return seconds
+    return 0.0
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    A chat model that waits for its provider quota and retries 429 answers.
+
+    The model is called through its Runnable interface, so tool-bound models (see
+    `bind_tools`) are limited the same way. A stream is only retried before its
+    first token.
+    """
+
+    model: Any
+    limiter: Any
+    max_retries: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    completion_tokens: int = 512
+
+    @property
+    def _llm_type(self) -> str:
+        return "rate-limited-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.limiter.name, "limit": tuple(self.limiter.limit)}
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "RateLimitedChatModel":
+        """Binds the tools to the limited model."""
+        return self.model_copy(update={"model": self.model.bind_tools(tools, **kwargs)})
+
+    def _estimate(self, messages: List[BaseMessage]) -> int:
+        """Estimates a request's tokens: the prompt plus the expected completion."""
+        counter = get_token_counter()
+        return sum(counter(message) for message in messages) + self.completion_tokens
+
+    def _retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """
+        Returns how long to wait before retrying, or None if the error is not retried.
+
+        The back-off is exponential with full jitter, so throttled callers spread out
+        instead of retrying together, and never shorter than the provider's Retry-After.
+        """
+        retry_after = rate_limit_retry_after(error)
+        if retry_after is None:
+            return None
+        self.limiter.throttle(retry_after)
+        if attempt >= self.max_retries:
+            return None
+        self.limiter.record_retry()
+        return max(retry_after, random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+    @staticmethod
+    def _call_kwargs(stop: Optional[List[str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {**kwargs, "stop": stop} if stop else kwargs
+
+    @staticmethod
+    def _used_tokens(message: BaseMessage) -> Optional[int]:
+        usage = getattr(message, "usage_metadata", None)
+        return usage.get("total_tokens") if usage else None
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tokens, call_kwargs = self._estimate(messages), self._call_kwargs(stop, kwargs)
+        attempt = 0
+        while True:
+            self.limiter.acquire(tokens)
+            try:
+                message = self.model.invoke(messages, config=_QUIET_CONFIG, **call_kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.limiter.settle(tokens, self._used_tokens(message))
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tokens, call_kwargs = self._estimate(messages), self._call_kwargs(stop, kwargs)
+        attempt = 0
+        while True:
+            await self.limiter.aacquire(tokens)
+            try:
+                message = await self.model.ainvoke(messages, config=_QUIET_CONFIG, **call_kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.limiter.settle(tokens, self._used_tokens(message))
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        tokens, call_kwargs = self._estimate(messages), self._call_kwargs(stop, kwargs)
+        attempt = 0
+        while True:
+            self.limiter.acquire(tokens)
+            started, used = False, None
+            try:
+                for chunk in self.model.stream(messages, config=_QUIET_CONFIG, **call_kwargs):
+                    started = True
+                    used = self._used_tokens(chunk) or used
+                    generation = ChatGenerationChunk(message=chunk)
+                    if run_manager:
+                        run_manager.on_llm_new_token(generation.text, chunk=generation)
+                    yield generation
+            except Exception as e:
+                delay = None if started else self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.limiter.settle(tokens, used)
+            return
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        tokens, call_kwargs = self._estimate(messages), self._call_kwargs(stop, kwargs)
+        attempt = 0
+        while True:
+            await self.limiter.aacquire(tokens)
+            started, used = False, None
+            try:
+                async for chunk in self.model.astream(messages, config=_QUIET_CONFIG, **call_kwargs):
+                    started = True
+                    used = self._used_tokens(chunk) or used
+                    generation = ChatGenerationChunk(message=chunk)
+                    if run_manager:
+                        await run_manager.on_llm_new_token(generation.text, chunk=generation)
+                    yield generation
+            except Exception as e:
+                delay = None if started else self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.limiter.settle(tokens, used)
+            return
+
+
+class RateLimiterRegistry:
+    """
+    Holds one limiter per (provider, model) with a configured quota.
+
+    Quotas are looked up as "Provider:model" first and "Provider:*" second.
+    Limiters are per process: with several API workers, each enforces the full
+    quota, so configure the limits divided by the number of workers.
+    """
+
+    def __init__(self, limits: Dict[str, RateLimit], max_wait: float = 120.0):
+        """
+        Initializes the registry.
+
+        Args:
+            limits (Dict[str, RateLimit]): Quotas keyed by "Provider:model" or "Provider:*".
+            max_wait (float): Longest a request may wait in line, in seconds.
+        """
+        self.limits = dict(limits)
+        self.max_wait = max_wait
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: str) -> Optional[RateLimiter]:
+        """Returns the limiter of a model, or None if it has no configured quota."""
+        name = f"{provider}:{model}"
+        limit = self.limits.get(name) or self.limits.get(f"{provider}:*")
+        if limit is None:
+            return None
+        with self._lock:
+            # A changed quota gets a new limiter; models already wrapped keep the old one
+            if name not in self._limiters or self._limiters[name].limit != limit:
+                self._limiters[name] = RateLimiter(name, limit, max_wait=self.max_wait)
+            return self._limiters[name]
+
+    def limit(self, llm: BaseChatModel, provider: str, model: str) -> BaseChatModel:
+        """
+        Wraps a chat model so its requests stay within the model's quota.
+
+        Args:
+            llm (BaseChatModel): The provider's chat model.
+            provider (str): The provider name, as in the UI.
+            model (str): The model name.
+
+        Returns:
+            BaseChatModel: The rate-limited model, or `llm` itself if the model has no quota.
+        """
+        limiter = self.get(provider, model)
+        return RateLimitedChatModel(model=llm, limiter=limiter) if limiter else llm
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the metrics of every limiter, keyed by "provider:model"."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.stats() for limiter in limiters}
+
+
+# ---- Process-wide instance ---- #
+_rate_limiters: Optional[RateLimiterRegistry] = None
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiters() -> RateLimiterRegistry:
+    """
+    Returns the rate limiters shared by every graph and session in this process.
+
+    The quotas follow the UI config file: after it is reloaded with changed
+    quotas, models created from then on get limiters with the new ones.
+
+    Returns:
+        RateLimiterRegistry: The registry, with the quotas from the UI config file.
+    """
+    global _rate_limiters
+    limits = {name: RateLimit(*limit) for name, limit in get_settings().rate_limits.items()}
+    with _rate_limiters_lock:
+        if _rate_limiters is None:
+            _rate_limiters = RateLimiterRegistry(limits, max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", "120")))
+        elif _rate_limiters.limits != limits:
+            _rate_limiters.limits = limits
+        return _rate_limiters
@@ -0,0 +1,415 @@
+"""
+A semantic response cache for chat prompts, backed by FAISS.
+
+Prompts are embedded with a small offline embedder and looked up among earlier
+prompts sent to the same (provider, model). If the nearest one is similar enough,
+its stored answer is returned instead of calling the provider. Every namespace
+has its own in-memory FAISS index; entries (prompt, answer and vector) are
+persisted in SQLite on local disk and the indexes are rebuilt from it on start-up.
+"""
+# --- Standard Library Imports ---
+import os
+import re
+import sqlite3
+import statistics
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# --- Third-Party Imports ---
+import numpy as np
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_TOKEN_PATTERN = re.compile(r"[.!?]|[A-Za-z0-9]+")
+_CONTRACTION_PATTERN = re.compile(r"n['’]t\b|['’](?:s|re|ve|ll|d|m)\b", re.IGNORECASE)
+
+# Capitalized words that do not name anything: function words and polite filler
+_FILLER_WORDS = frozenset("""
+    a an the this that these those of in on at to for from by with about into as and or but
+    is are was were be been being am do does did can could would should will shall may might must
+    i me my we our you your it its he she they them their what which who whom how why when where
+    please tell give show explain describe kindly just quickly briefly hi hello hey thanks thank
+""".split())
+_NEGATIONS = frozenset("not no never none nor neither without".split())
+_NUMBER_WORDS = frozenset("""
+    zero one two three four five six seven eight nine ten eleven twelve twenty hundred thousand
+    million billion half once twice
+""".split())
+
+
+def _expand_contractions(text: str) -> str:
+    """Turns "n't" into " not" and drops "'s", "'re" and the like ("what's" -> "what")."""
+    return _CONTRACTION_PATTERN.sub(lambda m: " not" if m.group(0)[0] in "nN" else "", text)
+
+
+def _words(text: str) -> frozenset:
+    """Returns the lower-cased words of a text, with contractions expanded."""
+    return frozenset(_WORD_PATTERN.findall(_expand_contractions(text).lower()))
+
+
+def key_terms(text: str) -> frozenset:
+    """
+    Returns the terms that change what a prompt asks, lower-cased.
+
+    These are numbers, negations and entity-like tokens: words capitalized other
+    than at the start of a sentence ("Java", "Paris"), or with capitals after the
+    first letter ("GPT", "iPhone"). The hashing embedder scores prompts differing
+    in one of them (e.g., "in Java" vs "in Go", "3 day" vs "7 day", "safe" vs
+    "not safe") as near-duplicates; other words are left to its threshold.
+    """
+    terms, sentence_start = set(), True
+    for token in _TOKEN_PATTERN.findall(_expand_contractions(text)):
+        if token in ".!?":
+            sentence_start = True
+            continue
+        word = token.lower()
+        entity = len(token) > 1 and (any(c.isupper() for c in token[1:]) or (token[0].isupper() and not sentence_start))
+        if any(c.isdigit() for c in word) or word in _NEGATIONS or word in _NUMBER_WORDS or (
+            entity and word not in _FILLER_WORDS
+        ):
+            terms.add(word)
+        sentence_start = False
+    return frozenset(terms)
+
+
+def same_key_terms(prompt: str, other: str) -> bool:
+    """
+    Returns whether two prompts agree on their `key_terms`: each prompt's key terms
+    appear among the other's words, in any case, so "france" still matches "France".
+    """
+    return key_terms(prompt) <= _words(other) and key_terms(other) <= _words(prompt)
+
+
+class HashingEmbedder:
+    """
+    A deterministic, offline text embedder based on feature hashing.
+
+    Word unigrams, word bigrams and character trigrams are hashed into a fixed
+    number of signed buckets with sub-linear term frequencies, and the vector is
+    L2-normalized, so the inner product of two embeddings is their cosine
+    similarity. It needs no model download and embeds a prompt in microseconds;
+    it captures lexical rather than deep semantic similarity, which is what
+    near-duplicate prompts (rewordings, casing, punctuation, word order) share.
+    Prompts differing in a single number, negation or entity also score as
+    near-duplicates, so the cache also checks they agree on their `key_terms`.
+    """
+
+    def __init__(self, dimension: int = 512):
+        """
+        Initializes the embedder.
+
+        Args:
+            dimension (int): Number of hash buckets (the embedding size).
+        """
+        self.dimension = dimension
+
+    def _features(self, text: str) -> List[str]:
+        """Returns the hashed features of a text."""
+        words = _WORD_PATTERN.findall(text.lower())
+        features = [f"w:{w}" for w in words]
+        features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"#{word}#"
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+
+    def __call__(self, text: str) -> np.ndarray:
+        """
+        Embeds a text.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            np.ndarray: A float32 vector of length `dimension` with unit norm (or all zeros).
+        """
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        counts: Dict[int, int] = {}
+        for feature in self._features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            bucket = h % self.dimension
+            counts[bucket] = counts.get(bucket, 0) + (1 if (h >> 31) & 1 else -1)
+        for bucket, count in counts.items():
+            vector[bucket] = np.sign(count) * (1.0 + np.log(abs(count))) if count else 0.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class CacheHit(NamedTuple):
+    """A cached answer returned for a prompt."""
+    answer: str
+    prompt: str
+    similarity: float
+
+
+class SemanticCache:
+    """
+    Caches chat answers by prompt similarity, per (provider, model) namespace.
+
+    A lookup hits only if an earlier prompt is at least `threshold` similar and
+    agrees on its `key_terms` (see `same_key_terms`). Entries expire after `ttl` seconds and each namespace keeps at most
+    `max_entries`, evicting the least recently used. All operations are
+    thread-safe; the SQLite database runs in WAL mode and is shared by every
+    session of the process.
+    """
+
+    # Nearest prompts compared by key terms per lookup
+    CANDIDATES = 4
+
+    def __init__(
+        self,
+        db_path: str,
+        embed: Optional[Callable[[str], np.ndarray]] = None,
+        threshold: float = 0.92,
+        ttl: float = 24 * 60 * 60,
+        max_entries: int = 5000,
+    ):
+        """
+        Initializes the cache, loading persisted entries into the FAISS indexes.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            embed (Optional[Callable[[str], np.ndarray]]): Embeds a prompt to a unit-norm
+                float32 vector; defaults to `HashingEmbedder`.
+            threshold (float): Minimum cosine similarity for a lookup to count as a hit.
+            ttl (float): Seconds an answer stays valid.
+            max_entries (int): Maximum entries per namespace.
+
+        Raises:
+            ValueError: If `threshold` is not in (0, 1].
+        """
+        import faiss  # imported here so the module loads even where FAISS is unavailable
+
+        if not 0 < threshold <= 1:
+            raise ValueError("The similarity threshold must be in (0, 1].")
+        self._faiss = faiss
+        self.db_path = db_path
+        self.embed = embed or HashingEmbedder()
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._indexes: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lookup_seconds: deque = deque(maxlen=1000)
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS semantic_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                namespace TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                last_hit REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_semantic_cache_namespace ON semantic_cache (namespace, last_hit)"
+        )
+        self.conn.commit()
+        self._load()
+
+    # ---- Indexes ---- #
+    def _index(self, namespace: str):
+        """Returns the FAISS index of a namespace, creating an empty one if needed."""
+        index = self._indexes.get(namespace)
+        if index is None:
+            dimension = len(self.embed(""))
+            index = self._faiss.IndexIDMap2(self._faiss.IndexFlatIP(dimension))
+            self._indexes[namespace] = index
+        return index
+
+    def _load(self) -> None:
+        """Drops expired entries and rebuilds the in-memory indexes from the database."""
+        self.conn.execute("DELETE FROM semantic_cache WHERE created_at <= ?", (time.time() - self.ttl,))
+        self.conn.commit()
+        rows = self.conn.execute("SELECT id, namespace, vector FROM semantic_cache").fetchall()
+        by_namespace: Dict[str, List] = {}
+        for entry_id, namespace, blob in rows:
+            by_namespace.setdefault(namespace, []).append((entry_id, np.frombuffer(blob, dtype=np.float32)))
+        for namespace, entries in by_namespace.items():
+            ids = np.array([entry_id for entry_id, _ in entries], dtype=np.int64)
+            self._index(namespace).add_with_ids(np.stack([vector for _, vector in entries]), ids)
+
+    def _remove(self, namespace: str, entry_ids: List[int]) -> None:
+        """Removes entries from a namespace's index and the database."""
+        if not entry_ids:
+            return
+        self._index(namespace).remove_ids(np.array(entry_ids, dtype=np.int64))
+        self.conn.executemany("DELETE FROM semantic_cache WHERE id = ?", [(i,) for i in entry_ids])
+        self.evictions += len(entry_ids)
+
+    # ---- Public API ---- #
+    def lookup(self, namespace: str, prompt: str) -> Optional[CacheHit]:
+        """
+        Returns the stored answer of the most similar earlier prompt, if similar enough.
+
+        Args:
+            namespace (str): The cache namespace, e.g., "Groq:qwen/qwen3-32b".
+            prompt (str): The user's prompt.
+
+        Returns:
+            Optional[CacheHit]: The cached answer, or None on a miss.
+        """
+        start = time.perf_counter()
+        vector = self.embed(prompt).reshape(1, -1)
+        with self._lock:
+            try:
+                index = self._indexes.get(namespace)
+                if index is None or index.ntotal == 0:
+                    self.misses += 1
+                    return None
+
+                # The nearest prompts may differ in a key term; the first that does not wins
+                row, similarity, entry_id = None, 0.0, -1
+                similarities, ids = index.search(vector, min(self.CANDIDATES, index.ntotal))
+                for candidate_similarity, candidate_id in zip(similarities[0], ids[0]):
+                    if candidate_id < 0 or candidate_similarity < self.threshold:
+                        break
+                    candidate = self.conn.execute(
+                        "SELECT prompt, answer, created_at FROM semantic_cache WHERE id = ?", (int(candidate_id),)
+                    ).fetchone()
+                    if candidate is not None and same_key_terms(prompt, candidate[0]):
+                        row, similarity, entry_id = candidate, float(candidate_similarity), int(candidate_id)
+                        break
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                now = time.time()
+                if row[2] <= now - self.ttl:
+                    self._remove(namespace, [entry_id])
+                    self.conn.commit()
+                    self.misses += 1
+                    return None
+
+                self.conn.execute(
+                    "UPDATE semantic_cache SET last_hit = ?, hits = hits + 1 WHERE id = ?", (now, entry_id)
+                )
+                self.conn.commit()
+                self.hits += 1
+                return CacheHit(answer=row[1], prompt=row[0], similarity=similarity)
+            finally:
+                self._lookup_seconds.append(time.perf_counter() - start)
+
+    def store(self, namespace: str, prompt: str, answer: str) -> None:
+        """
+        Stores the answer to a prompt, evicting expired and least recently used entries.
+
+        Args:
+            namespace (str): The cache namespace.
+            prompt (str): The user's prompt.
+            answer (str): The model's answer.
+        """
+        if not prompt.strip() or not answer.strip():
+            return
+        vector = self.embed(prompt)
+        if not np.any(vector):
+            return
+        now = time.time()
+        with self._lock:
+            entry_id = self.conn.execute(
+                "INSERT INTO semantic_cache (namespace, prompt, answer, vector, created_at, last_hit) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, prompt, answer, vector.astype(np.float32).tobytes(), now, now),
+            ).lastrowid
+            self._index(namespace).add_with_ids(vector.reshape(1, -1), np.array([entry_id], dtype=np.int64))
+            self.stores += 1
+
+            expired = [row[0] for row in self.conn.execute(
+                "SELECT id FROM semantic_cache WHERE namespace = ? AND created_at <= ?",
+                (namespace, now - self.ttl),
+            )]
+            self._remove(namespace, expired)
+            overflow = self._index(namespace).ntotal - self.max_entries
+            if overflow > 0:
+                self._remove(namespace, [row[0] for row in self.conn.execute(
+                    "SELECT id FROM semantic_cache WHERE namespace = ? ORDER BY last_hit LIMIT ?",
+                    (namespace, overflow),
+                )])
+            self.conn.commit()
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """
+        Removes every entry, or every entry of one namespace.
+
+        Args:
+            namespace (Optional[str]): The namespace to clear; all namespaces if None.
+        """
+        with self._lock:
+            if namespace is None:
+                self.conn.execute("DELETE FROM semantic_cache")
+                self._indexes.clear()
+            else:
+                self.conn.execute("DELETE FROM semantic_cache WHERE namespace = ?", (namespace,))
+                self._indexes.pop(namespace, None)
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters and lookup latency for this process.
+
+        Returns:
+            Dict[str, Any]: A snapshot of the cache metrics; latencies are in milliseconds.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            latencies = sorted(s * 1000 for s in self._lookup_seconds)
+            return {
+                "entries": sum(index.ntotal for index in self._indexes.values()),
+                "namespaces": len(self._indexes),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "lookup_ms_p50": statistics.median(latencies) if latencies else 0.0,
+                "lookup_ms_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            }
+
+
+# ---- Process-wide instance ---- #
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_failed = False
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    Returns the response cache shared by every session, opening it on first use.
+
+    Returns:
+        Optional[SemanticCache]: The cache, or None if it is disabled via
+                                 `SEMANTIC_CACHE_ENABLED` or FAISS is unavailable.
+    """
+    global _semantic_cache, _semantic_cache_failed
+    with _semantic_cache_lock:
+        if _semantic_cache is None and not _semantic_cache_failed:
+            if os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+                _semantic_cache_failed = True
+                return None
+            try:
+                _semantic_cache = SemanticCache(
+                    db_path=os.getenv("SEMANTIC_CACHE_PATH", "./.cache/semantic_cache.sqlite3"),
+                    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+                    ttl=float(os.getenv("SEMANTIC_CACHE_TTL_HOURS", "24")) * 60 * 60,
+                    max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000")),
+                )
+            except Exception as e:
+                _semantic_cache_failed = True
+                print(f"Warning: semantic response cache disabled, failed to initialize: {e}")
+        return _semantic_cache
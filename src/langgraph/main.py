@@ -5,62 +5,218 @@ This script initializes the user interface, handles user inputs from various UI
 components, sets up the appropriate LangGraph agent based on user selection,
 and displays the results.
 """
+import os
+import uuid
 import streamlit as st
-from typing import Dict, Any
+from typing import Dict, Any, TYPE_CHECKING
 
-# Local application imports
+# Local application imports. Only what the first page render needs is imported
+# here; providers, graphs and their stores load on the first request that uses
+# them (see `LLM_PROVIDERS`), which keeps the cold start of the app short.
 from src.langgraph.ui.streamlitui.loadui import LoadStreamlit
-from src.langgraph.llms.openrouterllm import OpenrouterLLM
-from src.langgraph.llms.groqllm import GroqLLM
-from src.langgraph.llms.nvidiallm import NvidiaLLM
-from src.langgraph.graph.graph_builder import GraphBuilder
-from src.langgraph.ui.streamlitui.display_result import DisplayResultStreamlit
+from src.langgraph.llms.providers import LLM_PROVIDERS
+from src.langgraph.ui.uiconfigfile import get_settings
+
+if TYPE_CHECKING:
+    from src.langgraph.graph.graph_registry import GraphKey
+
+
+def build_graph_key(ui_settings: Dict[str, Any]) -> "GraphKey":
+    """
+    Derives the graph registry key for the current UI selection.
+
+    The key includes the history budget and the fallback model from the settings,
+    so a reload of the config file that changes either one builds a new graph.
+
+    Args:
+        ui_settings (Dict[str, Any]): The settings returned by the UI loader.
+
+    Returns:
+        GraphKey: The key identifying the compiled graph for these settings.
+    """
+    from src.langgraph.graph.graph_builder import GraphBuilder
+    from src.langgraph.graph.graph_registry import GraphKey
+    from src.langgraph.llms.client_pool import hash_api_key
+
+    provider = ui_settings.get("selected_llm") or ""
+    usecase = ui_settings.get("selected_use_case") or ""
+    fallback = get_settings().fallback_model
+    return GraphKey(
+        provider=provider,
+        model=ui_settings.get(f"selected_{provider.lower()}_model") or "",
+        usecase=usecase,
+        tool_set=GraphBuilder.get_tool_names(usecase),
+        api_key_hash=hash_api_key(ui_settings.get(f"{provider.upper()}_API_KEY")),
+        history_token_budget=ui_settings.get("history_token_budget"),
+        fallback_model=":".join(fallback) if fallback else "",
+    )
+
+
+def create_llm(ui_settings: Dict[str, Any]):
+    """
+    Creates the selected language model, hedged with the configured fallback model.
+
+    Both models wait for their provider quota (see `Settings.rate_limits`) and
+    retry rate-limit errors. The fallback (see `Settings.fallback_model`) is only
+    used if it differs from the selected model and an API key for its provider is
+    available; otherwise, or if it cannot be created, the selected model is
+    returned on its own.
+
+    Args:
+        ui_settings (Dict[str, Any]): The settings returned by the UI loader.
+
+    Returns:
+        The chat model for the graph's nodes, or None if the selected one could not
+        be initialized.
+
+    Raises:
+        ValueError: If the selected provider is unsupported or its model fails to initialize.
+    """
+    from src.langgraph.llms.provider_router import get_provider_router
+    from src.langgraph.llms.rate_limiter import get_rate_limiters
+
+    provider = ui_settings.get("selected_llm") or ""
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    llm = LLM_PROVIDERS[provider](ui_settings).get_llm_model()
+    if llm is None:
+        return None
+    model = ui_settings.get(f"selected_{provider.lower()}_model") or ""
+    rate_limiters = get_rate_limiters()
+    llm = rate_limiters.limit(llm, provider, model)
+    fallback = get_settings().fallback_model
+    if fallback is None:
+        return llm
+
+    fallback_provider, fallback_model = fallback
+    key_name = f"{fallback_provider.upper()}_API_KEY"
+    api_key = (ui_settings.get(key_name) if fallback_provider == provider else None) or os.getenv(key_name, "")
+    if fallback == (provider, model) or fallback_provider not in LLM_PROVIDERS or not api_key:
+        return llm
+    try:
+        fallback_llm = LLM_PROVIDERS[fallback_provider]({
+            key_name: api_key, f"selected_{fallback_provider.lower()}_model": fallback_model,
+        }).get_llm_model()
+    except Exception as e:
+        print(f"Warning: could not initialize the fallback model {fallback_provider}:{fallback_model}: {e}")
+        return llm
+    if fallback_llm is None:
+        return llm
+    fallback_llm = rate_limiters.limit(fallback_llm, fallback_provider, fallback_model)
+    return get_provider_router().route(llm, f"{provider}:{model}", fallback_llm, f"{fallback_provider}:{fallback_model}")
+
+
+def build_graph(llm, ui_settings: Dict[str, Any]):
+    """
+    Builds and compiles the graph for the selected use case with the shared stores.
+
+    The graph records its node, model and tool metrics (see `instrument`),
+    labelled with the use case, provider and model.
+
+    Args:
+        llm: The language model the graph's nodes use.
+        ui_settings (Dict[str, Any]): The settings returned by the UI loader (or an
+                                      equivalent dictionary from the HTTP API).
+
+    Returns:
+        CompiledGraph: The compiled graph, or None if the use case is unknown.
+    """
+    from src.langgraph.graph.graph_builder import GraphBuilder
+    from src.langgraph.graph.instrumentation import instrument
+    from src.langgraph.llms.semantic_cache import get_semantic_cache
+    from src.langgraph.nodes.article_store import get_article_store
+    from src.langgraph.nodes.news_archive import get_news_archive
+    from src.langgraph.state.checkpointer import get_checkpointer
+
+    usecase = ui_settings.get("selected_use_case")
+    graph_key = build_graph_key(ui_settings)
+    graph = GraphBuilder(
+        llm,
+        checkpointer=get_checkpointer(),
+        history_token_budget=ui_settings.get("history_token_budget"),
+        response_cache=get_semantic_cache() if usecase == "Basic ChatBot" else None,
+        cache_namespace=f"{graph_key.provider}:{graph_key.model}",
+        article_store=get_article_store() if usecase == "AI News" else None,
+        news_archive=get_news_archive() if usecase == "AI News" else None,
+    ).setup_graph(usecase)
+    return instrument(graph, usecase, graph_key.provider, graph_key.model)
+
+
+def _get_thread_id(usecase: str) -> str:
+    """
+    Returns the checkpointer thread id of the current session's conversation for a use case.
+
+    The session id is created on first use and kept in `st.session_state`, so every
+    turn of a browser session resumes the same conversation. Each use case gets its
+    own thread, since their graphs expect different message histories.
+
+    Args:
+        usecase (str): The selected use case.
+
+    Returns:
+        str: The thread id to pass in the graph's run config.
+    """
+    if "thread_id" not in st.session_state:
+        st.session_state.thread_id = uuid.uuid4().hex
+    return f"{st.session_state.thread_id}:{usecase}"
 
 
 def process_request(user_message: str, ui_settings: Dict[str, Any]):
     """
     Initializes the model, builds the graph, and runs the agent to process the user's request.
 
-    This function serves as the core processing pipeline for any user input.
+    This function serves as the core processing pipeline for any user input. Compiled
+    graphs are kept in the process-wide graph registry, so repeat requests with the
+    same provider, model, use case and tool set skip model and graph construction.
+    The chatbot graphs are checkpointed per session, so each request only sends the
+    new message and the graph resumes the earlier turns from the checkpointer. AI News
+    requests are served from the reports the news scheduler keeps fresh.
 
     Args:
         user_message (str): The message or command from the user.
         ui_settings (Dict[str, Any]): A dictionary containing settings from the UI,
                                       like the selected LLM and use case.
     """
-    # A mapping from UI provider names to their respective LLM handler classes.
-    llm_providers = {
-        "Openrouter": OpenrouterLLM,
-        "Groq": GroqLLM,
-        "NVIDIA": NvidiaLLM,
-    }
+    from src.langgraph.graph.graph_registry import get_graph_registry
+    from src.langgraph.graph.news_scheduler import get_news_scheduler
+    from src.langgraph.ui.streamlitui.display_result import DisplayResultStreamlit
+
+    graph_registry = get_graph_registry()
 
     try:
-        # --- 1. Initialize the Language Model ---
+        # --- 1. Initialize the Language Model (only if the graph is not cached) ---
         selected_llm_provider = ui_settings.get("selected_llm")
-        llm_class = llm_providers.get(selected_llm_provider)
-        if not llm_class:
+        if selected_llm_provider not in LLM_PROVIDERS:
             st.error(f"❌ Unsupported LLM provider: {selected_llm_provider}")
             return
 
-        llm = llm_class(ui_settings).get_llm_model()
         usecase = ui_settings.get("selected_use_case")
+        graph_key = build_graph_key(ui_settings)
+        graph = graph_registry.get(graph_key)
+        llm = create_llm(ui_settings) if graph is None else None
 
     except Exception as e:
         st.error(f"⚠️ **Model Initialization Error:**\n\nCould not initialize the selected language model. Please check your API keys and model settings.\n\n*Details: {e}*")
         st.stop()
 
     try:
-        # --- 2. Build the appropriate graph ---
-        graph_builder = GraphBuilder(llm)
-        graph = graph_builder.setup_graph(usecase)
+        # --- 2. Build the appropriate graph (or reuse the registered one) ---
+        if graph is None:
+            graph = graph_registry.get_or_build(graph_key, lambda: build_graph(llm, ui_settings))
         if not graph:
             st.error(f"⚠️ **Graph Building Error:**\n\nCould not build the graph for the '{usecase}' use case.")
             st.stop()
 
-        # --- 3. Display the result on the UI ---
+        # --- 3. Serve AI News from the saved reports, kept fresh by the scheduler ---
+        news_scheduler = None
+        if usecase == "AI News":
+            news_scheduler = get_news_scheduler()
+            news_scheduler.start()
+
+        # --- 4. Display the result on the UI ---
         DisplayResultStreamlit(
-            usecase=usecase, graph=graph, user_message=user_message
+            usecase=usecase, graph=graph, user_message=user_message,
+            thread_id=_get_thread_id(usecase), news_scheduler=news_scheduler,
         ).display_result_on_ui()
 
     except Exception as e:
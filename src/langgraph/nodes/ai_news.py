@@ -1,31 +1,110 @@
+import asyncio
 import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.tools import BaseTool
 from langchain_tavily import TavilySearch
 
+from src.langgraph.nodes.article_store import ArticleStore
+from src.langgraph.nodes.news_archive import NewsArchive
+from src.langgraph.nodes.news_dedup import merge_results, published_at
+from src.langgraph.nodes.news_reports import REPORTS_DIR, write_report
 from src.langgraph.state.state import State
 
 # Load environment variables from a .env file
 load_dotenv()
 TAVILY_API_KEY: str | None = os.getenv("TAVILY_API_KEY")
 
+# Sub-queries searched concurrently for every report (override with AI_NEWS_QUERIES,
+# separated by ";"). Each one covers a region or subtopic the others may miss.
+DEFAULT_NEWS_QUERIES = (
+    "Top latest AI and technology news globally",
+    "Latest AI and technology news in India",
+    "Latest AI research breakthroughs and new model releases",
+    "Latest AI startup funding, acquisitions and big tech AI business news",
+    "Latest AI policy, regulation and safety news",
+)
+
+SUMMARY_MODES = ("map_reduce", "single")
+
+# Prompt of the map step: one article in, a few plain sentences out
+_ARTICLE_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are an expert assistant that summarizes technology and AI news. "
+            "Summarize the article in 3-4 clear sentences. Reply with the summary only.",
+        ),
+        ("human", "Title: {title}\nURL: {url}\nDate: {date}\nContent: {content}"),
+    ]
+)
+
+
+def format_article(article: Dict[str, Any], summary: str) -> str:
+    """
+    Formats one report entry in the markdown layout of the AI News report.
+
+    Args:
+        article (Dict[str, Any]): The search result.
+        summary (str): The article's summary.
+
+    Returns:
+        str: The markdown entry.
+    """
+    date = published_at(article)
+    return (
+        f"## [{article.get('title', 'Untitled')}]({article.get('url', '#')})\n"
+        f"#### Date: {date.strftime('%Y-%m-%d') if date else 'Unknown'}\n"
+        f"#### Summary: {summary.strip()}\n"
+    )
+
 
 class AINewsNode:
     """A collection of nodes for fetching, summarizing, and saving AI news."""
 
-    _OUTPUT_DIR = "./AINews"
-
-    def __init__(self, llm: BaseLanguageModel):
+    _OUTPUT_DIR = REPORTS_DIR
+
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        search: Optional[BaseTool] = None,
+        queries: Optional[Sequence[str]] = None,
+        max_articles: int = 15,
+        max_concurrency: int = 8,
+        summary_mode: Optional[str] = None,
+        summary_concurrency: Optional[int] = None,
+        article_store: Optional[ArticleStore] = None,
+        news_archive: Optional[NewsArchive] = None,
+    ):
         """
         Initializes the AINewsNode with a language model and the Tavily search client.
 
         Args:
             llm (BaseLanguageModel): An instance of a LangChain compatible language model.
+            search (Optional[BaseTool]): The news search tool; defaults to Tavily news search.
+            queries (Optional[Sequence[str]]): The sub-queries searched for each report;
+                defaults to `AI_NEWS_QUERIES` or `DEFAULT_NEWS_QUERIES`.
+            max_articles (int): Maximum number of articles kept after merging.
+            max_concurrency (int): Maximum number of searches in flight at once.
+            summary_mode (Optional[str]): "map_reduce" (summarize articles concurrently) or
+                "single" (one prompt for all articles); defaults to `AI_NEWS_SUMMARY_MODE`
+                or "map_reduce".
+            summary_concurrency (Optional[int]): Maximum article summaries generated at once
+                in map-reduce mode; defaults to `AI_NEWS_SUMMARY_CONCURRENCY` or 4.
+            article_store (Optional[ArticleStore]): Keeps article summaries between runs so
+                only new or changed articles are summarized (map-reduce mode only).
+            news_archive (Optional[NewsArchive]): Keeps every saved report and its articles
+                searchable after the report file is overwritten.
+
+        Raises:
+            ValueError: If the summary mode is unknown.
         """
         self.llm = llm
-        self.tavily = TavilySearch(
+        self.tavily = search or TavilySearch(
             api_key=TAVILY_API_KEY,
             max_results=10,
             search_depth="advanced",
@@ -33,11 +112,26 @@ class AINewsNode:
             topic="news",
             verbose=True,
         )
+        env_queries = [q.strip() for q in os.getenv("AI_NEWS_QUERIES", "").split(";") if q.strip()]
+        self.queries: List[str] = list(queries or env_queries or DEFAULT_NEWS_QUERIES)
+        self.max_articles = max_articles
+        self.max_concurrency = max_concurrency
+        self.summary_mode = summary_mode or os.getenv("AI_NEWS_SUMMARY_MODE", "map_reduce")
+        if self.summary_mode not in SUMMARY_MODES:
+            raise ValueError(f"Invalid summary mode: '{self.summary_mode}'. Must be one of: {', '.join(SUMMARY_MODES)}")
+        self.summary_concurrency = summary_concurrency or int(os.getenv("AI_NEWS_SUMMARY_CONCURRENCY", "4"))
+        self.article_store = article_store
+        self.news_archive = news_archive
 
     def fetch_news(self, state: State) -> State:
         """
         Fetches AI and technology news based on a frequency specified in the state.
 
+        All sub-queries are searched concurrently, so the wall time stays close to that
+        of a single search. Their results are merged, deduplicated by canonical URL and
+        near-duplicate content, and cut down to the `max_articles` best-ranked articles.
+        A failed sub-query is skipped as long as at least one succeeds.
+
         Args:
             state (State): The current graph state, expected to contain the frequency
                            in the last message.
@@ -48,38 +142,125 @@ class AINewsNode:
         Raises:
             ValueError: If the frequency is missing or invalid, or if the fetch fails.
         """
-        if not self.llm:
-            raise ValueError("Language model not provided to AINewsNode.")
-
         try:
-            if not state.get("messages"):
-                raise ValueError("No frequency found in state messages.")
-            
-            # Extract frequency from the last message in the conversation
-            frequency = state["messages"][-1].content.lower().strip()
-
-            time_range_map = {"daily": "d", "weekly": "w", "monthly": "m", "yearly": "y"}
-            if frequency not in time_range_map:
-                valid_options = ", ".join(time_range_map.keys())
-                raise ValueError(f"Invalid frequency: '{frequency}'. Must be one of: {valid_options}")
-
-            response = self.tavily.invoke(
-                input="Top 10 latest AI and technology-related news in India and globally.",
-                time_range=time_range_map[frequency],
+            frequency, inputs = self._search_inputs(state)
+            responses = self.tavily.batch(
+                inputs, config={"max_concurrency": self.max_concurrency}, return_exceptions=True
             )
-
-            state["news_data"] = response
-            state["frequency"] = frequency
-            return state
+            return self._merge_responses(state, frequency, responses)
 
         except Exception as e:
             # Wrap the original exception for better debugging
             raise ValueError(f"Failed to fetch AI News: {e}") from e
 
+    async def afetch_news(self, state: State) -> State:
+        """
+        Async variant of `fetch_news`: the searches are awaited instead of holding threads.
+
+        Args:
+            state (State): The current graph state, expected to contain the frequency
+                           in the last message.
+
+        Returns:
+            State: The updated state containing the fetched 'news_data' and 'frequency'.
+
+        Raises:
+            ValueError: If the frequency is missing or invalid, or if the fetch fails.
+        """
+        try:
+            frequency, inputs = self._search_inputs(state)
+            responses = await self.tavily.abatch(
+                inputs, config={"max_concurrency": self.max_concurrency}, return_exceptions=True
+            )
+            return self._merge_responses(state, frequency, responses)
+
+        except Exception as e:
+            raise ValueError(f"Failed to fetch AI News: {e}") from e
+
+    def _search_inputs(self, state: State) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        Reads the frequency from the state and returns it with one search input per sub-query.
+
+        Raises:
+            ValueError: If the frequency is missing or invalid.
+        """
+        if not self.llm:
+            raise ValueError("Language model not provided to AINewsNode.")
+        if not state.get("messages"):
+            raise ValueError("No frequency found in state messages.")
+
+        # Extract frequency from the last message in the conversation
+        frequency = state["messages"][-1].content.lower().strip()
+
+        time_range_map = {"daily": "day", "weekly": "week", "monthly": "month", "yearly": "year"}
+        if frequency not in time_range_map:
+            valid_options = ", ".join(time_range_map.keys())
+            raise ValueError(f"Invalid frequency: '{frequency}'. Must be one of: {valid_options}")
+        return frequency, [{"query": query, "time_range": time_range_map[frequency]} for query in self.queries]
+
+    def _merge_responses(self, state: State, frequency: str, responses: List[Any]) -> State:
+        """
+        Merges the search responses into the state's 'news_data'.
+
+        Raises:
+            ValueError: If every search failed.
+        """
+        succeeded = [r for r in responses if isinstance(r, dict) and "error" not in r]
+        if not succeeded:
+            raise ValueError(f"All {len(responses)} news searches failed: {responses[0]}")
+        if len(succeeded) < len(responses):
+            print(f"Warning: {len(responses) - len(succeeded)} of {len(responses)} news searches failed")
+
+        images = []
+        for response in succeeded:
+            images += [image for image in response.get("images") or [] if image not in images]
+
+        state["news_data"] = {
+            "results": merge_results([r.get("results") or [] for r in succeeded], self.max_articles),
+            "images": images[:self.max_articles],
+        }
+        state["frequency"] = frequency
+        return state
+
     def summarize_news(self, state: State) -> State:
         """
         Summarizes the fetched news articles into a reader-friendly markdown report.
 
+        In "map_reduce" mode each article is summarized by its own model call, all
+        running concurrently (up to `summary_concurrency` at once), and the report is
+        assembled in code with the latest articles first. A slow or failed generation
+        then only delays or affects its own article. With an article store, articles
+        summarized by an earlier run (of any frequency) are not summarized again. In
+        "single" mode one prompt covers every article and the model formats and
+        sorts the report itself.
+
+        Args:
+            state (State): The current graph state, expected to contain 'news_data'.
+
+        Returns:
+            State: The updated state with the generated 'summary' (and, in map-reduce
+                   mode, each article's summary in `news_data["summaries"]`).
+
+        Raises:
+            ValueError: If 'news_data' is not found in the state.
+        """
+        news_items = self._news_items(state)
+        if self.summary_mode == "single":
+            state["summary"] = self._single_chain().invoke({"articles": self._articles_text(news_items)}).content
+            return state
+
+        summaries = self.article_store.get_summaries(news_items) if self.article_store else [None] * len(news_items)
+        missing = [news_items[i] for i, summary in enumerate(summaries) if summary is None]
+        new_summaries = self._summarize_articles(missing) if missing else []
+        if self.article_store and missing:
+            self.article_store.put_summaries(missing, new_summaries)
+        return self._finish_report(state, summaries, new_summaries)
+
+    async def asummarize_news(self, state: State) -> State:
+        """
+        Async variant of `summarize_news`: model calls are awaited, and the article
+        store is read and written off the event loop.
+
         Args:
             state (State): The current graph state, expected to contain 'news_data'.
 
@@ -89,10 +270,147 @@ class AINewsNode:
         Raises:
             ValueError: If 'news_data' is not found in the state.
         """
-        news_items = state.get("news_data", {}).get("results", [])
+        news_items = self._news_items(state)
+        if self.summary_mode == "single":
+            response = await self._single_chain().ainvoke({"articles": self._articles_text(news_items)})
+            state["summary"] = response.content
+            return state
+
+        summaries = (
+            await asyncio.to_thread(self.article_store.get_summaries, news_items)
+            if self.article_store else [None] * len(news_items)
+        )
+        missing = [news_items[i] for i, summary in enumerate(summaries) if summary is None]
+        new_summaries = await self._asummarize_articles(missing) if missing else []
+        if self.article_store and missing:
+            await asyncio.to_thread(self.article_store.put_summaries, missing, new_summaries)
+        return self._finish_report(state, summaries, new_summaries)
+
+    @staticmethod
+    def _news_items(state: State) -> List[Dict[str, Any]]:
+        """
+        Returns the fetched articles from the state.
+
+        Raises:
+            ValueError: If 'news_data' is not found in the state.
+        """
+        news_items = (state.get("news_data") or {}).get("results", [])
         if not news_items:
             raise ValueError("No news data found in state. Please run fetch_news first.")
+        return news_items
 
+    def _finish_report(
+        self, state: State, summaries: List[Optional[str]], new_summaries: List[Optional[str]]
+    ) -> State:
+        """
+        Fills the missing summaries with the new ones and assembles the report.
+
+        Args:
+            state (State): The graph state holding 'news_data'.
+            summaries (List[Optional[str]]): One entry per article; None where the
+                                             article had to be summarized.
+            new_summaries (List[Optional[str]]): The new summaries of those articles, in
+                                                 order; None where the generation failed.
+
+        Returns:
+            State: The updated state with the 'summary'.
+        """
+        news_data = state["news_data"]
+        news_items = news_data["results"]
+        new = iter(new_summaries)
+        for i, summary in enumerate(summaries):
+            if summary is None:
+                # Fall back to the start of the snippet if the generation failed
+                summaries[i] = next(new) or (news_items[i].get("content") or "No summary available.")[:500]
+        news_data["summaries"] = summaries
+        state["summary"] = self._assemble_report(news_items, summaries, news_data.get("images") or [])
+        return state
+
+    @staticmethod
+    def _article_inputs(news_items: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Returns the map-step prompt inputs of the articles."""
+        return [
+            {
+                "title": article.get("title", "N/A"),
+                "url": article.get("url", "#"),
+                "date": article.get("published_date", "N/A"),
+                "content": article.get("content", "No content available."),
+            }
+            for article in news_items
+        ]
+
+    @staticmethod
+    def _collect_summaries(news_items: List[Dict[str, Any]], responses: List[Any]) -> List[Optional[str]]:
+        """Returns the text of each map-step response, or None where it failed."""
+        summaries = []
+        for article, response in zip(news_items, responses):
+            if isinstance(response, Exception) or not isinstance(response.content, str):
+                print(f"Warning: could not summarize '{article.get('title', 'N/A')}': {response}")
+                summaries.append(None)
+            else:
+                summaries.append(response.content)
+        return summaries
+
+    def _summarize_articles(self, news_items: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Map step: summarizes every article concurrently.
+
+        Args:
+            news_items (List[Dict[str, Any]]): The articles to summarize.
+
+        Returns:
+            List[Optional[str]]: One summary per article, in order, or None where the
+                                 generation failed.
+        """
+        responses = (_ARTICLE_PROMPT | self.llm).batch(
+            self._article_inputs(news_items),
+            config={"max_concurrency": self.summary_concurrency},
+            return_exceptions=True,
+        )
+        return self._collect_summaries(news_items, responses)
+
+    async def _asummarize_articles(self, news_items: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Async variant of `_summarize_articles`."""
+        responses = await (_ARTICLE_PROMPT | self.llm).abatch(
+            self._article_inputs(news_items),
+            config={"max_concurrency": self.summary_concurrency},
+            return_exceptions=True,
+        )
+        return self._collect_summaries(news_items, responses)
+
+    @staticmethod
+    def _assemble_report(news_items: List[Dict[str, Any]], summaries: List[str], images: List[Any]) -> str:
+        """
+        Reduce step: orders the summarized articles by date, latest first, and formats the report.
+
+        Args:
+            news_items (List[Dict[str, Any]]): The articles.
+            summaries (List[str]): Their summaries, in the same order.
+            images (List[Any]): Image URLs (or Tavily image objects) found by the searches.
+
+        Returns:
+            str: The markdown report.
+        """
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        entries = sorted(
+            zip(news_items, summaries),
+            key=lambda pair: published_at(pair[0]) or oldest,
+            reverse=True,
+        )
+        report = "\n".join(format_article(article, summary) for article, summary in entries)
+
+        urls = [image.get("url") if isinstance(image, dict) else image for image in images]
+        if urls := [url for url in urls if url]:
+            report += "\n## 📸 Images\n" + "\n".join(f"![AI news image]({url})" for url in urls)
+        return report
+
+    def _single_chain(self):
+        """
+        Returns the chain that summarizes every article with a single model call.
+
+        Returns:
+            Runnable: The prompt piped into the model; its input is `{"articles": ...}`.
+        """
         prompt_template = ChatPromptTemplate.from_messages(
             [
                 (
@@ -115,8 +433,12 @@ class AINewsNode:
                 ("human", "Please summarize the following articles:\n\n{articles}"),
             ]
         )
+        return prompt_template | self.llm
 
-        articles_str = "\n---\n".join(
+    @staticmethod
+    def _articles_text(news_items: List[Dict[str, Any]]) -> str:
+        """Returns the articles as the text block of the single-call prompt."""
+        return "\n---\n".join(
             [
                 f"Title: {article.get('title', 'N/A')}\n"
                 f"URL: {article.get('url', '#')}\n"
@@ -126,15 +448,14 @@ class AINewsNode:
             ]
         )
 
-        chain = prompt_template | self.llm
-        response = chain.invoke({"articles": articles_str})
-
-        state["summary"] = response.content
-        return state
-
     def save_result(self, state: State) -> State:
         """
-        Saves the news summary to a markdown file.
+        Saves the news summary as a new version of the frequency's report.
+
+        The markdown file and its version record are written atomically, so the
+        previous report stays readable until the new one is complete. With a news
+        archive, the report and its articles are also archived; a failure to archive
+        is reported but does not fail the run.
 
         Args:
             state (State): The current graph state, expected to contain 'summary' and 'frequency'.
@@ -151,16 +472,20 @@ class AINewsNode:
         if not summary or not frequency:
             raise ValueError("Summary or frequency not found in state. Please run summarize_news first.")
 
-        # Ensure the output directory exists
-        os.makedirs(self._OUTPUT_DIR, exist_ok=True)
-        
-        filename = os.path.join(self._OUTPUT_DIR, f"{frequency}_summary.md")
-
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(f"# {frequency.capitalize()} AI News Summary\n\n")
-            f.write(summary)
-            
-        print(f"✅ News summary saved to: {filename}")
-        
-        state["filename"] = filename
-        return state
\ No newline at end of file
+        news_data = state.get("news_data") or {}
+        articles = news_data.get("results") or []
+        report = write_report(frequency, summary, articles=len(articles), output_dir=self._OUTPUT_DIR)
+        print(f"✅ News summary saved to: {report.filename} (version {report.version})")
+
+        if self.news_archive:
+            try:
+                self.news_archive.add_report(report, articles, news_data.get("summaries"))
+            except Exception as e:
+                print(f"Warning: could not archive the {frequency} report: {e}")
+
+        state["filename"] = report.filename
+        return state
+
+    async def asave_result(self, state: State) -> State:
+        """Async variant of `save_result`; the files and the archive are written off the event loop."""
+        return await asyncio.to_thread(self.save_result, state)
@@ -0,0 +1,162 @@
+"""
+A persistent store of AI News articles and their summaries.
+
+Articles are keyed by canonical URL and remember a hash of the content they were
+summarized from. A report run only summarizes articles that are new or whose
+content changed since; every other summary is read back from the store. The
+store is shared by all report frequencies, so a story summarized for the daily
+report is reused by the weekly, monthly and yearly ones.
+"""
+# --- Standard Library Imports ---
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# --- Local Application Imports ---
+from src.langgraph.nodes.news_dedup import canonical_url
+
+
+def content_hash(article: Dict[str, Any]) -> str:
+    """Returns a hash of the article fields a summary is based on (whitespace and case insensitive)."""
+    text = " ".join(f"{article.get('title', '')}\n{article.get('content', '')}".lower().split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """
+    Stores article summaries in SQLite, keyed by canonical URL and content hash.
+
+    The database runs in WAL mode and is shared by every session of the process
+    through a single connection guarded by a lock. Articles not seen in any report
+    for `retention` seconds are deleted.
+    """
+
+    def __init__(self, db_path: str, retention: float = 400 * 24 * 60 * 60):
+        """
+        Initializes the store and creates the database if needed.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            retention (float): Seconds an article is kept after it was last seen. The
+                               default covers the yearly report.
+        """
+        self.db_path = db_path
+        self.retention = retention
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.stored = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                title TEXT NOT NULL,
+                source_url TEXT NOT NULL,
+                published_date TEXT,
+                summary TEXT NOT NULL,
+                summarized_at REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_last_seen ON articles (last_seen)")
+        self.conn.commit()
+
+    def get_summaries(self, articles: Sequence[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Returns the stored summary of each article, if its content is unchanged.
+
+        Every article found is marked as seen now, which keeps it from expiring.
+
+        Args:
+            articles (Sequence[Dict[str, Any]]): Search results.
+
+        Returns:
+            List[Optional[str]]: One entry per article: its summary, or None if the
+                                 article is new or changed and must be summarized.
+        """
+        keys = [canonical_url(article.get("url", "")) for article in articles]
+        with self._lock:
+            rows = {}
+            for key in set(keys):
+                row = self.conn.execute(
+                    "SELECT content_hash, summary FROM articles WHERE url = ?", (key,)
+                ).fetchone()
+                if row:
+                    rows[key] = row
+            summaries = [
+                rows[key][1] if key in rows and rows[key][0] == content_hash(article) else None
+                for key, article in zip(keys, articles)
+            ]
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE articles SET last_seen = ? WHERE url = ?", [(now, key) for key in rows]
+            )
+            self.conn.commit()
+            self.reused += sum(1 for summary in summaries if summary is not None)
+        return summaries
+
+    def put_summaries(self, articles: Sequence[Dict[str, Any]], summaries: Sequence[Optional[str]]) -> None:
+        """
+        Stores new summaries, replacing those of changed articles. None entries are skipped.
+
+        Args:
+            articles (Sequence[Dict[str, Any]]): Search results.
+            summaries (Sequence[Optional[str]]): Their summaries, in the same order.
+        """
+        now = time.time()
+        rows = [
+            (
+                canonical_url(article.get("url", "")), content_hash(article), article.get("title", "Untitled"),
+                article.get("url", "#"), article.get("published_date"), summary, now, now,
+            )
+            for article, summary in zip(articles, summaries)
+            if summary
+        ]
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO articles (url, content_hash, title, source_url, published_date, "
+                "summary, summarized_at, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute("DELETE FROM articles WHERE last_seen < ?", (now - self.retention,))
+            self.conn.commit()
+            self.stored += len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of stored articles and the reuse counters of this process.
+
+        Returns:
+            Dict[str, Any]: A snapshot of the store metrics.
+        """
+        with self._lock:
+            articles = self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            return {"articles": articles, "reused": self.reused, "stored": self.stored}
+
+
+# ---- Process-wide instance ---- #
+_article_store: Optional[ArticleStore] = None
+_article_store_lock = threading.Lock()
+
+
+def get_article_store() -> ArticleStore:
+    """
+    Returns the article store, opening its database on first use.
+
+    Returns:
+        ArticleStore: The store shared by every AI News graph in this process.
+    """
+    global _article_store
+    with _article_store_lock:
+        if _article_store is None:
+            _article_store = ArticleStore(os.getenv("AI_NEWS_STORE_PATH", "./.cache/ai_news.sqlite3"))
+        return _article_store
@@ -1,20 +1,92 @@
+import asyncio
+from typing import List, Optional, Tuple
 from langchain_core.language_models import BaseLanguageModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from src.langgraph.llms.semantic_cache import SemanticCache
+from src.langgraph.nodes.message_trimmer import MessageTrimmer
 from src.langgraph.state.state import State
 
 
 class BasicChatBotNode:
     """A stateless node that processes conversation history through an LLM."""
 
-    def __init__(self, model: BaseLanguageModel):
+    def __init__(
+        self,
+        model: BaseLanguageModel,
+        trimmer: Optional[MessageTrimmer] = None,
+        cache: Optional[SemanticCache] = None,
+        cache_namespace: str = "",
+    ):
         """
         Initializes the node with a language model.
 
         Args:
             model (BaseLanguageModel): An instance of a LangChain compatible language model.
+            trimmer (Optional[MessageTrimmer]): Fits the history into the model's context
+                                                budget; if None, the full history is sent.
+            cache (Optional[SemanticCache]): Answers near-duplicate prompts without calling
+                                             the model; if None, every prompt is sent.
+            cache_namespace (str): The cache namespace of this model, e.g., "Groq:qwen/qwen3-32b".
         """
         if not model:
             raise ValueError("A language model instance must be provided.")
         self.llm = model
+        self.trimmer = trimmer
+        self.cache = cache
+        self.cache_namespace = cache_namespace or type(model).__name__
+
+    @staticmethod
+    def _standalone_prompt(messages: List[BaseMessage]) -> Optional[str]:
+        """
+        Returns the prompt if the conversation is a single question, else None.
+
+        Only the first question of a conversation is cached: later ones may depend
+        on earlier turns (e.g., "and what about the second one?").
+        """
+        turns = [m for m in messages if not isinstance(m, SystemMessage)]
+        if len(turns) == 1 and isinstance(turns[0], HumanMessage) and isinstance(turns[0].content, str):
+            return turns[0].content
+        return None
+
+    def _prepare(self, state: State) -> Tuple[List[BaseMessage], Optional[str], Optional[dict]]:
+        """
+        Trims the history and looks the prompt up in the semantic cache.
+
+        Returns:
+            Tuple[List[BaseMessage], Optional[str], Optional[dict]]: The messages to send,
+            the cacheable standalone prompt (or None), and the state update to return
+            without calling the model (or None if the model must be called).
+        """
+        # Get the list of messages from the current state
+        messages = state.get("messages", [])
+        if not messages:
+            # Handle cases where the input might be empty
+            return messages, None, {"messages": []}
+
+        # Answer near-duplicates of earlier standalone prompts from the cache. This looks
+        # at the full history: once earlier turns are trimmed away, a follow-up question
+        # would look standalone
+        prompt = self._standalone_prompt(messages) if self.cache else None
+
+        if self.trimmer:
+            messages = self.trimmer.trim(messages)
+
+        if prompt:
+            hit = self.cache.lookup(self.cache_namespace, prompt)
+            if hit:
+                return messages, prompt, {"messages": [AIMessage(
+                    content=hit.answer,
+                    response_metadata={"semantic_cache": {"similarity": hit.similarity, "prompt": hit.prompt}},
+                )]}
+        return messages, prompt, None
+
+    def _finish(self, prompt: Optional[str], response: BaseMessage) -> dict:
+        """Caches the answer to a standalone prompt and returns the state update."""
+        if prompt and isinstance(response.content, str):
+            self.cache.store(self.cache_namespace, prompt, response.content)
+
+        # Return the response in a format that updates the 'messages' key in the state
+        return {"messages": [response]}
 
     def process(self, state: State) -> dict:
         """
@@ -30,18 +102,44 @@ class BasicChatBotNode:
             ValueError: If the language model fails to generate a response.
         """
         try:
-            # Get the list of messages from the current state
-            messages = state.get("messages", [])
-            if not messages:
-                # Handle cases where the input might be empty
-                return {"messages": []}
+            messages, prompt, update = self._prepare(state)
+            if update is not None:
+                return update
 
             # Invoke the LLM with the conversation history
-            response = self.llm.invoke(messages)
-            
-            # Return the response in a format that updates the 'messages' key in the state
-            return {"messages": [response]}
-        
+            return self._finish(prompt, self.llm.invoke(messages))
+
         except Exception as e:
             # Wrap the original exception for better error diagnosis
-            raise ValueError(f"Failed to process chatbot response: {e}") from e
\ No newline at end of file
+            raise ValueError(f"Failed to process chatbot response: {e}") from e
+
+    async def aprocess(self, state: State) -> dict:
+        """
+        Async variant of `process`: the model call is awaited, so a waiting
+        conversation does not hold a thread.
+
+        Args:
+            state (State): The current graph state, containing the list of messages.
+
+        Returns:
+            dict: A dictionary with the model's response message to update the state.
+
+        Raises:
+            ValueError: If the language model fails to generate a response.
+        """
+        try:
+            # Cache lookups and stores embed the prompt, so they run off the event loop
+            if self.cache:
+                messages, prompt, update = await asyncio.to_thread(self._prepare, state)
+            else:
+                messages, prompt, update = self._prepare(state)
+            if update is not None:
+                return update
+
+            response = await self.llm.ainvoke(messages)
+            if prompt:
+                return await asyncio.to_thread(self._finish, prompt, response)
+            return self._finish(prompt, response)
+
+        except Exception as e:
+            raise ValueError(f"Failed to process chatbot response: {e}") from e
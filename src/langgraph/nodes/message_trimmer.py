@@ -0,0 +1,175 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from src.langgraph.nodes.tool_output_compactor import estimate_tokens
+
+# Tokens a chat template adds around every message (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def count_message_tokens(message: BaseMessage) -> int:
+    """
+    Estimates the prompt tokens of one message, including its tool calls.
+
+    Args:
+        message (BaseMessage): The message to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content, default=str)
+    tokens = estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+    if isinstance(message, AIMessage) and message.tool_calls:
+        tokens += estimate_tokens(json.dumps(message.tool_calls, default=str))
+    return tokens
+
+
+class TokenCounter:
+    """
+    Counts message tokens, caching the result per message id.
+
+    A message is re-counted only if its content changes size under the same id
+    (e.g., a tool output replaced by its compacted version), so each turn only
+    pays for the messages that are new since the last one.
+    """
+
+    def __init__(self, count: Callable[[BaseMessage], int] = count_message_tokens, max_entries: int = 50_000):
+        """
+        Initializes an empty counter.
+
+        Args:
+            count (Callable[[BaseMessage], int]): Counts the tokens of an uncached message.
+            max_entries (int): Maximum number of cached counts; least recently used are dropped.
+        """
+        self.count = count
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, message: BaseMessage) -> int:
+        """Returns the token count of a message, from the cache when possible."""
+        if message.id is None:
+            return self.count(message)
+
+        key = (message.id, message.type, len(message.content))
+        with self._lock:
+            tokens = self._counts.get(key)
+            if tokens is not None:
+                self._counts.move_to_end(key)
+                self.hits += 1
+                return tokens
+
+        tokens = self.count(message)
+        with self._lock:
+            self.misses += 1
+            self._counts[key] = tokens
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return tokens
+
+
+_token_counter: Optional[TokenCounter] = None
+_token_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    Returns the token counter shared by every graph in this process.
+
+    Message ids are unique, so one cache serves all sessions and models.
+    """
+    global _token_counter
+    with _token_counter_lock:
+        if _token_counter is None:
+            _token_counter = TokenCounter()
+        return _token_counter
+
+
+class MessageTrimmer:
+    """
+    Fits the conversation history into a model's context budget before each call.
+
+    Trimming only affects what is sent to the model; the full history stays in the
+    graph state. Leading system messages are always kept, then whole units are
+    added from the newest backwards until the budget is used up. A unit is a single
+    message, or an AI message together with all the tool results answering its
+    tool calls, so a tool call is never sent without its results (or vice versa).
+    The kept history starts at a human message where possible, as most providers
+    expect.
+    """
+
+    def __init__(self, max_tokens: int, counter: Optional[Callable[[BaseMessage], int]] = None):
+        """
+        Initializes the trimmer.
+
+        Args:
+            max_tokens (int): Token budget for the messages sent to the model.
+            counter (Optional[Callable[[BaseMessage], int]]): Counts a message's tokens;
+                defaults to the shared cached `TokenCounter`.
+
+        Raises:
+            ValueError: If `max_tokens` is not positive.
+        """
+        if max_tokens < 1:
+            raise ValueError("The token budget must be positive.")
+        self.max_tokens = max_tokens
+        self.counter = counter or get_token_counter()
+
+    def trim(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        Returns the most recent messages that fit within the token budget.
+
+        The latest unit is always kept, even if it alone exceeds the budget.
+
+        Args:
+            messages (Sequence[BaseMessage]): The full conversation history.
+
+        Returns:
+            List[BaseMessage]: The messages to send to the model, in their original order.
+        """
+        head = 0
+        while head < len(messages) and isinstance(messages[head], SystemMessage):
+            head += 1
+        used = sum(self.counter(m) for m in messages[:head])
+
+        # Walk back one unit at a time; only the kept messages are ever counted
+        units: List[Sequence[BaseMessage]] = []
+        end = len(messages)
+        while end > head:
+            unit_start = end - 1
+            if isinstance(messages[unit_start], ToolMessage):
+                while unit_start > head and isinstance(messages[unit_start - 1], ToolMessage):
+                    unit_start -= 1
+                caller = messages[unit_start - 1] if unit_start > head else None
+                if not (isinstance(caller, AIMessage) and caller.tool_calls):
+                    # Tool results whose call is gone cannot be sent on their own
+                    end = unit_start
+                    continue
+                unit_start -= 1
+            elif isinstance(messages[unit_start], AIMessage) and messages[unit_start].tool_calls:
+                # Likewise a tool call whose results are missing (e.g., an interrupted run)
+                end = unit_start
+                continue
+
+            unit = messages[unit_start:end]
+            cost = sum(self.counter(m) for m in unit)
+            if units and used + cost > self.max_tokens:
+                break
+            used += cost
+            units.append(unit)
+            end = unit_start
+
+        if end == head and sum(len(unit) for unit in units) == len(messages) - head:
+            return list(messages)
+
+        # Prefer starting the kept history on a human turn
+        units.reverse()
+        first_human = next(
+            (i for i, unit in enumerate(units) if isinstance(unit[0], HumanMessage)), 0
+        )
+        return [*messages[:head], *(m for unit in units[first_human:] for m in unit)]
@@ -0,0 +1,353 @@
+"""
+A compressed, searchable archive of every generated AI News report.
+
+The current report of each frequency is overwritten by every refresh, so past
+reports are kept here instead. Report bodies and article summaries are stored
+zlib-compressed in SQLite; each distinct article (canonical URL and content) is
+stored once however many reports include it, and is indexed by an FTS5 table
+for keyword search. The FTS5 table is contentless (it keeps only the index, not
+a second copy of the text) and is joined back to the articles by rowid, with
+publication dates filtered through their own index.
+"""
+# --- Standard Library Imports ---
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+# --- Local Application Imports ---
+from src.langgraph.nodes.article_store import content_hash
+from src.langgraph.nodes.news_dedup import canonical_url, published_at
+from src.langgraph.nodes.news_reports import NewsReport
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class ArchivedReport(NamedTuple):
+    """An archived report, without its body (see `NewsArchive.get_markdown`)."""
+    id: int
+    frequency: str
+    version: int
+    generated_at: float
+    articles: int
+
+
+class ArchivedArticle(NamedTuple):
+    """
+    An article found by `NewsArchive.search`.
+
+    Attributes:
+        title: The article's title.
+        url: The article's URL.
+        published_at: Unix time of publication, or of the first report that
+                      included the article if the date is unknown.
+        summary: The article's summary (or search snippet).
+    """
+    title: str
+    url: str
+    published_at: float
+    summary: str
+
+
+def _match_query(query: str) -> str:
+    """
+    Turns free text into an FTS5 query that matches articles containing every word.
+
+    Each word is quoted, so user input can never be parsed as FTS5 syntax, and the
+    last word matches as a prefix so partly typed words still find results.
+    """
+    tokens = _TOKEN_PATTERN.findall(query.lower())
+    if not tokens:
+        return ""
+    return " ".join(f'"{token}"' for token in tokens[:-1]) + f' "{tokens[-1]}"*'
+
+
+class NewsArchive:
+    """
+    Stores every AI News report and its articles in SQLite, with full-text search.
+
+    One connection is shared by every session of the process and guarded by a
+    lock. Recently requested report bodies are kept decompressed in memory.
+    """
+
+    def __init__(self, db_path: str, compression_level: int = 6, memory_reports: int = 16):
+        """
+        Initializes the archive and creates the database if needed.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            compression_level (int): zlib level used for report bodies and summaries.
+            memory_reports (int): Number of decompressed report bodies kept in memory.
+        """
+        self.db_path = db_path
+        self.compression_level = compression_level
+        self.memory_reports = memory_reports
+        self._lock = threading.Lock()
+        self._bodies: "OrderedDict[int, str]" = OrderedDict()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY,
+                frequency TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                generated_at REAL NOT NULL,
+                articles INTEGER NOT NULL,
+                body BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_reports_generated ON reports (frequency, generated_at);
+
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash BLOB NOT NULL,
+                title TEXT NOT NULL,
+                source_url TEXT NOT NULL,
+                published_at REAL NOT NULL,
+                summary BLOB NOT NULL,
+                UNIQUE (url, content_hash)
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at);
+
+            CREATE TABLE IF NOT EXISTS report_articles (
+                report_id INTEGER NOT NULL,
+                article_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (report_id, article_id)
+            ) WITHOUT ROWID;
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, summary, content='', tokenize='porter unicode61', prefix='2 3 4'
+            );
+            """
+        )
+        self.conn.commit()
+
+    def _compress(self, text: str) -> bytes:
+        """Compresses text for storage."""
+        return zlib.compress(text.encode("utf-8"), self.compression_level)
+
+    @staticmethod
+    def _decompress(blob: bytes) -> str:
+        """Restores text stored by `_compress`."""
+        return zlib.decompress(blob).decode("utf-8")
+
+    def add_report(
+        self,
+        report: NewsReport,
+        articles: Sequence[Dict[str, Any]],
+        summaries: Optional[Sequence[Optional[str]]] = None,
+    ) -> int:
+        """
+        Archives a saved report and the articles it covers.
+
+        Articles already archived with the same content are linked to the report
+        rather than stored and indexed again.
+
+        Args:
+            report (NewsReport): The saved report.
+            articles (Sequence[Dict[str, Any]]): The search results the report covers.
+            summaries (Optional[Sequence[Optional[str]]]): The summary of each article, in
+                order; the article's search snippet is archived where it is missing.
+
+        Returns:
+            int: The archived report's id.
+        """
+        summaries = list(summaries or [])
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO reports (frequency, version, generated_at, articles, body) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (report.frequency, report.version, report.generated_at, len(articles),
+                 self._compress(report.markdown)),
+            )
+            report_id = cursor.lastrowid
+            for position, article in enumerate(articles):
+                url, digest = canonical_url(article.get("url", "")), bytes.fromhex(content_hash(article))[:16]
+                row = self.conn.execute(
+                    "SELECT id FROM articles WHERE url = ? AND content_hash = ?", (url, digest)
+                ).fetchone()
+                if row:
+                    article_id = row[0]
+                else:
+                    title = article.get("title") or "Untitled"
+                    summary = (summaries[position] if position < len(summaries) else None) \
+                        or article.get("content") or ""
+                    published = published_at(article)
+                    article_id = self.conn.execute(
+                        "INSERT INTO articles (url, content_hash, title, source_url, published_at, summary) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (url, digest, title, article.get("url", "#"),
+                         published.timestamp() if published else report.generated_at, self._compress(summary)),
+                    ).lastrowid
+                    self.conn.execute(
+                        "INSERT INTO articles_fts (rowid, title, summary) VALUES (?, ?, ?)",
+                        (article_id, title, summary),
+                    )
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO report_articles (report_id, article_id, position) VALUES (?, ?, ?)",
+                    (report_id, article_id, position),
+                )
+        return report_id
+
+    def search(
+        self,
+        query: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 20,
+        order: str = "recent",
+    ) -> List[ArchivedArticle]:
+        """
+        Finds archived articles containing every word of a query.
+
+        Articles are numbered in the order they were archived, which follows their
+        publication dates closely. A date range is therefore first turned into a
+        range of article numbers through the date index, so the full-text index only
+        visits matches from that period. Both orders sort every match: "recent" by
+        publication date, since late or backfilled articles are archived out of
+        order, and "relevance" by BM25 score, which is the slower of the two.
+
+        Args:
+            query (str): Free-text keywords; matched against titles and summaries,
+                         with English stemming.
+            since (Optional[float]): Only articles published at or after this Unix time.
+            until (Optional[float]): Only articles published before this Unix time.
+            limit (int): Maximum number of articles returned.
+            order (str): "recent" (newest first) or "relevance" (best match first).
+
+        Returns:
+            List[ArchivedArticle]: The matching articles.
+
+        Raises:
+            ValueError: If the order is unknown.
+        """
+        if order not in ("recent", "relevance"):
+            raise ValueError(f"Invalid search order: '{order}'. Must be one of: recent, relevance")
+        match = _match_query(query)
+        if not match:
+            return []
+        since = since if since is not None else float("-inf")
+        until = until if until is not None else float("inf")
+
+        with self._lock:
+            first, last = 0, 2 ** 63 - 1
+            if since > float("-inf") or until < float("inf"):
+                first, last = self.conn.execute(
+                    "SELECT MIN(id), MAX(id) FROM articles WHERE published_at >= ? AND published_at < ?",
+                    (since, until),
+                ).fetchone()
+                if first is None:
+                    return []
+            # CROSS JOIN keeps the full-text index as the outer loop, so the date
+            # index on `articles` cannot be chosen to drive the query instead
+            rows = self.conn.execute(
+                "SELECT a.title, a.source_url, a.published_at, a.summary "
+                "FROM articles_fts CROSS JOIN articles a ON a.id = articles_fts.rowid "
+                "WHERE articles_fts MATCH ? AND articles_fts.rowid BETWEEN ? AND ? "
+                "AND a.published_at >= ? AND a.published_at < ? "
+                f"ORDER BY {'a.published_at DESC, a.id DESC' if order == 'recent' else 'articles_fts.rank'} LIMIT ?",
+                (match, first, last, since, until, limit),
+            ).fetchall()
+        return [
+            ArchivedArticle(title=title, url=url, published_at=published, summary=self._decompress(summary))
+            for title, url, published, summary in rows
+        ]
+
+    def list_reports(
+        self,
+        frequency: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+    ) -> List[ArchivedReport]:
+        """
+        Lists archived reports, newest first.
+
+        Args:
+            frequency (Optional[str]): Only reports of this time frame.
+            since (Optional[float]): Only reports generated at or after this Unix time.
+            until (Optional[float]): Only reports generated before this Unix time.
+            limit (int): Maximum number of reports returned.
+
+        Returns:
+            List[ArchivedReport]: The matching reports.
+        """
+        clauses, params = ["generated_at >= ?", "generated_at < ?"], [
+            since if since is not None else float("-inf"),
+            until if until is not None else float("inf"),
+        ]
+        if frequency:
+            clauses.append("frequency = ?")
+            params.append(frequency)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, frequency, version, generated_at, articles FROM reports "
+                f"WHERE {' AND '.join(clauses)} ORDER BY generated_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [ArchivedReport(*row) for row in rows]
+
+    def get_markdown(self, report_id: int) -> Optional[str]:
+        """
+        Returns an archived report's markdown document.
+
+        Args:
+            report_id (int): The id returned by `add_report` or `list_reports`.
+
+        Returns:
+            Optional[str]: The document, or None if there is no such report.
+        """
+        with self._lock:
+            body = self._bodies.get(report_id)
+            if body is not None:
+                self._bodies.move_to_end(report_id)
+                return body
+            row = self.conn.execute("SELECT body FROM reports WHERE id = ?", (report_id,)).fetchone()
+            if row is None:
+                return None
+            body = self._decompress(row[0])
+            self._bodies[report_id] = body
+            while len(self._bodies) > self.memory_reports:
+                self._bodies.popitem(last=False)
+            return body
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the archive's size.
+
+        Returns:
+            Dict[str, Any]: Report and article counts and the database size in bytes.
+        """
+        with self._lock:
+            reports = self.conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+            articles = self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        return {"reports": reports, "articles": articles, "db_bytes": pages * page_size}
+
+
+# ---- Process-wide instance ---- #
+_news_archive: Optional[NewsArchive] = None
+_news_archive_lock = threading.Lock()
+
+
+def get_news_archive() -> NewsArchive:
+    """
+    Returns the AI News archive, opening its database on first use.
+
+    Returns:
+        NewsArchive: The archive shared by every AI News graph and session in this process.
+    """
+    global _news_archive
+    with _news_archive_lock:
+        if _news_archive is None:
+            _news_archive = NewsArchive(os.getenv("AI_NEWS_ARCHIVE_PATH", "./.cache/ai_news_archive.sqlite3"))
+        return _news_archive
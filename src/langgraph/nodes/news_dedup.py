@@ -0,0 +1,151 @@
+import hashlib
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_", "ref", "cmpid", "ocid", "guccounter")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalizes an article URL so the same article found by different queries compares equal.
+
+    Lower-cases the scheme and host, drops a leading "www." and "m.", tracking
+    parameters, fragments and trailing slashes, and sorts the remaining parameters.
+
+    Args:
+        url (str): The article URL.
+
+    Returns:
+        str: The canonical form of the URL.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(params), ""))
+
+
+def published_at(article: Dict[str, Any]) -> Optional[datetime]:
+    """
+    Parses an article's publication date.
+
+    Tavily returns RFC 2822 dates for news ("Mon, 16 Jun 2025 14:03:00 GMT") and
+    ISO 8601 dates elsewhere.
+
+    Args:
+        article (Dict[str, Any]): A search result.
+
+    Returns:
+        Optional[datetime]: The timezone-aware publication time, or None if unknown.
+    """
+    value = (article.get("published_date") or "").strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Computes a 64-bit SimHash of a text over word shingles.
+
+    Texts that share most of their shingles (e.g., the same wire story on two
+    sites) get fingerprints that differ in only a few bits.
+
+    Args:
+        text (str): The text to fingerprint.
+        shingle_size (int): Number of words per shingle.
+
+    Returns:
+        int: The 64-bit fingerprint.
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    shingles = [" ".join(words[i:i + shingle_size]) for i in range(max(1, len(words) - shingle_size + 1))]
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles],
+        dtype=np.uint64,
+    )
+    # Per bit: +1 for every shingle hash with the bit set, -1 otherwise
+    bits = (hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    votes = 2 * bits.astype(np.int64).sum(axis=0) - len(shingles)
+    return sum(1 << bit for bit in np.flatnonzero(votes > 0).tolist())
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Returns the number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def merge_results(
+    result_lists: Sequence[Sequence[Dict[str, Any]]],
+    max_articles: int,
+    max_distance: int = 8,
+) -> List[Dict[str, Any]]:
+    """
+    Merges the results of several searches into one ranked, deduplicated article list.
+
+    Articles are deduplicated by canonical URL first and then by near-duplicate
+    content (SimHash of title and content within `max_distance` bits). Duplicates
+    are folded into the first copy, which keeps the best relevance score and counts
+    how many searches found the story. Articles are ranked by their best score plus
+    a small bonus per additional search that found them.
+
+    Args:
+        result_lists (Sequence[Sequence[Dict[str, Any]]]): The `results` of each search.
+        max_articles (int): Maximum number of articles to keep.
+        max_distance (int): Maximum SimHash distance for two articles to be duplicates.
+                            Search snippets are short, so a single edited word already
+                            flips ~5 of the 64 bits, while unrelated snippets differ in ~30.
+
+    Returns:
+        List[Dict[str, Any]]: The kept articles, best first.
+    """
+    by_url: Dict[str, Dict[str, Any]] = {}
+    fingerprints: List[tuple] = []  # (fingerprint, canonical url of the kept copy)
+
+    for results in result_lists:
+        for article in results:
+            url = article.get("url")
+            if not url:
+                continue
+            key = canonical_url(url)
+            if key not in by_url:
+                fingerprint = simhash(f"{article.get('title', '')} {article.get('content', '')}")
+                key = next(
+                    (kept for fp, kept in fingerprints if hamming_distance(fp, fingerprint) <= max_distance),
+                    key,
+                )
+                if key not in by_url:
+                    by_url[key] = {**article, "found_by": 0}
+                    fingerprints.append((fingerprint, key))
+
+            kept = by_url[key]
+            kept["found_by"] += 1
+            kept["score"] = max(kept.get("score") or 0.0, article.get("score") or 0.0)
+
+    ranked = sorted(
+        by_url.values(),
+        key=lambda a: (a.get("score") or 0.0) + 0.05 * (a["found_by"] - 1),
+        reverse=True,
+    )
+    return ranked[:max_articles]
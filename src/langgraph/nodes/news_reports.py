@@ -0,0 +1,156 @@
+"""
+Versioned, atomically written AI News reports.
+
+Each frequency has two files in the reports directory: the markdown report a
+user downloads (`daily_summary.md`) and a JSON record (`daily_summary.json`)
+holding the same report with its version and generation time. Both are written
+to a temporary file first and moved into place, so a reader never sees a
+half-written report while a refresh is saving a new one. Reports that were read
+once are served from memory until their record changes on disk.
+"""
+# --- Standard Library Imports ---
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+REPORTS_DIR = "./AINews"
+
+# Serializes writers in this process, so two refreshes of a frequency cannot
+# both read version N and save version N + 1
+_write_lock = threading.Lock()
+
+# Reports read or written by this process, keyed by record path: (mtime_ns, size, report)
+_loaded: Dict[str, Tuple[int, int, "NewsReport"]] = {}
+
+
+class NewsReport(NamedTuple):
+    """
+    A saved AI News report.
+
+    Attributes:
+        frequency: The report's time frame (e.g., "daily").
+        summary: The markdown report, without its title line.
+        filename: Path to the downloadable markdown file.
+        version: Increases by one every time the frequency's report is saved.
+        generated_at: Unix time at which the report was saved.
+        articles: Number of articles the report covers.
+    """
+    frequency: str
+    summary: str
+    filename: str
+    version: int
+    generated_at: float
+    articles: int = 0
+
+    @property
+    def markdown(self) -> str:
+        """The full markdown document, as saved to `filename`."""
+        return f"# {self.frequency.capitalize()} AI News Summary\n\n{self.summary}"
+
+    def age(self) -> float:
+        """Returns the report's age in seconds."""
+        return max(0.0, time.time() - self.generated_at)
+
+
+def _paths(output_dir: str, frequency: str):
+    """Returns the markdown and metadata paths of a frequency's report."""
+    base = os.path.join(output_dir, f"{frequency}_summary")
+    return f"{base}.md", f"{base}.json"
+
+
+def _atomic_write(path: str, text: str) -> None:
+    """Writes a file through a temporary file in the same directory and renames it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_report(frequency: str, output_dir: str = REPORTS_DIR) -> Optional[NewsReport]:
+    """
+    Returns the latest saved report of a frequency.
+
+    Only a `stat` of the record is needed while the report in memory is current.
+
+    Args:
+        frequency (str): The report's time frame (e.g., "daily").
+        output_dir (str): The reports directory.
+
+    Returns:
+        Optional[NewsReport]: The report, or None if none was saved yet or its
+                              record cannot be read.
+    """
+    filename, meta_path = _paths(output_dir, frequency)
+    try:
+        stat = os.stat(meta_path)
+        loaded = _loaded.get(meta_path)
+        if loaded and loaded[:2] == (stat.st_mtime_ns, stat.st_size):
+            return loaded[2]
+        with open(meta_path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        report = NewsReport(
+            frequency=frequency,
+            summary=record["summary"],
+            filename=filename,
+            version=int(record["version"]),
+            generated_at=float(record["generated_at"]),
+            articles=int(record.get("articles", 0)),
+        )
+        _loaded[meta_path] = (stat.st_mtime_ns, stat.st_size, report)
+        return report
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Warning: could not read the {frequency} AI News report record: {e}")
+        return None
+
+
+def write_report(frequency: str, summary: str, articles: int = 0, output_dir: str = REPORTS_DIR) -> NewsReport:
+    """
+    Saves a new version of a frequency's report.
+
+    The markdown file is replaced first and the JSON record last, so a reader
+    that finds version N in the record always finds version N (or newer) in the
+    markdown file.
+
+    Args:
+        frequency (str): The report's time frame (e.g., "daily").
+        summary (str): The markdown report, without its title line.
+        articles (int): Number of articles the report covers.
+        output_dir (str): The reports directory.
+
+    Returns:
+        NewsReport: The saved report.
+    """
+    filename, meta_path = _paths(output_dir, frequency)
+    os.makedirs(output_dir, exist_ok=True)
+    with _write_lock:
+        previous = read_report(frequency, output_dir)
+        report = NewsReport(
+            frequency=frequency,
+            summary=summary,
+            filename=filename,
+            version=(previous.version if previous else 0) + 1,
+            generated_at=time.time(),
+            articles=articles,
+        )
+        _atomic_write(filename, report.markdown)
+        _atomic_write(meta_path, json.dumps({
+            "frequency": frequency,
+            "version": report.version,
+            "generated_at": report.generated_at,
+            "articles": articles,
+            "summary": summary,
+        }))
+        stat = os.stat(meta_path)
+        _loaded[meta_path] = (stat.st_mtime_ns, stat.st_size, report)
+    return report
@@ -0,0 +1,219 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from src.langgraph.state.state import State
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n")
+
+# Common words that carry no ranking signal
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in is it its me my of on or "
+    "that the this to was were what when where which who why will with you your".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for budgeting."""
+    return max(1, len(text) // 4)
+
+
+def _terms(text: str) -> List[str]:
+    """Lower-cases and tokenizes text into ranking terms, dropping stopwords."""
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def chunk_text(text: str, chunk_tokens: int) -> List[str]:
+    """
+    Splits text into chunks of roughly `chunk_tokens` tokens on natural boundaries.
+
+    Paragraphs are kept together where possible, long paragraphs are split into
+    sentences, and anything still too long is cut at the character limit.
+
+    Args:
+        text (str): The text to split.
+        chunk_tokens (int): The target chunk size in (estimated) tokens.
+
+    Returns:
+        List[str]: The chunks, in their original order.
+    """
+    max_chars = chunk_tokens * 4
+    units: List[str] = []
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            units.append(paragraph)
+            continue
+        for sentence in _SENTENCE_SPLIT.split(paragraph):
+            sentence = sentence.strip()
+            while len(sentence) > max_chars:
+                units.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            if sentence:
+                units.append(sentence)
+
+    chunks: List[str] = []
+    current = ""
+    for unit in units:
+        if current and len(current) + len(unit) + 1 > max_chars:
+            chunks.append(current)
+            current = unit
+        else:
+            current = f"{current}\n{unit}" if current else unit
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def bm25_scores(query: str, chunks: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """
+    Scores each chunk against the query with Okapi BM25.
+
+    Args:
+        query (str): The text to rank against.
+        chunks (List[str]): The candidate chunks.
+        k1 (float): Term-frequency saturation parameter.
+        b (float): Length normalization parameter.
+
+    Returns:
+        List[float]: One score per chunk, higher is more relevant.
+    """
+    documents = [Counter(_terms(chunk)) for chunk in chunks]
+    lengths = [sum(doc.values()) for doc in documents]
+    average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+    query_terms = set(_terms(query))
+
+    document_frequency = {
+        term: sum(1 for doc in documents if term in doc) for term in query_terms
+    }
+    count = len(documents)
+
+    scores = []
+    for doc, length in zip(documents, lengths):
+        score = 0.0
+        for term in query_terms:
+            frequency = doc.get(term, 0)
+            if not frequency:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            norm = frequency + k1 * (1 - b + b * length / (average_length or 1))
+            score += idf * frequency * (k1 + 1) / norm
+        scores.append(score)
+    return scores
+
+
+class ToolOutputCompactorNode:
+    """
+    A node that shrinks large tool outputs before they are sent back to the model.
+
+    Tool outputs from the latest tool turn that exceed their share of the token
+    budget are split into chunks, ranked against the user's question (and the tool
+    call's own query) with BM25, and replaced by the best chunks that fit. The
+    compacted message keeps the original id, so it replaces the full output in the
+    conversation state. The full output is still streamed to the UI by the tools
+    node itself.
+    """
+
+    def __init__(self, token_budget: int = 3000, chunk_tokens: int = 200):
+        """
+        Initializes the compactor.
+
+        Args:
+            token_budget (int): Total (estimated) tokens allowed for all tool outputs of
+                                one tool turn; split evenly across the calls.
+            chunk_tokens (int): Target chunk size used for ranking.
+        """
+        if token_budget < 1 or chunk_tokens < 1:
+            raise ValueError("Token budget and chunk size must be positive.")
+        self.token_budget = token_budget
+        self.chunk_tokens = chunk_tokens
+
+    def compact(self, content: str, query: str, budget: int) -> str:
+        """
+        Returns the most query-relevant chunks of `content` that fit within `budget`.
+
+        Args:
+            content (str): The full tool output.
+            query (str): The text the chunks are ranked against.
+            budget (int): The maximum number of (estimated) tokens to keep.
+
+        Returns:
+            str: The selected chunks in their original order, `content` unchanged if
+                 it already fits, or cut to the budget if it has no text to rank.
+        """
+        if estimate_tokens(content) <= budget:
+            return content
+
+        chunks = chunk_text(content, min(self.chunk_tokens, budget))
+        if not chunks:
+            return content[:budget * 4]
+        scores = bm25_scores(query, chunks)
+        # Rank by score; ties keep document order so early chunks win. Chunks with
+        # no matching terms are only used when nothing matches at all.
+        ranked = sorted(range(len(chunks)), key=lambda i: (-scores[i], i))
+        if scores[ranked[0]] > 0:
+            ranked = [i for i in ranked if scores[i] > 0]
+
+        selected, used = [], 0
+        for i in ranked:
+            cost = estimate_tokens(chunks[i])
+            if used + cost > budget:
+                continue
+            selected.append(i)
+            used += cost
+
+        kept = "\n...\n".join(chunks[i] for i in sorted(selected))
+        return f"{kept}\n[Tool output compacted to the {len(selected)} most relevant of {len(chunks)} sections.]"
+
+    def process(self, state: State) -> dict:
+        """
+        Compacts the tool messages produced by the latest tool turn.
+
+        Args:
+            state (State): The current graph state, containing the list of messages.
+
+        Returns:
+            dict: Replacement tool messages (same ids) for every output that was compacted.
+        """
+        messages = state.get("messages", [])
+
+        # Find the tool results that follow the latest tool-calling AI message
+        start = len(messages)
+        while start > 0 and isinstance(messages[start - 1], ToolMessage):
+            start -= 1
+        tool_messages = messages[start:]
+        calling_message: Optional[AIMessage] = messages[start - 1] if start > 0 else None
+        if not tool_messages or not isinstance(calling_message, AIMessage):
+            return {"messages": []}
+
+        question = next(
+            (m.content for m in reversed(messages) if isinstance(m, HumanMessage) and isinstance(m.content, str)),
+            "",
+        )
+        call_args: Dict[str, Any] = {tc["id"]: tc.get("args", {}) for tc in calling_message.tool_calls}
+        budget = max(1, self.token_budget // len(tool_messages))
+
+        replacements = []
+        for message in tool_messages:
+            if not isinstance(message.content, str) or estimate_tokens(message.content) <= budget:
+                continue
+            args = call_args.get(message.tool_call_id, {})
+            query = " ".join([question, *(str(v) for v in args.values())])
+            replacements.append(
+                ToolMessage(
+                    content=self.compact(message.content, query, budget),
+                    tool_call_id=message.tool_call_id,
+                    name=message.name,
+                    id=message.id,
+                    status=message.status,
+                    artifact=message.artifact,
+                )
+            )
+        return {"messages": replacements}
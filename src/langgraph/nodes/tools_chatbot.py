@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Callable, List
+from typing import List, Optional
 from langchain_core.language_models import BaseLanguageModel
+from langchain_core.runnables import RunnableLambda
 from langchain_core.tools import BaseTool
 
+from src.langgraph.nodes.message_trimmer import MessageTrimmer
 from src.langgraph.state.state import State
 
 
@@ -12,37 +14,40 @@ class ChatBotwithToolsNode:
     A factory for creating a LangGraph node that augments an LLM with tools.
 
     This class doesn't act as a node itself. Instead, its `process` method
-    configures an LLM with a given set of tools and returns a callable function
-    that can be used as a node in a StateGraph.
+    configures an LLM with a given set of tools and returns a runnable that can
+    be used as a node in a StateGraph, under both `invoke` and `ainvoke`.
     """
 
-    def __init__(self, model: BaseLanguageModel):
+    def __init__(self, model: BaseLanguageModel, trimmer: Optional[MessageTrimmer] = None):
         """
         Initializes the node factory with a language model.
 
         Args:
             model (BaseLanguageModel): An instance of a LangChain compatible language model.
+            trimmer (Optional[MessageTrimmer]): Fits the history into the model's context
+                                                budget; if None, the full history is sent.
         """
         if not model:
             raise ValueError("A language model instance must be provided.")
         self.llm = model
+        self.trimmer = trimmer
 
-    def process(self, tools: List[BaseTool]) -> Callable[[State], dict]:
+    def process(self, tools: List[BaseTool]) -> RunnableLambda:
         """
-        Configures the LLM with tools and returns a callable node function.
+        Configures the LLM with tools and returns a runnable node.
 
         This method takes a list of tools, binds them to the initialized LLM,
-        and then returns a new function (`chatbot_node`) that will execute the
-        LLM with the tools when called by the graph.
+        and then returns a node that will execute the LLM with the tools when
+        called by the graph: `chatbot_node` when the graph is invoked, and
+        `achatbot_node`, which awaits the model, when it is run asynchronously.
 
         Args:
             tools (List[BaseTool]): A list of LangChain tool instances to be
                                      made available to the LLM.
 
         Returns:
-            Callable[[State], dict]: A function that can be added as a node to a
-                                     LangGraph, which processes the conversation
-                                     state and may decide to call a tool.
+            RunnableLambda: A node that can be added to a LangGraph, which processes
+                            the conversation state and may decide to call a tool.
         
         Raises:
             ValueError: If no tools are provided or if binding them to the LLM fails.
@@ -66,7 +71,9 @@ class ChatBotwithToolsNode:
                 messages = state.get("messages", [])
                 if not messages:
                     return {"messages": []}
-                
+                if self.trimmer:
+                    messages = self.trimmer.trim(messages)
+
                 # The response may be a text message or a tool call request
                 response = llm_with_tools.invoke(messages)
                 return {"messages": [response]}
@@ -74,4 +81,19 @@ class ChatBotwithToolsNode:
             except Exception as e:
                 raise ValueError(f"Failed to process chatbot response with tools: {e}") from e
 
-        return chatbot_node
\ No newline at end of file
+        async def achatbot_node(state: State) -> dict:
+            """Async variant of `chatbot_node`; the model call is awaited."""
+            try:
+                messages = state.get("messages", [])
+                if not messages:
+                    return {"messages": []}
+                if self.trimmer:
+                    messages = self.trimmer.trim(messages)
+
+                response = await llm_with_tools.ainvoke(messages)
+                return {"messages": [response]}
+
+            except Exception as e:
+                raise ValueError(f"Failed to process chatbot response with tools: {e}") from e
+
+        return RunnableLambda(chatbot_node, afunc=achatbot_node, name="chatbot_node")
\ No newline at end of file
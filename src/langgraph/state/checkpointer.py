@@ -0,0 +1,564 @@
+"""
+A persistent SQLite checkpointer for multi-turn conversations.
+
+Graphs compiled with this checkpointer resume each session's conversation from
+local disk, keyed by the `thread_id` passed in the run config. Unlike the stock
+LangGraph savers, which serialize the full state (including the whole message
+history) on every step, the `messages` channel is stored one row per message:
+a checkpoint only writes the messages that are new or changed since the last
+one, so the cost of a turn does not grow with the length of the conversation.
+
+Only the latest checkpoint of each thread is kept, since the app never replays
+older ones, and threads that have not been used for a while are deleted.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# --- Third-Party Imports ---
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+MESSAGES_CHANNEL = "messages"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns)
+);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_updated ON checkpoints (updated_at);
+
+CREATE TABLE IF NOT EXISTS checkpoint_messages (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    message_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    message BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, message_id)
+);
+CREATE INDEX IF NOT EXISTS idx_checkpoint_messages_seq
+    ON checkpoint_messages (thread_id, checkpoint_ns, seq);
+
+CREATE TABLE IF NOT EXISTS checkpoint_writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class _StoredMessages(NamedTuple):
+    """The messages of a thread as last stored, kept in memory to diff the next checkpoint."""
+    checkpoint_id: str
+    messages: List[Any]
+    # message id -> (message object, position)
+    positions: Dict[str, Tuple[Any, int]]
+
+
+def _message_key(message: Any, seq: int) -> str:
+    """Returns the row key of a message: its id, or its position if it has none."""
+    return getattr(message, "id", None) or f"seq:{seq}"
+
+
+class ConversationCheckpointer(BaseCheckpointSaver):
+    """
+    Stores the latest checkpoint of every thread, writing messages incrementally.
+
+    Each process keeps the last stored message list of its most recently used
+    threads in memory. A checkpoint is diffed against it by message id and object
+    identity (LangGraph reuses the message objects between steps), so only new
+    or replaced messages are serialized, and resuming a thread that this process
+    served last needs no deserialization at all. Threads missing from memory are
+    loaded from the database once.
+
+    The database runs in WAL mode and is shared by every session of the process
+    through a single connection guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        thread_ttl: float = 7 * 24 * 60 * 60,
+        gc_interval: float = 60 * 60,
+        cache_threads: int = 256,
+    ):
+        """
+        Initializes the checkpointer and creates the database if needed.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            thread_ttl (float): Seconds after its last checkpoint before a thread is
+                                deleted. 0 disables garbage collection.
+            gc_interval (float): Minimum number of seconds between two garbage collections.
+            cache_threads (int): Maximum number of threads whose messages are kept in memory.
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.thread_ttl = thread_ttl
+        self.gc_interval = gc_interval
+        self.cache_threads = cache_threads
+
+        self._cache: "OrderedDict[Tuple[str, str], _StoredMessages]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._last_gc = 0.0
+        self.messages_written = 0
+        self.messages_skipped = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    # ---- Message cache ---- #
+    def _cached(self, key: Tuple[str, str], checkpoint_id: str) -> Optional[_StoredMessages]:
+        """Returns the cached messages of a thread if they belong to `checkpoint_id`."""
+        stored = self._cache.get(key)
+        if stored is None or stored.checkpoint_id != checkpoint_id:
+            return None
+        self._cache.move_to_end(key)
+        return stored
+
+    def _remember(self, key: Tuple[str, str], stored: _StoredMessages) -> None:
+        """Caches a thread's messages, evicting the least recently used thread if full."""
+        self._cache[key] = stored
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_threads:
+            self._cache.popitem(last=False)
+
+    def _load_messages(self, key: Tuple[str, str], checkpoint_id: str) -> List[Any]:
+        """Returns a thread's messages, from memory if possible, else from the database."""
+        stored = self._cached(key, checkpoint_id)
+        if stored is not None:
+            return list(stored.messages)
+
+        rows = self.conn.execute(
+            "SELECT message_id, type, message FROM checkpoint_messages "
+            "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY seq",
+            key,
+        ).fetchall()
+        messages = [self.serde.loads_typed((type_, blob)) for _, type_, blob in rows]
+        positions = {row[0]: (message, seq) for seq, (row, message) in enumerate(zip(rows, messages))}
+        self._remember(key, _StoredMessages(checkpoint_id, messages, positions))
+        return list(messages)
+
+    def _write_messages(self, key: Tuple[str, str], messages: Sequence[Any]) -> Dict[str, Tuple[Any, int]]:
+        """
+        Writes the rows needed to bring a thread's stored messages up to `messages`.
+
+        Args:
+            key (Tuple[str, str]): The (thread_id, checkpoint_ns) of the thread.
+            messages (Sequence[Any]): The thread's full message list in the new checkpoint.
+
+        Returns:
+            Dict[str, Tuple[Any, int]]: The new id -> (message, position) map.
+        """
+        stored = self._cache.get(key)
+        if stored is None:
+            # Nothing known about what is on disk: rewrite the thread once
+            self.conn.execute(
+                "DELETE FROM checkpoint_messages WHERE thread_id = ? AND checkpoint_ns = ?", key
+            )
+            previous: Dict[str, Tuple[Any, int]] = {}
+        else:
+            previous = stored.positions
+
+        positions: Dict[str, Tuple[Any, int]] = {}
+        upserts, moves = [], []
+        for seq, message in enumerate(messages):
+            message_id = _message_key(message, seq)
+            positions[message_id] = (message, seq)
+            known = previous.get(message_id)
+            if known is not None and known[0] is message:
+                if known[1] != seq:
+                    moves.append((seq, *key, message_id))
+                continue
+            type_, blob = self.serde.dumps_typed(message)
+            upserts.append((*key, message_id, seq, type_, blob))
+
+        removed = [(*key, message_id) for message_id in previous.keys() - positions.keys()]
+        if removed:
+            self.conn.executemany(
+                "DELETE FROM checkpoint_messages WHERE thread_id = ? AND checkpoint_ns = ? AND message_id = ?",
+                removed,
+            )
+        if moves:
+            self.conn.executemany(
+                "UPDATE checkpoint_messages SET seq = ? WHERE thread_id = ? AND checkpoint_ns = ? AND message_id = ?",
+                moves,
+            )
+        if upserts:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO checkpoint_messages "
+                "(thread_id, checkpoint_ns, message_id, seq, type, message) VALUES (?, ?, ?, ?, ?, ?)",
+                upserts,
+            )
+        self.messages_written += len(upserts)
+        self.messages_skipped += len(messages) - len(upserts)
+        return positions
+
+    # ---- Reading ---- #
+    def _to_tuple(self, row: Tuple) -> CheckpointTuple:
+        """Builds a checkpoint tuple from a `checkpoints` row, re-attaching messages and writes."""
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, blob, metadata_type, metadata = row
+        key = (thread_id, checkpoint_ns)
+
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, blob))
+        messages = self._load_messages(key, checkpoint_id)
+        if messages:
+            checkpoint["channel_values"][MESSAGES_CHANNEL] = messages
+
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM checkpoint_writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id,
+            }},
+            checkpoint=checkpoint,
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {"configurable": {
+                    "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id,
+                }}
+                if parent_id else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Returns the latest checkpoint of the thread in `config`.
+
+        Args:
+            config (RunnableConfig): Must contain `thread_id`; a `checkpoint_id`, if
+                                     given, must be the latest one (older ones are not kept).
+
+        Returns:
+            Optional[CheckpointTuple]: The checkpoint, or None if the thread has none.
+        """
+        configurable = config["configurable"]
+        key = (configurable["thread_id"], configurable.get("checkpoint_ns", ""))
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                "metadata_type, metadata FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+                key,
+            ).fetchone()
+            checkpoint_id = get_checkpoint_id(config)
+            if row is None or (checkpoint_id and row[2] != checkpoint_id):
+                return None
+            return self._to_tuple(row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Lists the stored checkpoints (one per thread), newest first.
+
+        Args:
+            config (Optional[RunnableConfig]): Restricts the listing to one thread.
+            filter (Optional[Dict[str, Any]]): Metadata key/values the checkpoints must match.
+            before (Optional[RunnableConfig]): Only checkpoints older than this one.
+            limit (Optional[int]): Maximum number of checkpoints to return.
+
+        Yields:
+            CheckpointTuple: The matching checkpoints.
+        """
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if "checkpoint_ns" in config["configurable"]:
+                clauses.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+        if before and get_checkpoint_id(before):
+            clauses.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        returned = 0
+        for row in rows:
+            if limit is not None and returned >= limit:
+                break
+            with self._lock:
+                checkpoint_tuple = self._to_tuple(row)
+            if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                continue
+            returned += 1
+            yield checkpoint_tuple
+
+    # ---- Writing ---- #
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Stores a checkpoint as the thread's latest, writing only new or changed messages.
+
+        Args:
+            config (RunnableConfig): The config of the parent checkpoint.
+            checkpoint (Checkpoint): The checkpoint to store.
+            metadata (CheckpointMetadata): Metadata of the checkpoint.
+            new_versions (ChannelVersions): Channel versions updated by this checkpoint (unused;
+                                            messages are diffed directly).
+
+        Returns:
+            RunnableConfig: The config pointing at the stored checkpoint.
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        key = (thread_id, checkpoint_ns)
+
+        channel_values = dict(checkpoint["channel_values"])
+        messages = list(channel_values.pop(MESSAGES_CHANNEL, None) or [])
+        type_, blob = self.serde.dumps_typed({**checkpoint, "channel_values": channel_values})
+        metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        now = time.time()
+
+        with self._lock:
+            try:
+                positions = self._write_messages(key, messages)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+                    "parent_checkpoint_id, type, checkpoint, metadata_type, metadata, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint["id"], configurable.get("checkpoint_id"),
+                     type_, blob, metadata_type, metadata_blob, now),
+                )
+                # Pending writes of superseded checkpoints are never read again
+                self.conn.execute(
+                    "DELETE FROM checkpoint_writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id != ?",
+                    (thread_id, checkpoint_ns, checkpoint["id"]),
+                )
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                self._cache.pop(key, None)
+                raise
+            self._remember(key, _StoredMessages(checkpoint["id"], messages, positions))
+
+        self._maybe_collect_garbage(now)
+        return {"configurable": {
+            "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"],
+        }}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Stores the intermediate writes of a task for the checkpoint in `config`.
+
+        Args:
+            config (RunnableConfig): Points at the checkpoint the writes belong to.
+            writes (Sequence[Tuple[str, Any]]): (channel, value) pairs.
+            task_id (str): The task that produced the writes.
+            task_path (str): The path of the task.
+        """
+        configurable = config["configurable"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append((
+                configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"],
+                task_id, task_path, WRITES_IDX_MAP.get(channel, idx), channel, type_, blob,
+            ))
+        # Special channels (errors, interrupts) replace earlier writes; regular ones are written once
+        verb = "INSERT OR REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT OR IGNORE"
+        with self._lock:
+            self.conn.executemany(
+                f"{verb} INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, "
+                "idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Deletes everything stored for a thread.
+
+        Args:
+            thread_id (str): The thread to delete.
+        """
+        with self._lock:
+            for table in ("checkpoints", "checkpoint_messages", "checkpoint_writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self.conn.commit()
+            for key in [key for key in self._cache if key[0] == thread_id]:
+                del self._cache[key]
+
+    # ---- Garbage collection ---- #
+    def collect_garbage(self, max_age: Optional[float] = None) -> int:
+        """
+        Deletes threads whose latest checkpoint is older than `max_age` seconds.
+
+        Args:
+            max_age (Optional[float]): The age limit; defaults to the `thread_ttl`.
+
+        Returns:
+            int: The number of deleted threads.
+        """
+        max_age = self.thread_ttl if max_age is None else max_age
+        cutoff = time.time() - max_age
+        with self._lock:
+            threads = [
+                row[0] for row in self.conn.execute(
+                    "SELECT DISTINCT thread_id FROM checkpoints WHERE updated_at < ?", (cutoff,)
+                )
+            ]
+            for thread_id in threads:
+                self.delete_thread(thread_id)
+            self._last_gc = time.time()
+        return len(threads)
+
+    def _maybe_collect_garbage(self, now: float) -> None:
+        """Runs garbage collection if enabled and `gc_interval` has passed since the last run."""
+        if self.thread_ttl <= 0 or now - self._last_gc < self.gc_interval:
+            return
+        try:
+            removed = self.collect_garbage()
+            if removed:
+                print(f"Checkpointer: deleted {removed} thread(s) idle for more than {self.thread_ttl:.0f}s")
+        except sqlite3.Error as e:
+            print(f"Warning: checkpoint garbage collection failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns storage counters for this process and the current database size.
+
+        Returns:
+            Dict[str, Any]: A snapshot of the checkpointer metrics.
+        """
+        with self._lock:
+            threads, messages = self.conn.execute(
+                "SELECT (SELECT COUNT(*) FROM checkpoints), (SELECT COUNT(*) FROM checkpoint_messages)"
+            ).fetchone()
+            return {
+                "threads": threads,
+                "messages": messages,
+                "cached_threads": len(self._cache),
+                "messages_written": self.messages_written,
+                "messages_skipped": self.messages_skipped,
+            }
+
+    # ---- Async API ---- #
+    # The async graph APIs call these; SQLite work runs on the default executor.
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+# ---- Process-wide instance ---- #
+_checkpointer: Optional[ConversationCheckpointer] = None
+_checkpointer_lock = threading.Lock()
+
+
+def get_checkpointer() -> ConversationCheckpointer:
+    """
+    Returns the conversation checkpointer, opening its database on first use.
+
+    Returns:
+        ConversationCheckpointer: The checkpointer shared by every graph in this process.
+    """
+    global _checkpointer
+    with _checkpointer_lock:
+        if _checkpointer is None:
+            _checkpointer = ConversationCheckpointer(
+                db_path=os.getenv("CHECKPOINT_DB_PATH", "./.cache/checkpoints.sqlite3"),
+                thread_ttl=float(os.getenv("CHECKPOINT_THREAD_TTL_DAYS", "7")) * 24 * 60 * 60,
+                cache_threads=int(os.getenv("CHECKPOINT_CACHE_THREADS", "256")),
+            )
+        return _checkpointer
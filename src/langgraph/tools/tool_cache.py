@@ -0,0 +1,362 @@
+"""
+A persistent, TTL-based cache for search and lookup tool results.
+
+Results are keyed by (tool name, normalized arguments) and kept in two tiers:
+a small in-memory LRU for the hottest queries and a SQLite database on local
+disk that is shared by every Streamlit session and every process on the host.
+Each tool gets its own time-to-live, so slow-changing sources (arXiv, Wikipedia)
+are reused for days while finance and news results expire within minutes.
+Error results (a tool error the tool handled itself, or an error the API
+wrapper returns as its result) are only kept for a short time.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# --- Third-Party Imports ---
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool, Tool
+
+_MISS = object()
+
+# Wrapped tools are run with a tool call id, so an error they handle themselves
+# (`handle_tool_error`, e.g. Tavily) comes back as a ToolMessage with status "error"
+_CALL_ID = "tool-cache"
+
+# Exact prefixes of errors an API wrapper returns as its result instead of raising
+_WRAPPER_ERROR_PREFIXES = ("Arxiv exception: ",)  # ArxivAPIWrapper.run
+
+
+def _normalize(value: Any) -> Any:
+    """
+    Normalizes tool arguments so trivially different queries share a cache entry.
+    Only whitespace is collapsed; case can change what a search returns.
+    """
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _unwrap(output: Any) -> Tuple[Any, bool]:
+    """Returns a wrapped tool's result without its `ToolMessage`, and whether it is an error."""
+    failed = False
+    if isinstance(output, ToolMessage):
+        output, failed = output.content, output.status == "error"
+    return output, failed or (isinstance(output, str) and output.startswith(_WRAPPER_ERROR_PREFIXES))
+
+
+class ToolCache:
+    """
+    A two-tier (memory LRU + SQLite) cache with per-tool TTLs and size-based eviction.
+
+    The SQLite database runs in WAL mode so concurrent readers in other processes
+    are never blocked by a writer. Each thread uses its own connection.
+
+    The size on disk is kept as a running total so a write does not scan the table.
+    Expired rows are swept, and the total re-synced with the database (which other
+    processes also write to), every `SWEEP_INTERVAL` seconds or once it exceeds the limit.
+    """
+
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        db_path: str,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 3600.0,
+        memory_size: int = 256,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        error_ttl: float = 60.0,
+    ):
+        """
+        Initializes the cache and creates the database if needed.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            ttls (Optional[Dict[str, float]]): Time-to-live in seconds per tool name.
+                A TTL of 0 disables caching for that tool.
+            default_ttl (float): TTL for tools not listed in `ttls`.
+            memory_size (int): Maximum number of entries kept in the memory tier.
+            max_disk_bytes (int): Maximum total size of cached values on disk. The
+                                  least recently used entries are evicted beyond it.
+            error_ttl (float): Maximum TTL of error results, so a failing source is not
+                               hammered but recovers quickly. 0 disables caching them.
+        """
+        self.db_path = db_path
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.memory_size = memory_size
+        self.max_disk_bytes = max_disk_bytes
+        self.error_ttl = error_ttl
+
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tool_cache (
+                    key TEXT PRIMARY KEY,
+                    tool TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tool_cache_access ON tool_cache (last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tool_cache_expires ON tool_cache (expires_at)")
+            self._disk_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM tool_cache").fetchone()[0]
+        self._swept_at = time.time()
+
+    # ---- Storage ---- #
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's connection to the cache database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def ttl_for(self, tool_name: str) -> float:
+        """Returns the time-to-live in seconds for a tool."""
+        return self.ttls.get(tool_name, self.default_ttl)
+
+    @staticmethod
+    def make_key(tool_name: str, tool_args: Any) -> str:
+        """
+        Builds the cache key for a tool call.
+
+        Args:
+            tool_name (str): The tool's name.
+            tool_args (Any): The tool input (a string or a dict of arguments).
+
+        Returns:
+            str: A stable hash of the tool name and its normalized arguments.
+        """
+        payload = json.dumps([tool_name, _normalize(tool_args)], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, tool_name: str, tool_args: Any) -> Any:
+        """
+        Looks up a cached result.
+
+        Args:
+            tool_name (str): The tool's name.
+            tool_args (Any): The tool input.
+
+        Returns:
+            Any: The cached result, or the module's `_MISS` sentinel if absent or expired.
+        """
+        key = self.make_key(tool_name, tool_args)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at FROM tool_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            with self._lock:
+                self.misses += 1
+            return _MISS
+
+        conn.execute("UPDATE tool_cache SET last_access = ? WHERE key = ?", (now, key))
+        conn.commit()
+        value = json.loads(row[0])
+        self._remember(key, row[1], value)
+        with self._lock:
+            self.disk_hits += 1
+        return value
+
+    def set(self, tool_name: str, tool_args: Any, value: Any, error: bool = False) -> None:
+        """
+        Stores a tool result in both tiers. Values that are not JSON-serializable are
+        skipped, and error results are kept for at most `error_ttl`.
+
+        Args:
+            tool_name (str): The tool's name.
+            tool_args (Any): The tool input.
+            value (Any): The tool's result.
+            error (bool): Whether the result reports a failure of the tool.
+        """
+        ttl = self.ttl_for(tool_name)
+        if error:
+            ttl = min(ttl, self.error_ttl)
+        if ttl <= 0:
+            return
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+
+        key = self.make_key(tool_name, tool_args)
+        now = time.time()
+        expires_at = now + ttl
+        self._remember(key, expires_at, value)
+
+        conn = self._connection()
+        replaced = conn.execute("SELECT size FROM tool_cache WHERE key = ?", (key,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO tool_cache (key, tool, value, size, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, tool_name, encoded, len(encoded), expires_at, now),
+        )
+        conn.commit()
+        with self._lock:
+            self.stores += 1
+            self._disk_bytes += len(encoded) - (replaced[0] if replaced else 0)
+        self._evict(conn, now)
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        """Puts an entry in the memory tier, evicting the least recently used one if full."""
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Deletes expired rows, then least recently used rows until under the size limit.
+        Does nothing between sweeps while the running total is within the limit.
+        """
+        with self._lock:
+            if now - self._swept_at < self.SWEEP_INTERVAL and self._disk_bytes <= self.max_disk_bytes:
+                return
+            self._swept_at = now
+        removed = conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (now,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM tool_cache").fetchone()[0]
+        if total > self.max_disk_bytes:
+            target = int(self.max_disk_bytes * 0.9)
+            for key, size in conn.execute(
+                "SELECT key, size FROM tool_cache ORDER BY last_access"
+            ).fetchall():
+                if total <= target:
+                    break
+                conn.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+        conn.commit()
+        with self._lock:
+            self._disk_bytes = total
+            self.evictions += removed
+
+    def clear(self) -> None:
+        """Removes every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        conn = self._connection()
+        conn.execute("DELETE FROM tool_cache")
+        conn.commit()
+        with self._lock:
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters for this process and the current cache size.
+
+        Returns:
+            Dict[str, Any]: A snapshot of the cache metrics.
+        """
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM tool_cache"
+        ).fetchone()
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": entries,
+                "disk_bytes": size,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    # ---- Tool wrapping ---- #
+    def wrap(self, tool: BaseTool) -> BaseTool:
+        """
+        Returns a tool with the same name and schema whose results go through the cache.
+
+        Args:
+            tool (BaseTool): The tool to wrap.
+
+        Returns:
+            BaseTool: The caching tool; the original is called only on a cache miss.
+        """
+        if self.ttl_for(tool.name) <= 0:
+            return tool
+
+        def lookup(tool_input: Any, callbacks: Any) -> Any:
+            cached = self.get(tool.name, tool_input)
+            if cached is not _MISS:
+                return cached
+            result, error = _unwrap(tool.run(tool_input, callbacks=callbacks, tool_call_id=_CALL_ID))
+            self.set(tool.name, tool_input, result, error)
+            return result
+
+        async def alookup(tool_input: Any, callbacks: Any) -> Any:
+            # The cache may read from disk, so it is consulted off the event loop
+            cached = await asyncio.to_thread(self.get, tool.name, tool_input)
+            if cached is not _MISS:
+                return cached
+            result, error = _unwrap(await tool.arun(tool_input, callbacks=callbacks, tool_call_id=_CALL_ID))
+            await asyncio.to_thread(self.set, tool.name, tool_input, result, error)
+            return result
+
+        if isinstance(tool, Tool):
+            # Single string input tools (e.g., the SerpAPI hotel search)
+            def cached_run(tool_input: str, callbacks=None) -> Any:
+                return lookup(tool_input, callbacks)
+
+            async def acached_run(tool_input: str, callbacks=None) -> Any:
+                return await alookup(tool_input, callbacks)
+
+            return Tool(name=tool.name, description=tool.description, func=cached_run, coroutine=acached_run)
+
+        def cached_structured_run(callbacks=None, **kwargs: Any) -> Any:
+            return lookup(kwargs, callbacks)
+
+        async def acached_structured_run(callbacks=None, **kwargs: Any) -> Any:
+            return await alookup(kwargs, callbacks)
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema or tool.get_input_schema(),
+            func=cached_structured_run,
+            coroutine=acached_structured_run,
+        )
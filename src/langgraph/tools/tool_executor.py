@@ -0,0 +1,334 @@
+"""
+Concurrent execution of the tool calls a model emits in a single turn.
+
+When the model asks for several tools at once (e.g., DuckDuckGo + Brave +
+Wikipedia), the calls are independent network requests. Running them on a shared,
+bounded thread pool makes the turn take as long as the slowest call rather than
+the sum of all of them. Under `ainvoke`/`astream` the calls are awaited on the
+event loop instead, and only tools without a native async implementation use
+threads.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import contextvars
+import os
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# --- Third-Party Imports ---
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.tools import BaseTool
+
+# --- Local Application Imports ---
+from src.langgraph.state.state import State
+
+
+class _ToolSlots:
+    """The running calls of one tool and the calls waiting for a free slot."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.running = 0
+        self.waiting: Deque[Callable[[], Any]] = deque()
+
+
+class ToolExecutor:
+    """
+    Runs tool calls concurrently on a bounded thread pool with per-tool limits.
+
+    A call is only handed to the pool once its tool has a free slot, so calls
+    waiting on a busy tool never hold a worker that another tool could use.
+    Results are always returned in the order the model emitted the calls, no
+    matter which call finishes first, so the conversation history is deterministic.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        default_tool_limit: int = 4,
+        tool_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initializes the executor.
+
+        Args:
+            max_workers (int): The maximum number of tool calls running at once across
+                               all sessions in the process.
+            default_tool_limit (int): The maximum concurrent calls of any single tool.
+            tool_limits (Optional[Dict[str, int]]): Per-tool overrides of
+                                                    `default_tool_limit`, keyed by tool name.
+        """
+        if max_workers < 1 or default_tool_limit < 1:
+            raise ValueError("ToolExecutor limits must be at least 1.")
+        self.max_workers = max_workers
+        self.default_tool_limit = default_tool_limit
+        self.tool_limits = dict(tool_limits or {})
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-executor")
+        self._slots: Dict[str, _ToolSlots] = {}
+        # Event loop -> tool name -> semaphore; an asyncio semaphore only works on one loop
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _acquire(self, tool_name: str, start: Callable[[], Any]) -> None:
+        """Calls `start` now if the tool has a free slot, otherwise once a slot is released."""
+        with self._lock:
+            if tool_name not in self._slots:
+                self._slots[tool_name] = _ToolSlots(self.tool_limits.get(tool_name, self.default_tool_limit))
+            slots = self._slots[tool_name]
+            if slots.running >= slots.limit:
+                slots.waiting.append(start)
+                return
+            slots.running += 1
+        start()
+
+    def _release(self, tool_name: str) -> None:
+        """Hands a finished call's slot to the next waiting call of the same tool."""
+        with self._lock:
+            slots = self._slots[tool_name]
+            if not slots.waiting:
+                slots.running -= 1
+                return
+            start = slots.waiting.popleft()
+        start()
+
+    def _submit(
+        self,
+        tools_by_name: Dict[str, BaseTool],
+        tool_call: Dict[str, Any],
+        config: Optional[RunnableConfig],
+    ) -> "Future[ToolMessage]":
+        """Schedules a tool call on the pool as soon as its tool has a free slot."""
+        future: "Future[ToolMessage]" = Future()
+        if tool_call["name"] not in tools_by_name:
+            future.set_result(self._unknown_tool(tools_by_name, tool_call))
+            return future
+
+        # The call runs in a copy of the caller's context so callback handlers
+        # bound to context variables still see the graph run they belong to.
+        context = contextvars.copy_context()
+
+        def task() -> None:
+            try:
+                future.set_result(context.run(self._run_one, tools_by_name, tool_call, config))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._release(tool_call["name"])
+
+        self._acquire(tool_call["name"], lambda: self._pool.submit(task))
+        return future
+
+    def _run_inline(
+        self,
+        tools_by_name: Dict[str, BaseTool],
+        tool_call: Dict[str, Any],
+        config: Optional[RunnableConfig],
+    ) -> ToolMessage:
+        """Runs a tool call on the calling thread once its tool has a free slot."""
+        if tool_call["name"] not in tools_by_name:
+            return self._unknown_tool(tools_by_name, tool_call)
+        ready = threading.Event()
+        self._acquire(tool_call["name"], ready.set)
+        ready.wait()
+        try:
+            return self._run_one(tools_by_name, tool_call, config)
+        finally:
+            self._release(tool_call["name"])
+
+    @staticmethod
+    def _unknown_tool(tools_by_name: Dict[str, BaseTool], tool_call: Dict[str, Any]) -> ToolMessage:
+        """Returns the error result of a call to a tool the model does not have."""
+        valid_options = ", ".join(tools_by_name)
+        return ToolMessage(
+            content=f"Error: {tool_call['name']} is not a valid tool, try one of [{valid_options}].",
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+
+    @staticmethod
+    def _tool_message(tool_call: Dict[str, Any], result: Any = None, error: Optional[Exception] = None) -> ToolMessage:
+        """Wraps a tool's result, or the error it raised, in a `ToolMessage`."""
+        if error is not None:
+            return ToolMessage(
+                content=f"Error: {error!r}\n Please fix your mistakes.",
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"],
+                status="error",
+            )
+        if isinstance(result, ToolMessage):
+            return result
+        return ToolMessage(content=str(result), name=tool_call["name"], tool_call_id=tool_call["id"])
+
+    def _async_semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        """
+        Returns the semaphore limiting concurrent async calls of one tool.
+
+        Async calls are limited per event loop, separately from threaded ones, since
+        an asyncio semaphore cannot be shared across loops or threads.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._async_semaphores.setdefault(loop, {})
+            if tool_name not in semaphores:
+                limit = self.tool_limits.get(tool_name, self.default_tool_limit)
+                semaphores[tool_name] = asyncio.Semaphore(limit)
+            return semaphores[tool_name]
+
+    def _run_one(
+        self,
+        tools_by_name: Dict[str, BaseTool],
+        tool_call: Dict[str, Any],
+        config: Optional[RunnableConfig],
+    ) -> ToolMessage:
+        """
+        Executes a single tool call and always returns a `ToolMessage`. The caller
+        holds the tool's slot.
+
+        Failures are reported back to the model as an error `ToolMessage`, the same
+        way LangGraph's `ToolNode` handles tool errors by default.
+        """
+        tool = tools_by_name.get(tool_call["name"])
+        if tool is None:
+            return self._unknown_tool(tools_by_name, tool_call)
+
+        try:
+            result = tool.invoke({**tool_call, "type": "tool_call"}, config)
+        except Exception as e:
+            return self._tool_message(tool_call, error=e)
+        return self._tool_message(tool_call, result)
+
+    async def _arun_one(
+        self,
+        tools_by_name: Dict[str, BaseTool],
+        tool_call: Dict[str, Any],
+        config: Optional[RunnableConfig],
+    ) -> ToolMessage:
+        """Async variant of `_run_one`."""
+        tool = tools_by_name.get(tool_call["name"])
+        if tool is None:
+            return self._unknown_tool(tools_by_name, tool_call)
+
+        try:
+            async with self._async_semaphore(tool.name):
+                result = await tool.ainvoke({**tool_call, "type": "tool_call"}, config)
+        except Exception as e:
+            return self._tool_message(tool_call, error=e)
+        return self._tool_message(tool_call, result)
+
+    def run(
+        self,
+        tools: List[BaseTool],
+        tool_calls: List[Dict[str, Any]],
+        config: Optional[RunnableConfig] = None,
+    ) -> List[ToolMessage]:
+        """
+        Executes all tool calls of one model turn concurrently.
+
+        Args:
+            tools (List[BaseTool]): The tools the model may call.
+            tool_calls (List[Dict[str, Any]]): The calls from `AIMessage.tool_calls`.
+            config (Optional[RunnableConfig]): The graph config, forwarded to each tool
+                                               so callbacks and tracing still apply.
+
+        Returns:
+            List[ToolMessage]: One result per call, in the order of `tool_calls`.
+        """
+        tools_by_name = {tool.name: tool for tool in tools}
+        if len(tool_calls) == 1:
+            return [self._run_inline(tools_by_name, tool_calls[0], config)]
+
+        futures = [self._submit(tools_by_name, tool_call, config) for tool_call in tool_calls]
+        return [future.result() for future in futures]
+
+    async def arun(
+        self,
+        tools: List[BaseTool],
+        tool_calls: List[Dict[str, Any]],
+        config: Optional[RunnableConfig] = None,
+    ) -> List[ToolMessage]:
+        """
+        Async variant of `run`: all tool calls of one model turn are awaited together.
+
+        Tools with a native async implementation run on the event loop; the others
+        are run on the loop's default executor by LangChain.
+
+        Args:
+            tools (List[BaseTool]): The tools the model may call.
+            tool_calls (List[Dict[str, Any]]): The calls from `AIMessage.tool_calls`.
+            config (Optional[RunnableConfig]): The graph config, forwarded to each tool.
+
+        Returns:
+            List[ToolMessage]: One result per call, in the order of `tool_calls`.
+        """
+        tools_by_name = {tool.name: tool for tool in tools}
+        return list(await asyncio.gather(
+            *(self._arun_one(tools_by_name, tool_call, config) for tool_call in tool_calls)
+        ))
+
+    def create_node(self, tools: List[BaseTool]) -> RunnableLambda:
+        """
+        Returns a graph node that executes the tool calls of the last AI message.
+
+        Args:
+            tools (List[BaseTool]): The tools available to the model.
+
+        Returns:
+            RunnableLambda: A node that can replace LangGraph's `ToolNode`, under both
+                            `invoke` and `ainvoke`.
+        """
+        if not tools:
+            raise ValueError("A list of tools must be provided to the tool executor.")
+
+        def tools_node(state: State, config: RunnableConfig) -> dict:
+            """Runs the pending tool calls and appends their results to the state."""
+            messages = state.get("messages", [])
+            last_message = messages[-1] if messages else None
+            if not isinstance(last_message, AIMessage) or not last_message.tool_calls:
+                return {"messages": []}
+            return {"messages": self.run(tools, last_message.tool_calls, config)}
+
+        async def atools_node(state: State, config: RunnableConfig) -> dict:
+            """Async variant of `tools_node`."""
+            messages = state.get("messages", [])
+            last_message = messages[-1] if messages else None
+            if not isinstance(last_message, AIMessage) or not last_message.tool_calls:
+                return {"messages": []}
+            return {"messages": await self.arun(tools, last_message.tool_calls, config)}
+
+        return RunnableLambda(tools_node, afunc=atools_node, name="tools_node")
+
+
+# -----------------------------------------------------------------------------
+# Process-wide instance
+# -----------------------------------------------------------------------------
+_tool_executor: Optional[ToolExecutor] = None
+_tool_executor_lock = threading.Lock()
+
+
+def get_tool_executor(tool_limits: Optional[Dict[str, int]] = None) -> ToolExecutor:
+    """
+    Returns the tool executor shared by all graphs in this process.
+
+    Args:
+        tool_limits (Optional[Dict[str, int]]): Per-tool concurrency limits, applied
+                                                when the executor is first created.
+
+    Returns:
+        ToolExecutor: The process-wide tool executor.
+    """
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is None:
+            _tool_executor = ToolExecutor(
+                max_workers=int(os.getenv("TOOL_EXECUTOR_MAX_WORKERS", "16")),
+                default_tool_limit=int(os.getenv("TOOL_EXECUTOR_DEFAULT_TOOL_LIMIT", "4")),
+                tool_limits=tool_limits,
+            )
+        return _tool_executor
@@ -0,0 +1,139 @@
+"""
+A registry of lazily built tools.
+
+Tools are registered as factories together with the environment variables they
+need. Nothing is imported or constructed until a tool is first requested, after
+which the instance is cached for the life of the process. Tools whose
+credentials are missing (or whose factory fails) are left out instead of
+breaking every session that imports the tools module.
+"""
+# --- Standard Library Imports ---
+import os
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# --- Third-Party Imports ---
+from langchain_core.tools import BaseTool
+
+
+class ToolFactory(NamedTuple):
+    """A registered tool: its name, how to build it and the credentials it needs."""
+    name: str
+    build: Callable[[], BaseTool]
+    required_env: Tuple[str, ...]
+
+
+class ToolRegistry:
+    """
+    Builds each registered tool on first use and caches the instance.
+
+    Registration order is preserved, so `get_tools` always returns the tools in the
+    same order (which keeps the `bind_tools` payload stable).
+    """
+
+    def __init__(self, wrap: Optional[Callable[[BaseTool], BaseTool]] = None):
+        """
+        Initializes an empty registry.
+
+        Args:
+            wrap (Optional[Callable[[BaseTool], BaseTool]]): Applied to every tool right
+                after it is built (e.g., to add result caching).
+        """
+        self.wrap = wrap
+        self._factories: Dict[str, ToolFactory] = {}
+        self._instances: Dict[str, BaseTool] = {}
+        self._failed: Dict[str, str] = {}
+        self._warned: set = set()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, required_env: Sequence[str] = ()) -> Callable:
+        """
+        Returns a decorator that registers a tool factory under `name`.
+
+        Args:
+            name (str): The tool's name; must match the `name` of the built tool.
+            required_env (Sequence[str]): Environment variables the tool cannot work without.
+
+        Returns:
+            Callable: A decorator that registers and returns the factory unchanged.
+        """
+        def decorator(build: Callable[[], BaseTool]) -> Callable[[], BaseTool]:
+            self._factories[name] = ToolFactory(name, build, tuple(required_env))
+            return build
+
+        return decorator
+
+    def missing_env(self, name: str) -> List[str]:
+        """Returns the required environment variables of a tool that are not set."""
+        return [key for key in self._factories[name].required_env if not os.getenv(key)]
+
+    def available_names(self) -> List[str]:
+        """
+        Returns the names of tools that can be used, without building any of them.
+
+        Returns:
+            List[str]: Registered tools whose credentials are present and whose
+                       factory has not failed, in registration order.
+        """
+        return [
+            name for name in self._factories
+            if name not in self._failed and not self.missing_env(name)
+        ]
+
+    def get(self, name: str) -> Optional[BaseTool]:
+        """
+        Returns a tool, building and caching it on first use.
+
+        Args:
+            name (str): The registered tool name.
+
+        Returns:
+            Optional[BaseTool]: The tool, or None if it is unavailable.
+
+        Raises:
+            ValueError: If no tool is registered under `name`.
+        """
+        if name not in self._factories:
+            raise ValueError(f"Unknown tool: '{name}'")
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name in self._failed:
+                return None
+
+            missing = self.missing_env(name)
+            if missing:
+                if name not in self._warned:
+                    self._warned.add(name)
+                    print(f"Warning: tool '{name}' disabled, missing environment variable(s): {', '.join(missing)}")
+                return None
+
+            try:
+                tool = self._factories[name].build()
+                if self.wrap:
+                    tool = self.wrap(tool)
+            except Exception as e:
+                self._failed[name] = str(e)
+                print(f"Warning: tool '{name}' disabled, failed to initialize: {e}")
+                return None
+
+            self._instances[name] = tool
+            return tool
+
+    def get_tools(self) -> List[BaseTool]:
+        """
+        Returns every available tool, building any that have not been built yet.
+
+        Returns:
+            List[BaseTool]: The available tools, in registration order.
+        """
+        tools = [self.get(name) for name in self._factories]
+        return [tool for tool in tools if tool is not None]
+
+    def reset(self) -> None:
+        """Drops every built instance and failure record, e.g., after credentials change."""
+        with self._lock:
+            self._instances.clear()
+            self._failed.clear()
+            self._warned.clear()
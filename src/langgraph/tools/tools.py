@@ -1,85 +1,168 @@
 import os
-from typing import List
+import threading
+from typing import List, Optional
 from dotenv import load_dotenv
 
-# LangChain community tools & wrappers
-from langchain_community.tools import (
-    ArxivQueryRun,
-    WikipediaQueryRun,
-    DuckDuckGoSearchRun,
-    BraveSearch
-)
-from langchain_community.tools.google_scholar import GoogleScholarQueryRun
-from langchain_community.tools.google_finance import GoogleFinanceQueryRun
-from langchain_community.tools.google_jobs import GoogleJobsQueryRun
-from langchain_tavily import TavilySearch
-from langchain_community.utilities import (
-    ArxivAPIWrapper,
-    WikipediaAPIWrapper,
-    GoogleFinanceAPIWrapper,
-    DuckDuckGoSearchAPIWrapper,
-    GoogleScholarAPIWrapper,
-    SerpAPIWrapper,
-    GoogleJobsAPIWrapper,
-)
-
-# LangGraph
-from langgraph.prebuilt import ToolNode
-from langchain.tools import Tool
+# LangChain core
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import BaseTool, Tool
+
+# Local
+from src.langgraph.tools.tool_cache import ToolCache
+from src.langgraph.tools.tool_executor import get_tool_executor
+from src.langgraph.tools.tool_registry import ToolRegistry
 
 # -----------------------------------------------------------------------------
 # Load environment variables
 # -----------------------------------------------------------------------------
 load_dotenv()
 
-SERP_API_KEY: str | None = os.getenv("SERP_API_KEY")
-TAVILY_API_KEY: str | None = os.getenv("TAVILY_API_KEY")
-BRAVE_SEARCH_API_KEY: str | None = os.getenv("BRAVE_SEARCH_API_KEY")
-
-if not SERP_API_KEY:
-    raise ValueError("Missing required environment variable: SERP_API_KEY")
-if not TAVILY_API_KEY:
-    raise ValueError("Missing required environment variable: TAVILY_API_KEY")
-if not BRAVE_SEARCH_API_KEY:
-    raise ValueError("Missing required environment variable: BRAVE_SEARCH_API_KEY")
+# Maximum concurrent calls per tool; SerpAPI-backed tools share one account quota
+TOOL_CONCURRENCY_LIMITS = {
+    "google_scholar": 2,
+    "google_finance": 2,
+    "google_jobs": 2,
+    "serp-search": 2,
+}
 
 # -----------------------------------------------------------------------------
-# API Wrappers
+# Result Cache
 # -----------------------------------------------------------------------------
-arxiv_api_wrapper = ArxivAPIWrapper(top_k_results=5, load_max_docs=5, doc_content_chars_max=50000)
-wiki_api_wrapper = WikipediaAPIWrapper(top_k_results=5, lang="en", doc_content_chars_max=5000)
-duck_api_wrapper = DuckDuckGoSearchAPIWrapper(max_results=5)
-google_scholar_api_wrapper = GoogleScholarAPIWrapper(
-    serp_api_key=SERP_API_KEY, top_k_results=5, hl="en"
-)
-google_finance_api_wrapper = GoogleFinanceAPIWrapper(
-    serp_api_key=SERP_API_KEY, serp_search_engine="google_finance"
-)
-google_jobs_api_wrapper = GoogleJobsAPIWrapper(
-    serp_api_key=SERP_API_KEY, serp_search_engine="google_jobs"
-)
-serp_hotels_api_wrapper = SerpAPIWrapper(
-    search_engine="google_hotels", serpapi_api_key=SERP_API_KEY
-)
+_HOUR = 60 * 60
+
+# Time-to-live (seconds) of cached results per tool: long for reference sources,
+# short for news, prices and other fast-moving results
+TOOL_CACHE_TTLS = {
+    "arxiv": 7 * 24 * _HOUR,
+    "wikipedia": 24 * _HOUR,
+    "google_scholar": 24 * _HOUR,
+    "duckduckgo_search": _HOUR,
+    "brave_search": _HOUR,
+    "tavily_search": 30 * 60,
+    "google_jobs": 6 * _HOUR,
+    "serp-search": 6 * _HOUR,
+    "google_finance": 5 * 60,
+}
+
+_tool_cache: Optional[ToolCache] = None
+_tool_cache_lock = threading.Lock()
+
+
+def get_tool_cache() -> ToolCache:
+    """
+    Returns the tool result cache, opening its database on first use.
+
+    Returns:
+        ToolCache: The cache shared by every tool in this process.
+    """
+    global _tool_cache
+    with _tool_cache_lock:
+        if _tool_cache is None:
+            _tool_cache = ToolCache(
+                db_path=os.getenv("TOOL_CACHE_PATH", "./.cache/tool_cache.sqlite3"),
+                ttls=TOOL_CACHE_TTLS,
+                memory_size=int(os.getenv("TOOL_CACHE_MEMORY_SIZE", "256")),
+                max_disk_bytes=int(os.getenv("TOOL_CACHE_MAX_DISK_MB", "256")) * 1024 * 1024,
+            )
+        return _tool_cache
+
 
 # -----------------------------------------------------------------------------
-# Tool Wrappers
+# Tool Factories
 # -----------------------------------------------------------------------------
-arxiv_tool = ArxivQueryRun(api_wrapper=arxiv_api_wrapper, verbose=True)
-wiki_tool = WikipediaQueryRun(api_wrapper=wiki_api_wrapper, verbose=True)
-duck_tool = DuckDuckGoSearchRun(api_wrapper=duck_api_wrapper, verbose=True)
-tavily_tool = TavilySearch(api_key=TAVILY_API_KEY, verbose=True, max_results=5, include_images=True)
-brave_tool = BraveSearch(search_kwargs={"max_results": 5}, verbose=True)
-google_scholar_tool = GoogleScholarQueryRun(api_wrapper=google_scholar_api_wrapper, verbose=True)
-google_finance_tool = GoogleFinanceQueryRun(api_wrapper=google_finance_api_wrapper, verbose=True)
-google_jobs_tool = GoogleJobsQueryRun(api_wrapper=google_jobs_api_wrapper, verbose=True)
-
-# Custom tool using SerpAPI for hotels
-serp_hotel_tool = Tool(
-    name="serp-search",
-    description="A wrapper around Google Hotels using Serp API. Useful for hotel-related search queries.",
-    func=serp_hotels_api_wrapper.run,
-)
+# Each factory imports its LangChain community classes itself, so a tool's
+# dependencies are only loaded when that tool is first used.
+tool_registry = ToolRegistry(wrap=lambda tool: get_tool_cache().wrap(tool))
+
+
+@tool_registry.register("arxiv")
+def _build_arxiv_tool() -> BaseTool:
+    from langchain_community.tools import ArxivQueryRun
+    from langchain_community.utilities import ArxivAPIWrapper
+
+    api_wrapper = ArxivAPIWrapper(top_k_results=5, load_max_docs=5, doc_content_chars_max=50000)
+    return ArxivQueryRun(api_wrapper=api_wrapper, verbose=True)
+
+
+@tool_registry.register("wikipedia")
+def _build_wiki_tool() -> BaseTool:
+    from langchain_community.tools import WikipediaQueryRun
+    from langchain_community.utilities import WikipediaAPIWrapper
+
+    api_wrapper = WikipediaAPIWrapper(top_k_results=5, lang="en", doc_content_chars_max=5000)
+    return WikipediaQueryRun(api_wrapper=api_wrapper, verbose=True)
+
+
+@tool_registry.register("duckduckgo_search")
+def _build_duck_tool() -> BaseTool:
+    from langchain_community.tools import DuckDuckGoSearchRun
+    from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+
+    api_wrapper = DuckDuckGoSearchAPIWrapper(max_results=5)
+    return DuckDuckGoSearchRun(api_wrapper=api_wrapper, verbose=True)
+
+
+@tool_registry.register("tavily_search", required_env=["TAVILY_API_KEY"])
+def _build_tavily_tool() -> BaseTool:
+    from langchain_tavily import TavilySearch
+
+    return TavilySearch(
+        api_key=os.getenv("TAVILY_API_KEY"), verbose=True, max_results=5, include_images=True
+    )
+
+
+@tool_registry.register("brave_search", required_env=["BRAVE_SEARCH_API_KEY"])
+def _build_brave_tool() -> BaseTool:
+    from langchain_community.tools import BraveSearch
+
+    return BraveSearch(search_kwargs={"max_results": 5}, verbose=True)
+
+
+@tool_registry.register("google_scholar", required_env=["SERP_API_KEY"])
+def _build_google_scholar_tool() -> BaseTool:
+    from langchain_community.tools.google_scholar import GoogleScholarQueryRun
+    from langchain_community.utilities import GoogleScholarAPIWrapper
+
+    api_wrapper = GoogleScholarAPIWrapper(
+        serp_api_key=os.getenv("SERP_API_KEY"), top_k_results=5, hl="en"
+    )
+    return GoogleScholarQueryRun(api_wrapper=api_wrapper, verbose=True)
+
+
+@tool_registry.register("google_finance", required_env=["SERP_API_KEY"])
+def _build_google_finance_tool() -> BaseTool:
+    from langchain_community.tools.google_finance import GoogleFinanceQueryRun
+    from langchain_community.utilities import GoogleFinanceAPIWrapper
+
+    api_wrapper = GoogleFinanceAPIWrapper(
+        serp_api_key=os.getenv("SERP_API_KEY"), serp_search_engine="google_finance"
+    )
+    return GoogleFinanceQueryRun(api_wrapper=api_wrapper, verbose=True)
+
+
+@tool_registry.register("google_jobs", required_env=["SERP_API_KEY"])
+def _build_google_jobs_tool() -> BaseTool:
+    from langchain_community.tools.google_jobs import GoogleJobsQueryRun
+    from langchain_community.utilities import GoogleJobsAPIWrapper
+
+    api_wrapper = GoogleJobsAPIWrapper(
+        serp_api_key=os.getenv("SERP_API_KEY"), serp_search_engine="google_jobs"
+    )
+    return GoogleJobsQueryRun(api_wrapper=api_wrapper, verbose=True)
+
+
+@tool_registry.register("serp-search", required_env=["SERP_API_KEY"])
+def _build_serp_hotel_tool() -> BaseTool:
+    from langchain_community.utilities import SerpAPIWrapper
+
+    # Custom tool using SerpAPI for hotels
+    api_wrapper = SerpAPIWrapper(search_engine="google_hotels", serpapi_api_key=os.getenv("SERP_API_KEY"))
+    return Tool(
+        name="serp-search",
+        description="A wrapper around Google Hotels using Serp API. Useful for hotel-related search queries.",
+        func=api_wrapper.run,
+    )
+
 
 # -----------------------------------------------------------------------------
 # Public Functions
@@ -87,31 +170,41 @@ serp_hotel_tool = Tool(
 def get_tools() -> List[Tool]:
     """
     Collects and returns the list of available tools for the chatbot.
-    
+
+    Tools are built on the first call and reused afterwards. Tools whose API keys
+    are missing are left out. Every tool is wrapped by the tool result cache, so
+    repeat queries within a tool's TTL are answered from memory or the shared
+    on-disk cache instead of the network.
+
     Returns:
         List[Tool]: A list of initialized LangChain tools.
     """
-    return [
-        arxiv_tool,
-        wiki_tool,
-        duck_tool,
-        tavily_tool,
-        brave_tool,
-        google_scholar_tool,
-        google_finance_tool,
-        google_jobs_tool,
-        serp_hotel_tool,
-    ]
-
-
-def create_tools_node(tools: List[Tool]) -> ToolNode:
+    return tool_registry.get_tools()
+
+
+def get_tool_names() -> List[str]:
+    """
+    Returns the names of the tools `get_tools` would return, without building them.
+
+    Returns:
+        List[str]: The available tool names, in order.
     """
-    Creates a LangGraph ToolNode from a given list of tools.
-    
+    return tool_registry.available_names()
+
+
+def create_tools_node(tools: List[Tool]) -> RunnableLambda:
+    """
+    Creates the graph node that executes the model's tool calls.
+
+    All tool calls of one model turn run concurrently on the shared tool executor,
+    limited per tool by `TOOL_CONCURRENCY_LIMITS`, and their results are returned
+    in the order the model requested them.
+
     Args:
         tools (List[Tool]): List of initialized tools.
-    
+
     Returns:
-        ToolNode: A LangGraph ToolNode that can be added to the chatbot graph.
+        RunnableLambda: A node that can be added to the chatbot graph; it awaits the
+                        tool calls when the graph runs asynchronously.
     """
-    return ToolNode(tools=tools)
+    return get_tool_executor(TOOL_CONCURRENCY_LIMITS).create_node(tools)
@@ -1,9 +1,82 @@
 import json
+import time
 import streamlit as st
 import os
-from typing import  Any, Optional
+from typing import  Any, Dict, Optional, Tuple
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 
+from src.langgraph.graph.news_scheduler import NewsReportScheduler
+from src.langgraph.nodes.news_reports import NewsReport, read_report
+
+
+def message_text(content: Any) -> str:
+    """
+    Extracts the plain text from a message or message-chunk content.
+
+    Some providers stream content as a list of typed parts instead of a string.
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, (str, dict))
+        )
+    return ""
+
+
+def _format_age(seconds: float) -> str:
+    """Formats a duration as a short human-readable age (e.g., "5 min")."""
+    if seconds < 60:
+        return "less than a minute"
+    if seconds < 60 * 60:
+        return f"{int(seconds // 60)} min"
+    if seconds < 24 * 60 * 60:
+        return f"{int(seconds // 3600)} h"
+    return f"{int(seconds // 86400)} days"
+
+
+class StreamingMarkdown:
+    """
+    Accumulates streamed tokens and renders them into a Streamlit placeholder.
+
+    Re-rendering markdown is proportional to the length of the text so far, so
+    updates are coalesced: the placeholder is redrawn at most once per
+    `min_interval` seconds, with a final redraw when the stream ends.
+    """
+
+    def __init__(self, placeholder, min_interval: float = 0.05, cursor: str = "▌"):
+        """
+        Initializes the renderer.
+
+        Args:
+            placeholder: The `st.empty()` placeholder to render into.
+            min_interval (float): Minimum number of seconds between two redraws.
+            cursor (str): Marker appended to the text while the stream is in progress.
+        """
+        self.placeholder = placeholder
+        self.min_interval = min_interval
+        self.cursor = cursor
+        self.text = ""
+        self._last_render = 0.0
+
+    def append(self, token: str) -> None:
+        """Adds a token and redraws the placeholder if the coalescing window has passed."""
+        if not token:
+            return
+        self.text += token
+        now = time.monotonic()
+        if now - self._last_render >= self.min_interval:
+            self.placeholder.markdown(self.text + self.cursor)
+            self._last_render = now
+
+    def finalize(self) -> str:
+        """Renders the complete text without the cursor and returns it."""
+        if self.text:
+            self.placeholder.markdown(self.text)
+        return self.text
+
 
 class DisplayResultStreamlit:
     """
@@ -14,7 +87,18 @@ class DisplayResultStreamlit:
     and tool execution details, in a chat-like interface.
     """
 
-    def __init__(self, usecase: str, graph, user_message: str):
+    # Checkpointed graphs save their state once when the run ends rather than after
+    # every step, so a turn writes only its new messages however many tool steps it took
+    durability = "exit"
+
+    def __init__(
+        self,
+        usecase: str,
+        graph,
+        user_message: str,
+        thread_id: Optional[str] = None,
+        news_scheduler: Optional[NewsReportScheduler] = None,
+    ):
         """
         Initializes the result display handler.
 
@@ -22,10 +106,18 @@ class DisplayResultStreamlit:
             usecase (str): The selected use case (e.g., "Basic ChatBot").
             graph (CompiledGraph): The compiled LangGraph agent to be executed.
             user_message (str): The initial message or prompt from the user.
+            thread_id (Optional[str]): The conversation to continue, for graphs compiled
+                                       with a checkpointer.
+            news_scheduler (Optional[NewsReportScheduler]): Serves precomputed AI News
+                reports; if None, every request runs the AI News graph.
         """
         self.usecase = usecase
         self.graph = graph
         self.user_message = user_message
+        self.news_scheduler = news_scheduler
+        self.config: Dict[str, Any] = (
+            {"configurable": {"thread_id": thread_id}} if thread_id else {}
+        )
 
     def _render_message(self, role: str, content: Any, is_tool: bool = False, tool_name: Optional[str] = None):
         """
@@ -45,33 +137,42 @@ class DisplayResultStreamlit:
             # --- UI for Tool Execution ---
             st.markdown(f"**🔧 Using Tool: `{tool_name}`**")
             with st.expander("Click to see tool output", expanded=False):
-                # Try to parse content as JSON for rich display
-                try:
-                    data = json.loads(content) if isinstance(content, str) else content
-                    st.json(data) # Display the raw JSON for transparency
-
-                    # Display images if available
-                    if "images" in data and data["images"]:
-                        st.markdown("---")
-                        st.markdown("##### 📸 Images Found")
-                        # Use columns for a cleaner layout
-                        cols = st.columns(len(data["images"]))
-                        for i, img_url in enumerate(data["images"]):
-                            with cols[i]:
-                                st.image(img_url, use_column_width=True)
-                    
-                    # Display web search results if available
-                    if "results" in data and data["results"]:
-                        st.markdown("---")
-                        st.markdown("##### 🔗 Search Results")
-                        for r in data["results"]:
-                            title = r.get("title", "No title")
-                            url = r.get("url", "#")
-                            st.markdown(f"- [{title}]({url})")
-
-                except (json.JSONDecodeError, TypeError):
-                    # Fallback for non-JSON content
-                    st.write(content)
+                self._render_tool_output(content)
+
+    def _render_tool_output(self, content: Any):
+        """
+        Renders a tool's output, with rich display for JSON search results.
+
+        Args:
+            content (Any): The tool output, usually the content of a `ToolMessage`.
+        """
+        # Try to parse content as JSON for rich display
+        try:
+            data = json.loads(content) if isinstance(content, str) else content
+            st.json(data) # Display the raw JSON for transparency
+
+            # Display images if available
+            if "images" in data and data["images"]:
+                st.markdown("---")
+                st.markdown("##### 📸 Images Found")
+                # Use columns for a cleaner layout
+                cols = st.columns(len(data["images"]))
+                for i, img_url in enumerate(data["images"]):
+                    with cols[i]:
+                        st.image(img_url, use_column_width=True)
+
+            # Display web search results if available
+            if "results" in data and data["results"]:
+                st.markdown("---")
+                st.markdown("##### 🔗 Search Results")
+                for r in data["results"]:
+                    title = r.get("title", "No title")
+                    url = r.get("url", "#")
+                    st.markdown(f"- [{title}]({url})")
+
+        except (json.JSONDecodeError, TypeError):
+            # Fallback for non-JSON content
+            st.write(content)
 
     def display_result_on_ui(self):
         """
@@ -95,87 +196,173 @@ class DisplayResultStreamlit:
             st.error(f"🚨 **An error occurred:**\n\nAn unexpected issue was encountered while processing your request. Please check your configuration and try again.\n\n*Details: {e}*")
             st.stop()
 
-# In display_results.py, replace the existing _handle_basic_chatbot method with this one:
-
     def _handle_basic_chatbot(self):
-        """Handles streaming response for the Basic ChatBot use case."""
+        """
+        Handles token-level streaming for the Basic ChatBot use case.
+
+        The graph is streamed in "messages" mode, which forwards each token chunk
+        produced by the provider while the `ChatBot` node is still running. Answers
+        served by the semantic response cache arrive as one complete message.
+        """
+        cache_hit, route = None, None
         with st.chat_message("assistant"):
-            response_placeholder = st.empty()
-            full_response = ""
+            renderer = StreamingMarkdown(st.empty())
             with st.spinner("🤔 Thinking..."):
                 # The input should be a list of messages for the graph state
                 initial_input = {"messages": [HumanMessage(content=self.user_message)]}
 
-                for event in self.graph.stream(initial_input):
-                    for value in event.values():
-                        # The 'messages' key holds a LIST of new messages from the node
-                        if new_messages := value.get("messages"):
-                            # Iterate through the list (usually contains one message)
-                            for msg in new_messages:
-                                if msg.content:
-                                    full_response += msg.content
-                                    # Update the placeholder with the accumulating response
-                                    response_placeholder.markdown(full_response + "▌")
-            
+                for message, metadata in self.graph.stream(
+                    initial_input, config=self.config, stream_mode="messages", durability=self.durability
+                ):
+                    if isinstance(message, AIMessage) and metadata.get("langgraph_node") == "ChatBot":
+                        renderer.append(message_text(message.content))
+                        cache_hit = message.response_metadata.get("semantic_cache") or cache_hit
+                        route = message.response_metadata.get("router") or route
+
             # Display the final, complete response
-            response_placeholder.markdown(full_response)
+            renderer.finalize()
+            if cache_hit:
+                st.caption(f"⚡ Answered from cache ({cache_hit['similarity']:.0%} match with an earlier question)")
+            if route and route["fallback"]:
+                st.caption(f"↪️ Answered by the fallback model {route['model']} (the selected model was slow or failing)")
+
+    def _render_tool_call(self, tool_call: Dict[str, Any]):
+        """
+        Renders a tool call as soon as the model emits it.
+
+        Args:
+            tool_call (Dict[str, Any]): A tool call from `AIMessage.tool_calls`.
+
+        Returns:
+            The `st.status` container that the tool's result is rendered into later.
+        """
+        with st.chat_message("assistant"):
+            status = st.status(f"🔧 Using Tool: `{tool_call['name']}`", expanded=False)
+            with status:
+                st.caption("Arguments")
+                st.json(tool_call.get("args", {}))
+        return status
+
+    def _render_tool_result(self, tool_name: str, status, message: ToolMessage):
+        """
+        Renders a tool result into the status container of its tool call.
+
+        Args:
+            tool_name (str): The name of the tool that produced the result.
+            status: The container returned by `_render_tool_call`, or None if the
+                    matching tool call was never seen.
+            message (ToolMessage): The tool's result message.
+        """
+        if status is None:
+            self._render_message("assistant", message.content, is_tool=True, tool_name=tool_name)
+            return
+
+        failed = getattr(message, "status", "success") == "error"
+        with status:
+            st.caption("Output")
+            self._render_tool_output(message.content)
+        status.update(
+            label=f"{'❌' if failed else '✅'} Used Tool: `{tool_name}`",
+            state="error" if failed else "complete",
+        )
 
     def _handle_chatbot_with_tools(self):
-        """Handles the response flow for the ChatBot with Tools use case."""
+        """
+        Handles the response flow for the ChatBot with Tools use case.
+
+        The graph is streamed in "messages" and "updates" modes together, so every
+        step of the ChatBot → tools → ChatBot loop is shown as it happens: model
+        tokens as they are generated, each tool call as soon as the model emits it,
+        and each tool result as soon as its `ToolMessage` arrives.
+        """
+        initial_state = {"messages": [HumanMessage(content=self.user_message)]}
+
+        # Tool calls awaiting a result, keyed by tool_call_id: (tool name, status container)
+        pending_tool_calls: Dict[str, Tuple[str, Any]] = {}
+        renderer: Optional[StreamingMarkdown] = None
+
         with st.spinner("🔎 Thinking & using tools..."):
-            # The graph is invoked, and it runs the full tool-use cycle
-            initial_state = {"messages": [HumanMessage(content=self.user_message)]}
-            response = self.graph.invoke(initial_state)
-
-        messages = response.get("messages", [])
-        
-        # Keep track of the last AIMessage that contained tool calls
-        last_ai_message_with_tool_calls = None
-
-        for message in messages:
-            if isinstance(message, HumanMessage):
-                # This is the initial user message, which is already displayed.
-                continue
-
-            if isinstance(message, AIMessage):
-                if message.tool_calls:
-                    # This is the AI's decision to call a tool. We store it
-                    # but don't display anything yet. The tool's result will be displayed.
-                    last_ai_message_with_tool_calls = message
-                if message.content:
-                    # This is a final text response from the assistant after using a tool.
-                    self._render_message("assistant", message.content)
-            
-            elif isinstance(message, ToolMessage):
-                tool_name = "Unknown Tool"
-                if last_ai_message_with_tool_calls:
-                    matching_tool_call = next(
-                        (tc for tc in last_ai_message_with_tool_calls.tool_calls if tc['id'] == message.tool_call_id),
-                        None
-                    )
-                    if matching_tool_call:
-                        tool_name = matching_tool_call['name']
-                
-                self._render_message("assistant", message.content, is_tool=True, tool_name=tool_name)
+            for mode, payload in self.graph.stream(
+                initial_state, config=self.config, stream_mode=["messages", "updates"], durability=self.durability
+            ):
+                if mode == "messages":
+                    # A token chunk from the model; start a new reply bubble on the first one
+                    message, metadata = payload
+                    if not isinstance(message, AIMessage) or metadata.get("langgraph_node") != "ChatBot":
+                        continue
+                    text = message_text(message.content)
+                    if text and renderer is None:
+                        with st.chat_message("assistant"):
+                            renderer = StreamingMarkdown(st.empty())
+                    if renderer is not None:
+                        renderer.append(text)
+                    continue
+
+                # mode == "updates": a node has finished and returned its messages.
+                # Only the ChatBot and tools nodes are rendered; the tools node carries
+                # the full tool output, before it is compacted for the model.
+                for node, update in payload.items():
+                    if node not in ("ChatBot", "tools"):
+                        continue
+                    for message in (update or {}).get("messages", []):
+                        if isinstance(message, AIMessage):
+                            # The model's turn is complete; close its reply bubble
+                            if renderer is not None:
+                                renderer.finalize()
+                                renderer = None
+                            for tool_call in message.tool_calls:
+                                pending_tool_calls[tool_call["id"]] = (
+                                    tool_call["name"], self._render_tool_call(tool_call)
+                                )
+
+                        elif isinstance(message, ToolMessage):
+                            tool_name, status = pending_tool_calls.pop(
+                                message.tool_call_id, (message.name or "Unknown Tool", None)
+                            )
+                            self._render_tool_result(tool_name, status, message)
+
+        if renderer is not None:
+            renderer.finalize()
 
     def _handle_ai_news(self):
-        """Handles the AI News fetching and summarization use case."""
-        with st.spinner("📰 Fetching and summarizing the latest AI news..."):
-            result = self.graph.invoke({"messages": [HumanMessage(content=self.user_message)]})
+        """
+        Handles the AI News fetching and summarization use case.
+
+        With a news scheduler, the latest saved report is shown immediately. If it is
+        older than its refresh interval, a background refresh is started and the new
+        version is shown on a later fetch (stale-while-revalidate). Only a report that
+        was never generated is waited for.
+        """
+        frequency = self.user_message.lower().strip()
+        scheduler = self.news_scheduler
+        report: Optional[NewsReport] = scheduler.get_report(frequency) if scheduler else None
+        refreshing = False
+
+        if report is None:
+            with st.spinner("📰 Fetching and summarizing the latest AI news..."):
+                future = scheduler.refresh(frequency, graph=self.graph) if scheduler else None
+                if future is not None:
+                    report = future.result()
+                else:
+                    result = self.graph.invoke({"messages": [HumanMessage(content=self.user_message)]})
+                    report = read_report(result["frequency"]) if result.get("summary") else None
+        elif scheduler.is_stale(report):
+            refreshing = scheduler.refresh(frequency, graph=self.graph) is not None
 
-        summary = result.get("summary")
-        if summary:
+        if report:
             with st.chat_message("assistant"):
                 st.subheader("📰 AI News Summary")
-                st.markdown(summary, unsafe_allow_html=True)
+                status = f"Version {report.version} · generated {_format_age(report.age())} ago"
+                if refreshing:
+                    status += " · a fresh report is being generated in the background"
+                st.caption(status)
+                st.markdown(report.summary, unsafe_allow_html=True)
                 # Provide a download button for the generated report
-                if filename := result.get("filename"):
-                    with open(filename, "r", encoding="utf-8") as f:
-                        st.download_button(
-                            label="📥 Download Full Report",
-                            data=f.read(),
-                            file_name=os.path.basename(filename),
-                            mime="text/markdown",
-                        )
+                st.download_button(
+                    label="📥 Download Full Report",
+                    data=report.markdown,
+                    file_name=os.path.basename(report.filename),
+                    mime="text/markdown",
+                )
         else:
-            st.error(f"🚨 Could not generate a news summary for the selected timeframe.")
\ No newline at end of file
+            st.error(f"🚨 Could not generate a news summary for the selected timeframe.")
@@ -1,8 +1,9 @@
 import os
 import streamlit as st
-from typing import Dict, Any, List
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Any, Sequence
 
-from src.langgraph.ui.uiconfigfile import Config
+from src.langgraph.ui.uiconfigfile import get_settings
 
 
 class LoadStreamlit:
@@ -14,8 +15,8 @@ class LoadStreamlit:
     """
 
     def __init__(self):
-        """Initializes the UI loader with a configuration object."""
-        self.config = Config()
+        """Initializes the UI loader with the process-wide settings."""
+        self.settings = get_settings()
         self.user_settings: Dict[str, Any] = {}
 
     def load_streamlit_ui(self) -> Dict[str, Any]:
@@ -26,11 +27,11 @@ class LoadStreamlit:
             Dict[str, Any]: A dictionary containing all user-configured settings.
         """
         st.set_page_config(
-            page_title=f"{self.config.get_page_title()}",
+            page_title=self.settings.page_title,
             layout="wide",
             initial_sidebar_state="expanded"
         )
-        st.title(f"🔗 {self.config.get_page_title()}")
+        st.title(f"🔗 {self.settings.page_title}")
 
         with st.sidebar:
             st.header("⚙️ Configuration")
@@ -40,13 +41,18 @@ class LoadStreamlit:
             st.divider()
 
             self._render_use_case_selection()
+            st.divider()
+
+            # Dropping the session's thread id starts a new conversation on the next message
+            if st.button("🧹 New Conversation", use_container_width=True):
+                st.session_state.pop("thread_id", None)
 
         return self.user_settings
 
     def _render_model_selection(self):
         """Renders the UI components for selecting and configuring the LLM provider."""
         st.subheader("1. Select Language Model")
-        llm_options = self.config.get_llm_options()
+        llm_options = self.settings.llm_options
         self.user_settings['selected_llm'] = st.selectbox(
             'Select LLM Provider', llm_options, label_visibility="collapsed"
         )
@@ -55,23 +61,27 @@ class LoadStreamlit:
         provider = self.user_settings['selected_llm']
         if provider == "Groq":
             self._render_llm_settings(
-                "Groq", self.config.get_groq_llm_models(), "GROQ_API_KEY", "https://console.groq.com/keys"
+                "Groq", self.settings.model_options("Groq"), "GROQ_API_KEY", "https://console.groq.com/keys"
             )
         elif provider == "Openrouter":
             self._render_llm_settings(
-                "Openrouter", self.config.get_openrouter_llm_models(), "OPENROUTER_API_KEY", "https://openrouter.ai/settings/keys"
+                "Openrouter", self.settings.model_options("Openrouter"), "OPENROUTER_API_KEY", "https://openrouter.ai/settings/keys"
             )
         elif provider == "NVIDIA":
             self._render_llm_settings(
-                "NVIDIA", self.config.get_nvidia_llm_models(), "NVIDIA_API_KEY", "https://build.nvidia.com/explore/discover"
+                "NVIDIA", self.settings.model_options("NVIDIA"), "NVIDIA_API_KEY", "https://build.nvidia.com/explore/discover"
             )
 
-    def _render_llm_settings(self, provider_name: str, model_options: List[str], api_key_name: str, help_url: str):
+    def _render_llm_settings(self, provider_name: str, model_options: Sequence[str], api_key_name: str, help_url: str):
         """
         A generic helper to render the model selection and API key input for an LLM provider.
         """
-        self.user_settings[f'selected_{provider_name.lower()}_model'] = st.selectbox(f'{provider_name} Model', model_options)
-        
+        model = st.selectbox(f'{provider_name} Model', model_options)
+        self.user_settings[f'selected_{provider_name.lower()}_model'] = model
+        self.user_settings['history_token_budget'] = self.settings.history_token_budget(provider_name, model)
+        info = self.settings.model_info(provider_name, model)
+        st.caption(f"{info.context_window:,}-token context · {info.tier} tier")
+
         api_key = st.text_input(
             f"{provider_name} API Key",
             type="password",
@@ -85,7 +95,7 @@ class LoadStreamlit:
     def _render_use_case_selection(self):
         """Renders the UI for selecting the agent's use case and related tools."""
         st.subheader("2. Select Use Case")
-        usecase_options = self.config.get_usecase_options()
+        usecase_options = self.settings.usecase_options
         self.user_settings['selected_use_case'] = st.selectbox(
             'Select Agent Type', usecase_options, label_visibility="collapsed"
         )
@@ -123,6 +133,9 @@ class LoadStreamlit:
             if st.button("🔄 Fetch Latest News", use_container_width=True, type="primary"):
                 st.session_state.IsFetchButtonClicked = True
                 st.session_state.timeframe = timeframe.lower()
+
+            with st.expander("🔎 Search Past News"):
+                self._render_news_archive(timeframe.lower())
             
             with st.expander("ℹ️ AI News - Important Info"):
                 st.info(
@@ -153,4 +166,45 @@ class LoadStreamlit:
                     - `GOOGLE_JOBS_TOOL`
                     - `SERP_HOTEL_TOOL`
                     """
-                )
\ No newline at end of file
+                )
+
+    def _render_news_archive(self, frequency: str):
+        """
+        Renders keyword and date-range search over archived AI News articles, and
+        downloads of earlier reports of the selected time frame.
+        """
+        from src.langgraph.nodes.news_archive import get_news_archive
+
+        archive = get_news_archive()
+        query = st.text_input("Keywords", key="news_archive_query", placeholder="e.g. open source model release")
+        dates = st.date_input("Published between", value=(), key="news_archive_dates")
+
+        if query:
+            since = until = None
+            if len(dates) >= 1:
+                since = datetime.combine(dates[0], time.min, tzinfo=timezone.utc).timestamp()
+            if len(dates) == 2:
+                until = datetime.combine(dates[1] + timedelta(days=1), time.min, tzinfo=timezone.utc).timestamp()
+            results = archive.search(query, since=since, until=until, limit=10)
+            if not results:
+                st.caption("No archived articles match.")
+            for article in results:
+                published = datetime.fromtimestamp(article.published_at, tz=timezone.utc).strftime("%Y-%m-%d")
+                st.markdown(f"**[{article.title}]({article.url})**  \n{published} · {article.summary[:200]}")
+
+        reports = archive.list_reports(frequency=frequency, limit=20)
+        if reports:
+            selected = st.selectbox(
+                "Earlier reports",
+                reports,
+                format_func=lambda r: (
+                    f"v{r.version} · {datetime.fromtimestamp(r.generated_at).strftime('%Y-%m-%d %H:%M')}"
+                ),
+            )
+            st.download_button(
+                label="📥 Download Selected Report",
+                data=archive.get_markdown(selected.id) or "",
+                file_name=f"{frequency}_summary_v{selected.version}.md",
+                mime="text/markdown",
+                use_container_width=True,
+            )
@@ -1,50 +1,344 @@
-from configparser import ConfigParser
+"""
+The app's settings: the UI options, model catalogs and per-model metadata, and
+the provider settings read from `uiconfigfile.ini`.
+
+The file is parsed once per process into a validated, typed `Settings` object
+shared by every session and API request (see `get_settings`), instead of on
+every Streamlit rerun. Any key can be overridden with a `CHATBOT_<KEY>`
+environment variable (e.g., `CHATBOT_GROQ_MODEL_OPTIONS`), and `LLM_FALLBACK_MODEL`
+overrides `FALLBACK_MODEL`. The file's modification time is checked at most every
+`CHATBOT_CONFIG_CHECK_INTERVAL` seconds (default 2) and the settings are reloaded
+when it changes, so edits apply without a restart. An edit that does not pass
+validation is reported and the previous settings stay in use.
+"""
+# --- Standard Library Imports ---
+import os
+import threading
+import time
+from configparser import ConfigParser, Error as ConfigParserError
 from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+DEFAULT_CONFIG_FILE = Path(__file__).with_name("uiconfigfile.ini")
+MODEL_TIERS = ("fast", "slow")
+
+
+class ModelInfo(NamedTuple):
+    """A model of a provider's catalog and its metadata."""
+    provider: str
+    name: str
+    context_window: int
+    tier: str
+
+
+class Settings(NamedTuple):
+    """The validated contents of the config file, with environment overrides applied."""
+    page_title: str
+    llm_options: Tuple[str, ...]
+    usecase_options: Tuple[str, ...]
+    # Model names per provider, in the order the UI offers them
+    catalogs: Dict[str, Tuple[str, ...]]
+    # Metadata of every catalog model, keyed by "Provider:model"
+    models: Dict[str, ModelInfo]
+    fallback_model: Optional[Tuple[str, str]]
+    # (provider, model) background AI News refreshes run on, with the operator's API key
+    news_refresh_model: Optional[Tuple[str, str]]
+    # (requests/min, tokens/min), keyed by "Provider:model" or "Provider:*"
+    rate_limits: Dict[str, Tuple[int, int]]
+    default_context_window: int
+    context_reserved_tokens: int
+    context_windows: Dict[str, int]
+    default_tier: str
+    tiers: Dict[str, str]
+
+    def model_options(self, provider: str) -> Tuple[str, ...]:
+        """Returns the models offered for a provider (empty if it is unknown)."""
+        return self.catalogs.get(provider, ())
+
+    def model_info(self, provider: str, model: str) -> ModelInfo:
+        """
+        Returns the metadata of a model. Models outside the catalog (e.g., named in an
+        API request) get the configured context window and tier, or the defaults.
+        """
+        info = self.models.get(f"{provider}:{model}")
+        if info is not None:
+            return info
+        tier = self.tiers.get(f"{provider}:{model}") or self.tiers.get(f"{provider}:*") or self.default_tier
+        return ModelInfo(provider, model, self.context_windows.get(model, self.default_context_window), tier)
+
+    def history_token_budget(self, provider: str, model: str) -> int:
+        """
+        Returns how many tokens of conversation history may be sent to a model.
+
+        This is the model's context window minus the tokens reserved for tool schemas
+        and the reply, but never less than half of the context window.
+        """
+        context_window = self.model_info(provider, model).context_window
+        return max(context_window - self.context_reserved_tokens, context_window // 2)
+
+
+# ---- Parsing and validation ---- #
 
+def _split(value: str) -> Tuple[str, ...]:
+    """Splits a comma-separated value, dropping blanks and duplicates but keeping the order."""
+    return tuple(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
 
-class Config:
+
+def _mapping(key: str, value: str) -> Dict[str, str]:
     """
-    A helper class to manage UI-related configuration from an INI file.
-    Provides convenient access methods for retrieving options and settings.
+    Parses a comma-separated list of `name = value` pairs.
+
+    Raises:
+        ValueError: If an entry has no `=`.
     """
+    mapping = {}
+    for item in _split(value):
+        name, sep, entry = item.rpartition("=")
+        if not sep or not name.strip() or not entry.strip():
+            raise ValueError(f"{key}: expected 'name = value', got '{item}'")
+        mapping[name.strip()] = entry.strip()
+    return mapping
 
-    def __init__(self, config_file: str = "./src/langgraph/ui/uiconfigfile.ini"):
-        self.config_file = Path(config_file)
-        self.config = ConfigParser()
 
-        if not self.config_file.exists():
-            raise FileNotFoundError(f"❌ Config file not found at {self.config_file.resolve()}")
+def _int(key: str, value: str, minimum: int) -> int:
+    """
+    Parses an integer of at least `minimum`.
+
+    Raises:
+        ValueError: If the value is not such an integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{key}: expected an integer, got '{value}'") from None
+    if number < minimum:
+        raise ValueError(f"{key}: must be at least {minimum}, got {number}")
+    return number
+
+
+def _model_ref(key: str, value: str) -> Optional[Tuple[str, str]]:
+    """
+    Parses an optional "Provider:model" value.
+
+    Raises:
+        ValueError: If the value is set but not of that form.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    provider, sep, model = (part.strip() for part in value.partition(":"))
+    if not sep or not provider or not model:
+        raise ValueError(f"{key}: expected 'Provider:model', got '{value}'")
+    return provider, model
+
+
+def parse_settings(values: Dict[str, str]) -> Settings:
+    """
+    Validates the raw config values and converts them to `Settings`.
+
+    Args:
+        values (Dict[str, str]): The config keys (upper case) and their values.
+
+    Returns:
+        Settings: The typed settings.
+
+    Raises:
+        ValueError: If a value is malformed or a provider has no models.
+    """
+    llm_options = _split(values.get("LLM_OPTIONS", ""))
+    usecase_options = _split(values.get("USE_CASE_OPTIONS", ""))
+    if not llm_options or not usecase_options:
+        raise ValueError("LLM_OPTIONS and USE_CASE_OPTIONS must each list at least one option")
+
+    catalogs = {}
+    for provider in llm_options:
+        catalogs[provider] = _split(values.get(f"{provider.upper()}_MODEL_OPTIONS", ""))
+        if not catalogs[provider]:
+            raise ValueError(f"{provider.upper()}_MODEL_OPTIONS must list at least one model for {provider}")
+
+    rate_limits = {}
+    for name, value in _mapping("RATE_LIMITS", values.get("RATE_LIMITS", "")).items():
+        requests, _, tokens = value.partition("/")
+        rate_limits[name] = (
+            _int(f"RATE_LIMITS {name}", requests.strip(), 0),
+            _int(f"RATE_LIMITS {name}", tokens.strip() or "0", 0),
+        )
+
+    context_windows = {
+        model: _int(f"MODEL_CONTEXT_WINDOWS {model}", value, 1)
+        for model, value in _mapping("MODEL_CONTEXT_WINDOWS", values.get("MODEL_CONTEXT_WINDOWS", "")).items()
+    }
+    tiers = _mapping("MODEL_TIERS", values.get("MODEL_TIERS", ""))
+    default_tier = values.get("DEFAULT_MODEL_TIER", "slow").strip()
+    for name, tier in {**tiers, "DEFAULT_MODEL_TIER": default_tier}.items():
+        if tier not in MODEL_TIERS:
+            raise ValueError(f"{name}: tier must be one of {', '.join(MODEL_TIERS)}, got '{tier}'")
+
+    settings = Settings(
+        page_title=values.get("PAGE_TITLE", "").strip(),
+        llm_options=llm_options,
+        usecase_options=usecase_options,
+        catalogs=catalogs,
+        models={},
+        fallback_model=_model_ref("FALLBACK_MODEL", values.get("FALLBACK_MODEL", "")),
+        news_refresh_model=_model_ref("NEWS_REFRESH_MODEL", values.get("NEWS_REFRESH_MODEL", "")),
+        rate_limits=rate_limits,
+        default_context_window=_int("DEFAULT_CONTEXT_WINDOW", values.get("DEFAULT_CONTEXT_WINDOW", "8192"), 1),
+        context_reserved_tokens=_int("CONTEXT_RESERVED_TOKENS", values.get("CONTEXT_RESERVED_TOKENS", "4096"), 0),
+        context_windows=context_windows,
+        default_tier=default_tier,
+        tiers=tiers,
+    )
+    # Resolve every catalog model's metadata once, so lookups are plain dict reads
+    settings.models.update(
+        (f"{provider}:{model}", settings.model_info(provider, model))
+        for provider, models in catalogs.items()
+        for model in models
+    )
+    return settings
+
+
+def load_settings(config_file: Union[str, Path] = DEFAULT_CONFIG_FILE) -> Settings:
+    """
+    Reads a config file, applies the environment overrides and validates the result.
+
+    Args:
+        config_file (Union[str, Path]): The INI file to read.
+
+    Returns:
+        Settings: The typed settings.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file cannot be parsed or a value is invalid.
+    """
+    config_file = Path(config_file)
+    if not config_file.exists():
+        raise FileNotFoundError(f"❌ Config file not found at {config_file.resolve()}")
+
+    parser = ConfigParser()
+    try:
+        parser.read(config_file, encoding="utf-8")
+    except ConfigParserError as e:
+        raise ValueError(f"Invalid config file {config_file}: {e}") from e
+    values = {key.upper(): value for key, value in parser.defaults().items()}
+
+    for key, value in os.environ.items():
+        if key.startswith("CHATBOT_"):
+            values[key[len("CHATBOT_"):]] = value
+    if "LLM_FALLBACK_MODEL" in os.environ:
+        values["FALLBACK_MODEL"] = os.environ["LLM_FALLBACK_MODEL"]
+
+    try:
+        return parse_settings(values)
+    except ValueError as e:
+        raise ValueError(f"Invalid config file {config_file}: {e}") from e
 
-        self.config.read(self.config_file)
 
-    def _get_list(self, section: str, key: str) -> list[str]:
+class SettingsStore:
+    """
+    Holds the settings of one config file, reloading them when the file changes.
+
+    `get` only looks at the file once `check_interval` seconds have passed since
+    the last look, so calling it on every rerun or request costs a clock read.
+    """
+
+    def __init__(self, config_file: Union[str, Path] = DEFAULT_CONFIG_FILE, check_interval: float = 2.0):
         """
-        Retrieve a config value as a list, split by commas.
+        Initializes the store; the file is read on the first `get`.
+
+        Args:
+            config_file (Union[str, Path]): The INI file to read.
+            check_interval (float): Minimum seconds between checks of the file's
+                modification time.
         """
-        value = self.config.get(section, key, fallback="")
-        return [item.strip() for item in value.split(",") if item.strip()]
+        self.config_file = Path(config_file)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._settings: Optional[Settings] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
 
-    def _get_value(self, section: str, key: str) -> str:
+    def get(self) -> Settings:
         """
-        Retrieve a single config value as a string.
+        Returns the current settings, reloading them first if the file has changed.
+
+        Raises:
+            FileNotFoundError: If the file does not exist on the first load.
+            ValueError: If the file is invalid on the first load.
         """
-        return self.config.get(section, key, fallback="")
+        settings = self._settings
+        if settings is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return settings
+        with self._lock:
+            if self._settings is None or time.monotonic() - self._checked_at >= self.check_interval:
+                self._refresh()
+            return self._settings
+
+    def _refresh(self) -> None:
+        """Reloads the settings if the file's modification time or size changed."""
+        self._checked_at = time.monotonic()
+        try:
+            stat = self.config_file.stat()
+        except FileNotFoundError:
+            if self._settings is None:
+                raise FileNotFoundError(f"❌ Config file not found at {self.config_file.resolve()}") from None
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        try:
+            settings = load_settings(self.config_file)
+        except (OSError, ValueError) as e:
+            if self._settings is None:
+                raise
+            # Remember the stamp, so the same broken file is not parsed on every check
+            self._stamp = stamp
+            print(f"Warning: keeping the previous settings: {e}")
+            return
+        if self._settings is not None:
+            self.reloads += 1
+        self._settings, self._stamp = settings, stamp
 
-    # ---- Public API ---- #
-    def get_llm_options(self) -> list[str]:
-        return self._get_list("DEFAULT", "LLM_OPTIONS")
 
-    def get_usecase_options(self) -> list[str]:
-        return self._get_list("DEFAULT", "USE_CASE_OPTIONS")
+# ---- Process-wide instances ---- #
+_stores: Dict[Union[str, Path], SettingsStore] = {}
+_stores_lock = threading.Lock()
 
-    def get_openrouter_llm_models(self) -> list[str]:
-        return self._get_list("DEFAULT", "OPENROUTER_MODEL_OPTIONS")
 
-    def get_groq_llm_models(self) -> list[str]:
-        return self._get_list("DEFAULT", "GROQ_MODEL_OPTIONS")
+def get_settings_store(config_file: Optional[Union[str, Path]] = None) -> SettingsStore:
+    """
+    Returns the settings store of a config file, shared by every session in this process.
+
+    Args:
+        config_file (Optional[Union[str, Path]]): The INI file; defaults to
+            `CHATBOT_CONFIG_FILE`, or `uiconfigfile.ini` next to this module.
+
+    Returns:
+        SettingsStore: The store of that file.
+    """
+    name = config_file or os.getenv("CHATBOT_CONFIG_FILE") or DEFAULT_CONFIG_FILE
+    store = _stores.get(name)
+    if store is not None:
+        return store
+    path = Path(name).resolve()
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SettingsStore(path, float(os.getenv("CHATBOT_CONFIG_CHECK_INTERVAL", "2")))
+        # Also keyed by the name as given, so later lookups skip resolving the path
+        store = _stores[name] = _stores[path]
+        return store
 
-    def get_nvidia_llm_models(self) -> list[str]:
-        return self._get_list("DEFAULT", "NVIDIA_MODEL_OPTIONS")
 
-    def get_page_title(self) -> str:
-        return self._get_value("DEFAULT", "PAGE_TITLE")
+def get_settings(config_file: Optional[Union[str, Path]] = None) -> Settings:
+    """
+    Returns the current settings, shared by every session in this process.
+
+    Args:
+        config_file (Optional[Union[str, Path]]): The INI file (see `get_settings_store`).
+
+    Returns:
+        Settings: The settings, reloaded if the file changed since the last check.
+    """
+    return get_settings_store(config_file).get()